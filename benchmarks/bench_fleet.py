@@ -0,0 +1,249 @@
+"""Fleet-scale benchmark: many MaestroControllers against a simulated cloud.
+
+A local Socket.IO server speaks the MCZ cloud protocol (join, chiedo ->
+rispondo) and pushes an Info frame to every stove at a fixed interval. For
+each fleet size the benchmark reports:
+
+- connect time and memory per controller (tracemalloc, client and server
+  side together, so an upper bound)
+- event loop lag while frames are flowing (sleep overshoot, p50/p99/max)
+- CPU per delivered frame (process time; the server shares the process, so
+  this is an upper bound too)
+- reconnect-storm recovery: the server drops every client at once and we
+  time how long until all controllers are connected again
+
+With --transport loopback the same run uses in-memory LoopbackTransports,
+isolating the controller's own cost from Socket.IO and the network.
+
+    python benchmarks/bench_fleet.py [--stoves 100 500 1000] [--duration 10] [--transport cloud|loopback]
+"""
+import argparse
+import asyncio
+import logging
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import socketio
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.maestro_mcz.maestro.controller import MaestroController  # noqa: E402
+from custom_components.maestro_mcz.maestro.transport import (  # noqa: E402
+    CloudTransport,
+    LoopbackTransport,
+    MaestroTransport,
+)
+
+LAG_SAMPLE_INTERVAL = 0.05
+CONNECT_TIMEOUT = 300
+
+
+def info_frame(tick: int) -> str:
+    """Return a full-width Info frame: Power 1, ambient temperature drifting with `tick`."""
+    fields = ["00"] * 60
+    fields[0] = "0B"
+    fields[5] = f"{40 + tick % 10:02X}"
+    return "01|" + "|".join(fields)
+
+
+class SimulatedCloud:
+    """Socket.IO server answering GetInfo and pushing frames to every stove."""
+
+    def __init__(self):
+        self.sio = socketio.AsyncServer(async_mode="aiohttp", logger=False, engineio_logger=False)
+        self.app = web.Application()
+        self.sio.attach(self.app)
+        self.stoves: dict[str, str] = {}  # sid -> serial
+        self.sio.on("join", self._on_join)
+        self.sio.on("chiedo", self._on_chiedo)
+        self.sio.on("disconnect", self._on_disconnect)
+        self._runner: web.AppRunner | None = None
+        self._url = ""
+        self._tick = 0
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self._url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def make_transport(self, serial: str, mac: str) -> MaestroTransport:
+        transport = CloudTransport(serial, mac)
+        transport.URL = self._url
+        return transport
+
+    async def push_all(self):
+        self._tick += 1
+        frame = info_frame(self._tick)
+        for sid in list(self.stoves):
+            await self.sio.emit("rispondo", {"stringaRicevuta": frame}, to=sid)
+
+    async def drop_all(self):
+        for sid in list(self.stoves):
+            await self.sio.disconnect(sid)
+
+    async def _on_join(self, sid, data):
+        self.stoves[sid] = data["serialNumber"]
+
+    async def _on_chiedo(self, sid, data):
+        if data.get("richiesta") == "C|RecuperoInfo":
+            await self.sio.emit("rispondo", {"stringaRicevuta": info_frame(self._tick)}, to=sid)
+
+    async def _on_disconnect(self, sid, *args):
+        self.stoves.pop(sid, None)
+
+
+class LoopbackFleet:
+    """In-memory stand-in for SimulatedCloud built on LoopbackTransport."""
+
+    def __init__(self):
+        self.transports: list[LoopbackTransport] = []
+        self._tick = 0
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def make_transport(self, serial: str, mac: str) -> MaestroTransport:
+        transport = LoopbackTransport(self._respond)
+        self.transports.append(transport)
+        return transport
+
+    def _respond(self, request: str) -> list[str]:
+        return [info_frame(self._tick)] if request == "C|RecuperoInfo" else []
+
+    async def push_all(self):
+        self._tick += 1
+        frame = info_frame(self._tick)
+        for transport in self.transports:
+            if transport.connected:
+                transport.inject(frame)
+        # Give the event loop a turn, like socket writes would
+        await asyncio.sleep(0)
+
+    async def drop_all(self):
+        for transport in self.transports:
+            await transport.drop()
+
+
+async def _sample_lag(lags: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        lags.append(time.perf_counter() - started - LAG_SAMPLE_INTERVAL)
+
+
+async def _wait_all_connected(controllers: list[MaestroController]) -> float:
+    started = time.perf_counter()
+    async with asyncio.timeout(CONNECT_TIMEOUT):
+        while not all(c.connected for c in controllers):
+            await asyncio.sleep(0.05)
+    return time.perf_counter() - started
+
+
+async def run_fleet(
+    count: int, duration: float, push_interval: float, transport: str = "cloud",
+) -> dict[str, float]:
+    cloud = SimulatedCloud() if transport == "cloud" else LoopbackFleet()
+    await cloud.start()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    controllers = []
+    for i in range(count):
+        serial, mac = f"BENCH{i:05d}", f"02:00:00:00:{i // 256:02X}:{i % 256:02X}"
+        controllers.append(MaestroController(serial, mac, cloud.make_transport(serial, mac)))
+    tasks = [asyncio.create_task(c.connect()) for c in controllers]
+    connect_time = await _wait_all_connected(controllers)
+    # Let the initial GetInfo answers land before measuring memory
+    await asyncio.sleep(1)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Steady state: frames pushed to every stove
+    lags: list[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_lag(lags, stop))
+    frames_before = sum(c._decode_count for c in controllers)
+    cpu_before = time.process_time()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        await cloud.push_all()
+        await asyncio.sleep(push_interval)
+    await asyncio.sleep(push_interval)
+    cpu = time.process_time() - cpu_before
+    frames = sum(c._decode_count for c in controllers) - frames_before
+    stop.set()
+    await sampler
+
+    # Reconnect storm
+    await cloud.drop_all()
+    await asyncio.sleep(0)
+    storm_recovery = await _wait_all_connected(controllers)
+
+    for c in controllers:
+        await c.disconnect()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await cloud.stop()
+
+    lags.sort()
+    return {
+        "stoves": count,
+        "connect_s": connect_time,
+        "kib_per_controller": (current - baseline) / count / 1024,
+        "frames": frames,
+        "cpu_us_per_frame": cpu / frames * 1e6 if frames else float("nan"),
+        "lag_p50_ms": statistics.median(lags) * 1000 if lags else 0.0,
+        "lag_p99_ms": lags[int(len(lags) * 0.99)] * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+        "storm_recovery_s": storm_recovery,
+    }
+
+
+def _raise_fd_limit():
+    # Each stove needs a client and a server socket
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stoves", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of steady-state pushes")
+    parser.add_argument("--push-interval", type=float, default=1.0)
+    parser.add_argument("--transport", choices=["cloud", "loopback"], default="cloud")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    _raise_fd_limit()
+
+    header = (
+        f"{'stoves':>7} {'connect s':>10} {'KiB/ctrl':>9} {'frames':>8} {'CPU us/frame':>13} "
+        f"{'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11} {'storm s':>8}"
+    )
+    print(header)
+    for count in args.stoves:
+        r = asyncio.run(run_fleet(count, args.duration, args.push_interval, args.transport))
+        print(
+            f"{r['stoves']:>7} {r['connect_s']:>10.2f} {r['kib_per_controller']:>9.1f} {r['frames']:>8} "
+            f"{r['cpu_us_per_frame']:>13.1f} {r['lag_p50_ms']:>11.1f} {r['lag_p99_ms']:>11.1f} "
+            f"{r['lag_max_ms']:>11.1f} {r['storm_recovery_s']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Import-time benchmark for the Maestro MCZ integration.
+
+Each module is imported in a fresh interpreter, after the Home Assistant
+modules the integration builds on have been loaded (Home Assistant has them
+in memory before it loads us), so the figure is what the integration itself
+adds to startup.
+
+    python benchmarks/bench_import.py [--runs N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "custom_components.maestro_mcz",
+    "custom_components.maestro_mcz.config_flow",
+    "custom_components.maestro_mcz.climate",
+    "custom_components.maestro_mcz.sensor",
+    "custom_components.maestro_mcz.switch",
+]
+
+# Modules we don't want on the startup path: third-party transports, and the
+# controller, which only entry setup needs (the config flow must not load it)
+HEAVY_MODULES = ["socketio", "engineio", "custom_components.maestro_mcz.maestro.controller"]
+
+_PROBE = """
+import importlib, json, sys, time
+import homeassistant.config_entries, homeassistant.helpers.aiohttp_client
+import homeassistant.helpers.storage, homeassistant.helpers.entity_platform
+import homeassistant.components.climate, homeassistant.components.sensor
+import homeassistant.components.switch, voluptuous
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "heavy": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def measure(module: str, runs: int) -> tuple[float, list[str]]:
+    """Return the median import time of `module` in ms and the heavy modules it loaded."""
+    timings = []
+    heavy: list[str] = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, module, *HEAVY_MODULES],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout)
+        timings.append(result["ms"])
+        heavy = result["heavy"]
+    return statistics.median(timings), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    for module in MODULES:
+        ms, heavy = measure(module, args.runs)
+        print(f"{module:45s} {ms:8.1f} ms  {'loads ' + ', '.join(heavy) if heavy else ''}")
+
+
+if __name__ == "__main__":
+    main()
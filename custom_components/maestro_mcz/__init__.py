@@ -3,26 +3,57 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN
-from .maestro.controller import MaestroController
+from .const import CONF_CONNECTION_TYPE, CONF_HOST, CONNECTION_LOCAL, DOMAIN, EVENT_ALARM
+from .maestro.types import CHRONO_FIELD, CONSUMPTION_FIELD, PARAMETERS_FIELD, MaestroStoveStateInfo
+
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.CLIMATE, Platform.SENSOR, Platform.SWITCH]
 
+STORAGE_VERSION = 1
+STORE_SAVE_DELAY = 300  # seconds; changes in between are coalesced into one write
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Maestro MCZ from a config entry."""
 
+    # Imported on use so loading the package (and the config flow with it)
+    # doesn't pull in the controller and transports
+    from .maestro.controller import MaestroController
+    from .maestro.local import MaestroLocalController
+
     hass.data.setdefault(DOMAIN, {})
 
-    controller = MaestroController(entry.data["serial"], entry.data["mac"])
+    if entry.data.get(CONF_CONNECTION_TYPE) == CONNECTION_LOCAL:
+        controller: MaestroController = MaestroLocalController(
+            entry.data["serial"],
+            entry.data["mac"],
+            entry.data[CONF_HOST],
+            session=async_get_clientsession(hass),
+        )
+        target = f"stove at {entry.data[CONF_HOST]}"
+    else:
+        controller = MaestroController(entry.data["serial"], entry.data["mac"])
+        target = "MCZ Cloud"
+
+    # Alarms go straight onto the event bus; register before the first frame
+    _setup_alarm_events(hass, entry, controller)
+    # Restore before the first connect: the handshake decides from the
+    # parameter cache what to fetch, and frames start adding consumption
+    await _async_setup_stores(hass, entry, controller)
 
     # Attempt initial connection; raise ConfigEntryNotReady on failure
     try:
@@ -31,7 +62,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except Exception as err:
         await controller.disconnect()
         raise ConfigEntryNotReady(
-            f"Unable to connect to MCZ Cloud for serial {entry.data['serial']}"
+            f"Unable to connect to {target} for serial {entry.data['serial']}"
         ) from err
 
     hass.data[DOMAIN][entry.entry_id] = controller
@@ -44,14 +75,96 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # send_command's _connected guard to avoid the connect/disconnect race).
     entry.async_create_background_task(hass, controller.connect(), "maestro_connect")
 
+    # Credentials and filter options are only read at setup
+    entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
+
     return True
 
 
+async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry after its data or options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         controller: MaestroController = hass.data[DOMAIN][entry.entry_id]
         await controller.disconnect()
+        await _async_save_stores(hass, controller)
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+def _setup_alarm_events(hass: HomeAssistant, entry: ConfigEntry, controller: MaestroController):
+    """Fire EVENT_ALARM when a stove alarm starts and when it clears."""
+
+    @callback
+    def _fire_alarm(alarm: MaestroStoveStateInfo, active: bool):
+        hass.bus.async_fire(
+            EVENT_ALARM,
+            {
+                "serial": controller.serial,
+                "state_id": alarm.id,
+                "code": alarm.error_code,
+                "description": alarm.description,
+                "active": active,
+            },
+        )
+
+    controller.add_alarm_listener(_fire_alarm)
+    entry.async_on_unload(lambda: controller.remove_alarm_listener(_fire_alarm))
+
+
+def _persisted_state(
+    controller: MaestroController,
+) -> list[tuple[str, str, Callable[[], Any], Callable[[Any], None]]]:
+    """Return (store name, changed field, dump, restore) for state kept across restarts."""
+    from .maestro.chrono import program_from_dict, program_to_dict
+
+    def dump_chrono():
+        program = controller.chrono_program
+        return program_to_dict(program) if program is not None else None
+
+    def restore_chrono(data):
+        try:
+            program = program_from_dict(data)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            # The stove sends the program again on connect
+            _LOGGER.warning("Dropping malformed stored chronostat program for %s", controller.serial)
+            return
+        controller.restore_chrono_program(program)
+
+    return [
+        ("consumption", CONSUMPTION_FIELD, controller.consumption.as_dict, controller.consumption.restore),
+        ("chrono", CHRONO_FIELD, dump_chrono, restore_chrono),
+        # Tagged with the firmware version; refetched when the stove reports another
+        ("parameters", PARAMETERS_FIELD, controller.parameters.as_dict, controller.parameters.restore),
+    ]
+
+
+def _store(hass: HomeAssistant, controller: MaestroController, name: str) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{controller.serial}.{name}")
+
+
+async def _async_setup_stores(hass: HomeAssistant, entry: ConfigEntry, controller: MaestroController):
+    """Restore persisted controller state and save it again whenever it changes."""
+    for name, field, dump, restore in _persisted_state(controller):
+        store = _store(hass, controller, name)
+        if data := await store.async_load():
+            restore(data)
+
+        @callback
+        def _schedule_save(store=store, field=field, dump=dump):
+            if field in controller.changed_fields:
+                store.async_delay_save(dump, STORE_SAVE_DELAY)
+
+        controller.add_listener(_schedule_save)
+        entry.async_on_unload(partial(controller.remove_listener, _schedule_save))
+
+
+async def _async_save_stores(hass: HomeAssistant, controller: MaestroController):
+    for name, _field, dump, _restore in _persisted_state(controller):
+        if (data := dump()) is not None:
+            await _store(hass, controller, name).async_save(data)
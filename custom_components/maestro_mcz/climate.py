@@ -1,4 +1,9 @@
 """Climate entity for Maestro MCZ."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
 from homeassistant.components.climate import (
     ClimateEntity,
     ClimateEntityFeature,
@@ -7,17 +12,31 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import (
+    ATTR_PARAMETERS,
+    ATTR_PROGRAM,
+    DOMAIN,
+    SERVICE_GET_CHRONO_PROGRAM,
+    SERVICE_REFRESH_PARAMETERS,
+    SERVICE_SET_DESIRED_STATE,
+    SERVICE_SET_PARAMETERS,
+)
 from .entity import MaestroEntity
-from .maestro.controller import MaestroController
+from .maestro.chrono import program_to_dict
 
-# Stove states that indicate active heating (power levels, stabilising, start phases)
-_HEATING_STATE_IDS = set(range(1, 16)) | {31}
-# Stove states that indicate cooling/extinguishing
-_COOLING_STATE_IDS = {40, 41, 42, 43}
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
+
+# State fields the climate attributes are derived from
+_SOURCE_FIELDS = frozenset(
+    {"Ambient_Temperature", "Active_Set_Point", "Power", "Stove_State", "Fan_State"}
+)
 
 
 async def async_setup_entry(
@@ -29,6 +48,28 @@ async def async_setup_entry(
     controller = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([MaestroClimate(controller)])
 
+    parameters_schema = {
+        vol.Required(ATTR_PARAMETERS): vol.All(
+            {cv.string: vol.Any(bool, int, float, cv.string)},
+            vol.Length(min=1),
+        ),
+    }
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_PARAMETERS, parameters_schema, "async_set_parameters",
+    )
+    platform.async_register_entity_service(
+        SERVICE_SET_DESIRED_STATE, parameters_schema, "async_set_desired_state",
+    )
+
+    platform.async_register_entity_service(
+        SERVICE_GET_CHRONO_PROGRAM, {}, "async_get_chrono_program",
+        supports_response=SupportsResponse.ONLY,
+    )
+    platform.async_register_entity_service(
+        SERVICE_REFRESH_PARAMETERS, {}, "async_refresh_parameters",
+    )
+
 
 class MaestroClimate(MaestroEntity, ClimateEntity):
     """Maestro Climate Entity."""
@@ -48,41 +89,47 @@ class MaestroClimate(MaestroEntity, ClimateEntity):
     _attr_fan_modes = ["1", "2", "3", "4", "5", "auto"]
     _attr_preset_modes = ["Power 1", "Power 2", "Power 3", "Power 4", "Power 5"]
     _attr_name = None
+    _source_fields = _SOURCE_FIELDS
 
     def __init__(self, controller: MaestroController):
         super().__init__(controller)
         self._attr_unique_id = f"{DOMAIN}_{controller.serial}_climate"
-
-    @property
-    def current_temperature(self) -> float | None:
-        return self._controller.state.get("Ambient_Temperature")
-
-    @property
-    def target_temperature(self) -> float | None:
-        return self._controller.state.get("Active_Set_Point")
-
-    @property
-    def hvac_mode(self) -> HVACMode:
-        val = self._controller.state.get("Power", 0)
-        return HVACMode.HEAT if val == 1 else HVACMode.OFF
-
-    @property
-    def hvac_action(self) -> HVACAction | None:
-        """Return the current HVAC action."""
-        stove_state = self._controller.state.get("Stove_State")
+        self._update_attrs()
+
+    async def async_added_to_hass(self) -> None:
+        """Catch up on frames decoded before the listener was registered."""
+        self._update_attrs()
+        await super().async_added_to_hass()
+
+    @callback
+    def _update_callback(self) -> None:
+        """Recompute attributes only when a field they depend on changed."""
+        if not self._controller.changed_fields.isdisjoint(_SOURCE_FIELDS):
+            self._update_attrs()
+        super()._update_callback()
+
+    def _update_attrs(self) -> None:
+        """Derive all climate attributes from the controller state."""
+        state = self._controller.state
+        self._attr_current_temperature = state.get("Ambient_Temperature")
+        self._attr_target_temperature = state.get("Active_Set_Point")
+        self._attr_hvac_mode = HVACMode.HEAT if state.get("Power", 0) == 1 else HVACMode.OFF
+
+        stove_state = self._controller.stove_state
         if stove_state is None:
-            return None
+            self._attr_hvac_action = None
+            self._attr_preset_mode = None
+        else:
+            self._attr_hvac_action = HVACAction(stove_state.hvac_action)
+            self._attr_preset_mode = stove_state.preset
+
+        fan_state = state.get("Fan_State")
         try:
-            state_id = int(stove_state)
+            fan_level = int(fan_state)
         except (ValueError, TypeError):
-            return None
-        if state_id == 0:
-            return HVACAction.OFF
-        if state_id in _HEATING_STATE_IDS:
-            return HVACAction.HEATING
-        if state_id in _COOLING_STATE_IDS:
-            return HVACAction.IDLE
-        return HVACAction.IDLE
+            self._attr_fan_mode = None
+        else:
+            self._attr_fan_mode = str(fan_level) if fan_level > 0 else "auto"
 
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
@@ -96,32 +143,6 @@ class MaestroClimate(MaestroEntity, ClimateEntity):
         elif hvac_mode == HVACMode.OFF:
             await self._controller.send_command("Power", 0)
 
-    @property
-    def fan_mode(self) -> str | None:
-        """Return the current fan mode."""
-        value = self._controller.state.get("Fan_State")
-        if value is None:
-            return None
-        try:
-            int_value = int(value)
-        except (ValueError, TypeError):
-            return None
-        return str(int_value) if int_value > 0 else "auto"
-
-    @property
-    def preset_mode(self) -> str | None:
-        """Return the current preset mode based on stove power state."""
-        stove_state = self._controller.state.get("Stove_State")
-        if stove_state is None:
-            return None
-        try:
-            state_id = int(stove_state)
-        except (ValueError, TypeError):
-            return None
-        if 11 <= state_id <= 15:
-            return f"Power {state_id - 10}"
-        return None
-
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new fan mode."""
         if fan_mode == "auto":
@@ -135,3 +156,22 @@ class MaestroClimate(MaestroEntity, ClimateEntity):
             return
         level = int(preset_mode.split()[-1])
         await self._controller.send_command("Power_Level", level)
+
+    async def async_set_parameters(self, parameters: dict[str, Any]) -> None:
+        """Write several stove parameters in one batch."""
+        await self._controller.set_parameters(parameters)
+
+    async def async_set_desired_state(self, parameters: dict[str, Any]) -> None:
+        """Declare target values and let the reconciler converge the stove."""
+        self._controller.reconciler.set_desired(parameters)
+
+    async def async_get_chrono_program(self) -> ServiceResponse:
+        """Return the cached chronostat program."""
+        program = self._controller.chrono_program
+        if program is None:
+            raise HomeAssistantError("The stove has not reported its chronostat program yet")
+        return {ATTR_PROGRAM: program_to_dict(program)}
+
+    async def async_refresh_parameters(self) -> None:
+        """Fetch the stove's Parameters and Database tables again."""
+        await self._controller.refresh_parameters()
@@ -1,15 +1,34 @@
 """Config flow for Maestro MCZ integration."""
+from __future__ import annotations
+
 import asyncio
 import logging
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
-from .maestro.controller import MaestroController
+from .const import (
+    CONF_CONNECTION_TYPE,
+    CONF_HOST,
+    CONF_MAX_QUIET_INTERVAL,
+    CONF_MIN_WRITE_INTERVAL,
+    CONNECTION_CLOUD,
+    CONNECTION_LOCAL,
+    DEADBAND_ABSOLUTE,
+    DEADBAND_PERCENTAGE,
+    DEFAULT_DEADBANDS,
+    DEFAULT_MAX_QUIET_INTERVAL,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DOMAIN,
+    deadband_mode_option,
+    deadband_option,
+)
+
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,10 +36,22 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required("serial"): str,
         vol.Required("mac"): str,
+        vol.Optional(CONF_HOST): str,
     }
 )
 
 
+def _create_controller(serial: str, mac: str, host: str | None) -> MaestroController:
+    """Create a controller for validation: local if a host was given, cloud otherwise."""
+    # Imported on use so loading the flow doesn't pull in the transports
+    from .maestro.controller import MaestroController
+    from .maestro.local import MaestroLocalController
+
+    if host:
+        return MaestroLocalController(serial, mac, host)
+    return MaestroController(serial, mac)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Maestro MCZ."""
 
@@ -35,6 +66,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             serial = user_input["serial"].strip()
             mac = user_input["mac"].strip().upper()
+            host = user_input.get(CONF_HOST, "").strip()
 
             if not re.match(r"^\d+$", serial):
                 errors["serial"] = "invalid_serial"
@@ -47,13 +79,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 await self.async_set_unique_id(serial)
                 self._abort_if_unique_id_configured()
 
-                # Validate connection to MCZ Cloud
-                controller = MaestroController(serial, mac)
+                # Validate connection to MCZ Cloud (or the stove itself)
+                controller = _create_controller(serial, mac, host)
                 try:
                     async with asyncio.timeout(10):
                         await controller.connect_once()
+                        # A wrong serial or MAC still connects to the cloud,
+                        # but no Info frame ever comes back
+                        await controller.request_info()
                 except Exception:
-                    _LOGGER.exception("Failed to connect to MCZ Cloud during setup")
+                    _LOGGER.exception("Failed to connect to %s during setup", controller.endpoint)
                     try:
                         await controller.disconnect()
                     except Exception:
@@ -61,10 +96,20 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     errors["base"] = "cannot_connect"
                 else:
                     await controller.disconnect()
+                    if host:
+                        return self.async_create_entry(
+                            title=f"Maestro Local ({serial})",
+                            data={
+                                CONF_CONNECTION_TYPE: CONNECTION_LOCAL,
+                                "serial": serial,
+                                "mac": mac,
+                                CONF_HOST: host,
+                            },
+                        )
                     return self.async_create_entry(
                         title=f"Maestro Cloud ({serial})",
                         data={
-                            "connection_type": "cloud",
+                            CONF_CONNECTION_TYPE: CONNECTION_CLOUD,
                             "serial": serial,
                             "mac": mac,
                         },
@@ -90,12 +135,19 @@ class MaestroOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle options step."""
+        """Let the user pick what to change."""
+        return self.async_show_menu(step_id="init", menu_options=["connection", "filters"])
+
+    async def async_step_connection(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Change the stove credentials or address."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
             serial = user_input["serial"].strip()
             mac = user_input["mac"].strip().upper()
+            host = user_input.get(CONF_HOST, "").strip()
 
             if not re.match(r"^\d+$", serial):
                 errors["serial"] = "invalid_serial"
@@ -103,13 +155,16 @@ class MaestroOptionsFlow(config_entries.OptionsFlow):
                 errors["mac"] = "invalid_mac"
             else:
                 # Validate connection with new credentials before persisting
-                controller = MaestroController(serial, mac)
+                controller = _create_controller(serial, mac, host)
                 try:
                     async with asyncio.timeout(10):
                         await controller.connect_once()
+                        # A wrong serial or MAC still connects to the cloud,
+                        # but no Info frame ever comes back
+                        await controller.request_info()
                 except Exception:
                     _LOGGER.exception(
-                        "Failed to connect to MCZ Cloud with new credentials"
+                        "Failed to connect to %s with new credentials", controller.endpoint
                     )
                     try:
                         await controller.disconnect()
@@ -118,21 +173,28 @@ class MaestroOptionsFlow(config_entries.OptionsFlow):
                     errors["base"] = "cannot_connect"
                 else:
                     await controller.disconnect()
-                    self.hass.config_entries.async_update_entry(
-                        self.config_entry,
-                        data={
-                            **self.config_entry.data,
+                    data = {
+                        key: value
+                        for key, value in self.config_entry.data.items()
+                        if key != CONF_HOST
+                    }
+                    data.update(
+                        {
+                            CONF_CONNECTION_TYPE: CONNECTION_LOCAL if host else CONNECTION_CLOUD,
                             "serial": serial,
                             "mac": mac,
-                        },
+                        }
                     )
-                    await self.hass.config_entries.async_reload(
-                        self.config_entry.entry_id
+                    if host:
+                        data[CONF_HOST] = host
+                    # The entry's update listener reloads it
+                    self.hass.config_entries.async_update_entry(
+                        self.config_entry, data=data,
                     )
-                    return self.async_create_entry(title="", data={})
+                    return self.async_create_entry(title="", data=dict(self.config_entry.options))
 
         return self.async_show_form(
-            step_id="init",
+            step_id="connection",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -143,7 +205,40 @@ class MaestroOptionsFlow(config_entries.OptionsFlow):
                         "mac",
                         default=self.config_entry.data.get("mac", ""),
                     ): str,
+                    vol.Optional(
+                        CONF_HOST,
+                        description={
+                            "suggested_value": self.config_entry.data.get(CONF_HOST)
+                        },
+                    ): str,
                 }
             ),
             errors=errors,
         )
+
+    async def async_step_filters(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Tune the deadbands that keep noisy sensors from writing every reading."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data={**self.config_entry.options, **user_input})
+
+        options = self.config_entry.options
+        schema: dict[Any, Any] = {}
+        for field, (threshold, mode) in DEFAULT_DEADBANDS.items():
+            threshold_key, mode_key = deadband_option(field), deadband_mode_option(field)
+            schema[vol.Optional(threshold_key, default=options.get(threshold_key, threshold))] = vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            )
+            schema[vol.Optional(mode_key, default=options.get(mode_key, mode))] = vol.In(
+                [DEADBAND_ABSOLUTE, DEADBAND_PERCENTAGE]
+            )
+        schema[vol.Optional(
+            CONF_MAX_QUIET_INTERVAL,
+            default=options.get(CONF_MAX_QUIET_INTERVAL, DEFAULT_MAX_QUIET_INTERVAL),
+        )] = vol.All(vol.Coerce(int), vol.Range(min=10))
+        schema[vol.Optional(
+            CONF_MIN_WRITE_INTERVAL,
+            default=options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL),
+        )] = vol.All(vol.Coerce(int), vol.Range(min=0))
+        return self.async_show_form(step_id="filters", data_schema=vol.Schema(schema))
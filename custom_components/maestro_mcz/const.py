@@ -1,3 +1,45 @@
 """Constants for the Maestro MCZ integration."""
 
 DOMAIN = "maestro_mcz"
+
+CONF_CONNECTION_TYPE = "connection_type"
+CONF_HOST = "host"
+
+CONNECTION_CLOUD = "cloud"
+CONNECTION_LOCAL = "local"
+
+ATTR_PARAMETERS = "parameters"
+ATTR_PROGRAM = "program"
+
+SERVICE_SET_PARAMETERS = "set_parameters"
+SERVICE_SET_DESIRED_STATE = "set_desired_state"
+SERVICE_GET_CHRONO_PROGRAM = "get_chrono_program"
+SERVICE_REFRESH_PARAMETERS = "refresh_parameters"
+
+EVENT_ALARM = f"{DOMAIN}_alarm"
+
+# Deadband filtering of noisy sensors (options flow)
+CONF_MAX_QUIET_INTERVAL = "max_quiet_interval"
+DEADBAND_ABSOLUTE = "absolute"
+DEADBAND_PERCENTAGE = "percentage"
+# State field -> (threshold, mode) used until the options say otherwise
+DEFAULT_DEADBANDS: dict[str, tuple[float, str]] = {
+    "Fume_Temperature": (1.0, DEADBAND_ABSOLUTE),
+    "RPM_Fam_Fume": (5.0, DEADBAND_PERCENTAGE),
+    "RPM_WormWheel": (5.0, DEADBAND_PERCENTAGE),
+}
+DEFAULT_MAX_QUIET_INTERVAL = 300  # seconds
+
+# Minimum time between two state writes of a diagnostic or high-rate sensor
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+DEFAULT_MIN_WRITE_INTERVAL = 30  # seconds; 0 writes every change
+
+
+def deadband_option(field: str) -> str:
+    """Return the options key holding the deadband threshold of a state field."""
+    return f"deadband_{field.lower()}"
+
+
+def deadband_mode_option(field: str) -> str:
+    """Return the options key holding the deadband mode of a state field."""
+    return f"deadband_mode_{field.lower()}"
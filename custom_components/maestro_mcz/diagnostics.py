@@ -0,0 +1,34 @@
+"""Diagnostics support for Maestro MCZ."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOST, DOMAIN
+
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
+
+# The entry title carries the serial, the endpoint carries the local host
+TO_REDACT = {"serial", "mac", "title", CONF_HOST, "endpoint"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    controller: MaestroController = hass.data[DOMAIN][entry.entry_id]
+    return async_redact_data(
+        {
+            "entry": {
+                "title": entry.title,
+                "data": dict(entry.data),
+                "options": dict(entry.options),
+            },
+            "controller": controller.diagnostics(),
+        },
+        TO_REDACT,
+    )
@@ -1,14 +1,29 @@
 """Base entity for Maestro MCZ."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo, Entity
 
 from .const import DOMAIN
-from .maestro.controller import MaestroController
+
+if TYPE_CHECKING:
+    from .filters import WriteScheduler
+    from .maestro.controller import MaestroController
 
 
 class MaestroEntity(Entity):
     """Base class for Maestro Entities."""
 
+    # State is pushed by the controller; update_entity goes through async_update
+    _attr_should_poll = False
+    # Set by throttle_writes() for sensors whose state changes faster than it's worth recording
+    _write_scheduler: WriteScheduler | None = None
+    _min_write_interval = 0.0
+    # State fields the entity shows; None for all of them
+    _source_fields: frozenset[str] | None = None
+
     def __init__(self, controller: MaestroController):
         self._controller = controller
         self._attr_has_entity_name = True
@@ -27,12 +42,39 @@ class MaestroEntity(Entity):
     async def async_will_remove_from_hass(self) -> None:
         """Unregister callbacks."""
         self._controller.remove_listener(self._update_callback)
+        if self._write_scheduler is not None:
+            self._write_scheduler.cancel(self)
         await super().async_will_remove_from_hass()
 
+    async def async_update(self) -> None:
+        """Ask the controller for fresh state, throttled per stove."""
+        await self._controller.refresh()
+
+    def throttle_writes(self, scheduler: WriteScheduler, interval: float):
+        """Write state at most every `interval` seconds, the latest state last."""
+        self._write_scheduler = scheduler
+        self._min_write_interval = interval
+
     @callback
     def _update_callback(self) -> None:
         """Update the entity."""
-        self.async_write_ha_state()
+        if self._source_changed():
+            self._write_state()
+
+    def _source_changed(self) -> bool:
+        """Return False for a data update that touches none of the entity's source fields."""
+        changed = self._controller.changed_fields
+        # Connection changes (no changed fields) concern every entity: availability
+        return not changed or self._source_fields is None or not changed.isdisjoint(self._source_fields)
+
+    @callback
+    def _write_state(self) -> None:
+        """Write the state now, or through the write scheduler if throttled."""
+        # Connection changes (no changed fields) go straight through: availability
+        if self._write_scheduler is None or not self._controller.changed_fields:
+            self.async_write_ha_state()
+        else:
+            self._write_scheduler.write(self, self._min_write_interval, self.async_write_ha_state)
 
     @property
     def available(self) -> bool:
@@ -0,0 +1,176 @@
+"""State write filtering for Maestro MCZ sensors."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from .const import (
+    CONF_MAX_QUIET_INTERVAL,
+    DEADBAND_ABSOLUTE,
+    DEADBAND_PERCENTAGE,
+    DEFAULT_DEADBANDS,
+    DEFAULT_MAX_QUIET_INTERVAL,
+    deadband_mode_option,
+    deadband_option,
+)
+
+
+@dataclass(frozen=True)
+class Deadband:
+    """How far a value must move from the last written one to be written again."""
+    threshold: float
+    mode: str = DEADBAND_ABSOLUTE  # or DEADBAND_PERCENTAGE, of the last written value
+
+    def exceeded(self, last: float, value: float) -> bool:
+        limit = self.threshold
+        if self.mode == DEADBAND_PERCENTAGE:
+            limit = abs(last) * self.threshold / 100
+        if not limit:
+            # A percentage of 0: any change leaves the band, no change doesn't
+            return value != last
+        return abs(value - last) >= limit
+
+
+class DeadbandFilter:
+    """Decide which readings of a noisy sensor are worth a state write.
+
+    A reading is written when it leaves the band around the last written
+    value, so a value flickering by a step around one level is written once:
+    the band moves with what was written, not with every reading, which is
+    what gives the filter its hysteresis. A reading is also written when
+    nothing was for `max_quiet` seconds, to keep slow trends visible. None
+    and non-numeric values always pass.
+    """
+
+    def __init__(self, deadband: Deadband, max_quiet: float):
+        self._deadband = deadband
+        self._max_quiet = max_quiet
+        self._last: Any = None
+        self._last_at = 0.0
+        self.suppressed = 0
+
+    def accept(self, value: Any, now: float) -> bool:
+        """Return True, and remember `value`, if it should be written."""
+        last = self._last
+        if (
+            last is None
+            or not _is_number(value)
+            or not _is_number(last)
+            or now - self._last_at >= self._max_quiet
+            or self._deadband.exceeded(last, value)
+        ):
+            self._last = value
+            self._last_at = now
+            return True
+        self.suppressed += 1
+        return False
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def deadband_filter(options: dict[str, Any], field: str) -> DeadbandFilter | None:
+    """Build the filter configured in the entry options for `field`, if any."""
+    if field not in DEFAULT_DEADBANDS:
+        return None
+    default_threshold, default_mode = DEFAULT_DEADBANDS[field]
+    threshold = options.get(deadband_option(field), default_threshold)
+    if not threshold:
+        return None
+    return DeadbandFilter(
+        Deadband(threshold, options.get(deadband_mode_option(field), default_mode)),
+        options.get(CONF_MAX_QUIET_INTERVAL, DEFAULT_MAX_QUIET_INTERVAL),
+    )
+
+
+class WriteScheduler:
+    """Hold state writes of many entities to a minimum interval, on one timer.
+
+    A write arriving within `interval` of the entity's last one is deferred
+    to the end of that interval; writes arriving meanwhile replace it, so
+    only the latest state is written, but it always is (trailing edge).
+    Deferred writes sit in a heap ordered by due time and a single loop
+    timer is armed for the earliest, so the cost does not grow with a timer
+    per entity.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._last_write: dict[Hashable, float] = {}
+        self._pending: dict[Hashable, tuple[float, Callable[[], None]]] = {}
+        self._due: list[tuple[float, int, Hashable]] = []
+        self._sequence = 0  # heap tie-breaker; keys need not be comparable
+        self._timer: asyncio.TimerHandle | None = None
+        self.deferred = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def write(self, key: Hashable, interval: float, write: Callable[[], None]) -> bool:
+        """Call `write` now if `key` wasn't written in the last `interval` seconds.
+
+        Otherwise schedule it for the end of the interval and return False.
+        """
+        now = self._loop.time()
+        if key in self._pending:
+            due, _ = self._pending[key]
+            self._pending[key] = (due, write)
+            self.deferred += 1
+            return False
+        last = self._last_write.get(key)
+        if last is None or now - last >= interval:
+            self._last_write[key] = now
+            write()
+            return True
+        due = last + interval
+        self._pending[key] = (due, write)
+        self._sequence += 1
+        heapq.heappush(self._due, (due, self._sequence, key))
+        self.deferred += 1
+        self._arm()
+        return False
+
+    def cancel(self, key: Hashable):
+        """Forget `key`, dropping its deferred write."""
+        self._pending.pop(key, None)
+        self._last_write.pop(key, None)
+
+    def shutdown(self):
+        """Drop every deferred write and stop the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
+        self._last_write.clear()
+        self._due.clear()
+
+    def _arm(self):
+        # Entries of cancelled keys are left in the heap and skipped here
+        while self._due and self._due[0][2] not in self._pending:
+            heapq.heappop(self._due)
+        if not self._due:
+            return
+        when = self._due[0][0]
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = self._loop.call_at(when, self._flush)
+
+    def _flush(self):
+        self._timer = None
+        now = self._loop.time()
+        while self._due and self._due[0][0] <= now:
+            due, _, key = heapq.heappop(self._due)
+            pending = self._pending.get(key)
+            # A key cancelled and deferred again has a later entry of its own
+            if pending is None or pending[0] != due:
+                continue
+            del self._pending[key]
+            self._last_write[key] = now
+            pending[1]()
+        self._arm()
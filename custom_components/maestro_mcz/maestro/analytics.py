@@ -0,0 +1,163 @@
+"""Offline statistics over recorded Maestro MCZ Info frames.
+
+Works on the column chunks produced by maestro.archive, so archives of any
+length are processed with memory bounded by the chunk size. Requires numpy.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from .archive import DEFAULT_CHUNK_SIZE, DecodedFrames, iter_recording_chunks
+from .consumption import MAX_INTEGRATION_GAP, POWER_LEVELS
+from .types import MAESTRO_POWER_LEVEL_STATE_IDS, MAESTRO_STOVE_STATE_TABLE
+
+# Start-up phases, from "Checking hot or cold" to "Stabilising"
+IGNITION_STATE_IDS = np.arange(1, 11)
+ERROR_CODES_BY_STATE_ID = {
+    row.id: row.error_code for row in MAESTRO_STOVE_STATE_TABLE.values() if row.error_code
+}
+IGNITION_FAILURE_CODES = ("A01", "A02")  # Ignition failed, no flame
+_MAX_STATE_ID = 256
+_POWER_LEVEL_IDS = np.asarray(MAESTRO_POWER_LEVEL_STATE_IDS)
+
+
+class FrameStatistics:
+    """Accumulate duty cycle, ignition and fault statistics chunk by chunk.
+
+    Feed DecodedFrames in recording order through update(). The interval
+    between two frames is credited to the earlier frame's state; intervals
+    longer than `max_gap` (a disconnect, a gap in the archive) are left out of
+    the time-based figures. The last frame of each chunk is carried over so
+    chunk boundaries don't lose an interval or a transition.
+    """
+
+    def __init__(self, max_gap: float = MAX_INTEGRATION_GAP):
+        self._max_gap = max_gap
+        self.frames = 0
+        self.ignition_attempts = 0
+        self._state_seconds = np.zeros(_MAX_STATE_ID)
+        self._state_entries = np.zeros(_MAX_STATE_ID, dtype=np.int64)
+        levels = len(POWER_LEVELS) + 1  # indexed by power level, 0 unused
+        self._fume_sum = np.zeros(levels)
+        self._fume_count = np.zeros(levels, dtype=np.int64)
+        self._heat_delta = np.zeros(levels)
+        self._heat_seconds = np.zeros(levels)
+        self._last: DecodedFrames | None = None
+
+    @property
+    def time_in_state(self) -> dict[int, float]:
+        """Return seconds spent in each Stove_State id seen."""
+        return {
+            int(state_id): float(self._state_seconds[state_id])
+            for state_id in np.flatnonzero(self._state_seconds)
+        }
+
+    @property
+    def fault_counts(self) -> dict[str, int]:
+        """Return how many times each error state was entered, by error code."""
+        return {
+            code: int(self._state_entries[state_id])
+            for state_id, code in ERROR_CODES_BY_STATE_ID.items()
+            if self._state_entries[state_id]
+        }
+
+    @property
+    def ignition_failures(self) -> int:
+        """Return entries into the A01 / A02 error states."""
+        faults = self.fault_counts
+        return sum(faults.get(code, 0) for code in IGNITION_FAILURE_CODES)
+
+    def mean_fume_temperature(self, level: int) -> float | None:
+        """Return the mean fume temperature while burning at a power level."""
+        if not self._fume_count[level]:
+            return None
+        return float(self._fume_sum[level] / self._fume_count[level])
+
+    def heat_up_rate(self, level: int | None = None) -> float | None:
+        """Return the mean ambient temperature change in °C/h while burning.
+
+        For one power level, or across all of them when `level` is None.
+        """
+        if level is None:
+            delta, seconds = self._heat_delta.sum(), self._heat_seconds.sum()
+        else:
+            delta, seconds = self._heat_delta[level], self._heat_seconds[level]
+        if not seconds:
+            return None
+        return float(delta / seconds * 3600)
+
+    def update(self, decoded: DecodedFrames):
+        """Fold one chunk of decoded frames into the statistics."""
+        if not len(decoded):
+            return
+        self.frames += len(decoded)
+        chunk = decoded
+        if self._last is not None:
+            chunk = _concat(self._last, decoded)
+
+        timestamps = chunk.timestamps
+        state = chunk.columns["Stove_State"]
+        state_ok = chunk.valid["Stove_State"] & (state >= 0) & (state < _MAX_STATE_ID)
+        ambient = chunk.columns["Ambient_Temperature"]
+        ambient_ok = chunk.valid["Ambient_Temperature"]
+
+        # Intervals between consecutive frames, credited to the earlier one
+        elapsed = np.diff(timestamps)
+        timed = (elapsed > 0) & (elapsed <= self._max_gap) & state_ok[:-1]
+        self._state_seconds += np.bincount(
+            state[:-1][timed], weights=elapsed[timed], minlength=_MAX_STATE_ID,
+        )[:_MAX_STATE_ID]
+
+        # State transitions
+        before, after = state[:-1], state[1:]
+        entered = state_ok[:-1] & state_ok[1:] & (before != after)
+        self._state_entries += np.bincount(after[entered], minlength=_MAX_STATE_ID)[:_MAX_STATE_ID]
+        self.ignition_attempts += int(np.count_nonzero(
+            entered & ~np.isin(before, IGNITION_STATE_IDS) & np.isin(after, IGNITION_STATE_IDS)
+        ))
+
+        # Fume temperature per power level, over the new frames only
+        new = slice(len(chunk) - len(decoded), None)
+        level = np.where(np.isin(state, _POWER_LEVEL_IDS) & state_ok, state - 10, 0)
+        fume_ok = decoded.valid["Fume_Temperature"] & (level[new] > 0)
+        self._fume_sum += np.bincount(
+            level[new][fume_ok], weights=decoded.columns["Fume_Temperature"][fume_ok],
+            minlength=len(self._fume_sum),
+        )
+        self._fume_count += np.bincount(level[new][fume_ok], minlength=len(self._fume_count))
+
+        # Ambient heat-up over intervals spent burning at a power level
+        heating = timed & (level[:-1] > 0) & ambient_ok[:-1] & ambient_ok[1:]
+        self._heat_delta += np.bincount(
+            level[:-1][heating], weights=np.diff(ambient)[heating], minlength=len(self._heat_delta),
+        )
+        self._heat_seconds += np.bincount(
+            level[:-1][heating], weights=elapsed[heating], minlength=len(self._heat_seconds),
+        )
+
+        self._last = _tail(chunk)
+
+
+def _tail(decoded: DecodedFrames) -> DecodedFrames:
+    """Return the last frame of `decoded` as a one-frame DecodedFrames."""
+    return DecodedFrames(
+        decoded.timestamps[-1:],
+        {name: column[-1:] for name, column in decoded.columns.items()},
+        {name: valid[-1:] for name, valid in decoded.valid.items()},
+    )
+
+
+def _concat(first: DecodedFrames, second: DecodedFrames) -> DecodedFrames:
+    return DecodedFrames(
+        np.concatenate((first.timestamps, second.timestamps)),
+        {name: np.concatenate((column, second.columns[name])) for name, column in first.columns.items()},
+        {name: np.concatenate((valid, second.valid[name])) for name, valid in first.valid.items()},
+    )
+
+
+def analyse_recording(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> FrameStatistics:
+    """Compute FrameStatistics over a recorded frame file, streaming it in chunks."""
+    stats = FrameStatistics()
+    for decoded in iter_recording_chunks(path, chunk_size):
+        stats.update(decoded)
+    return stats
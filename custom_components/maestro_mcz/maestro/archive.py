@@ -0,0 +1,141 @@
+"""Batch decoding of recorded Maestro MCZ Info frames.
+
+Offline counterpart of MaestroController._process_info_frame for archives
+holding thousands of frames: the hex fields of every frame are parsed and
+converted column by column with NumPy instead of one frame at a time.
+Requires numpy, which the integration itself does not depend on.
+"""
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .transport import iter_recording
+from .types import MAESTRO_INFO, MaestroMessageType
+
+DEFAULT_CHUNK_SIZE = 50_000  # frames decoded at a time when streaming an archive
+INFO_PREFIX = MaestroMessageType.Info.value + "|"
+FRAME_WIDTH = max(MAESTRO_INFO) + 1  # message type + every known position
+
+_FIELD_SEPARATOR = ord("|")
+_FRAME_SEPARATOR = ord("\n")
+# Byte -> hex digit value, -1 for anything that isn't a hex digit
+_HEX_DIGITS = np.full(256, -1, dtype=np.int64)
+for _digit, _char in enumerate("0123456789abcdef"):
+    _HEX_DIGITS[ord(_char)] = _digit
+    _HEX_DIGITS[ord(_char.upper())] = _digit
+_MAX_DIGITS = 15  # longer fields are treated as invalid rather than overflowing int64
+
+
+@dataclass
+class DecodedFrames:
+    """Info frames decoded into one array per MAESTRO_INFO field.
+
+    `columns` holds the converted values (float64 for temperatures, bool for
+    on/off fields, int64 otherwise). `valid` is False where a frame was too
+    short to carry the field or the field wasn't hex; the column value there
+    is 0 and should be ignored, as _process_info_frame would skip it.
+    """
+    timestamps: np.ndarray  # float64 seconds, NaN when not recorded
+    columns: dict[str, np.ndarray]
+    valid: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def _parse_hex(frames: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Parse the pipe-separated hex fields of `frames` in one pass.
+
+    All frames are laid out in a single byte buffer; field boundaries, field
+    positions and digit values are then computed for every byte at once.
+    Returns (values, valid), both shaped (len(frames), FRAME_WIDTH).
+    """
+    values = np.zeros((len(frames), FRAME_WIDTH), dtype=np.int64)
+    valid = np.zeros((len(frames), FRAME_WIDTH), dtype=bool)
+    if not frames:
+        return values, valid
+
+    text = "\n".join(frames) + "\n"
+    buf = np.frombuffer(text.encode("ascii", "replace"), dtype=np.uint8)
+    is_sep = (buf == _FIELD_SEPARATOR) | (buf == _FRAME_SEPARATOR)
+    sep_at = np.flatnonzero(is_sep)  # one separator closes every field
+    ends_frame = buf[sep_at] == _FRAME_SEPARATOR
+    frame_of_field = np.cumsum(ends_frame) - ends_frame
+    first_field = np.concatenate(([0], np.flatnonzero(ends_frame)[:-1] + 1))
+    position = np.arange(len(sep_at)) - first_field[frame_of_field]
+    field_start = np.concatenate(([0], sep_at[:-1] + 1))
+    length = sep_at - field_start
+
+    # Horner's rule across fields, one digit column at a time; fields are
+    # rarely more than two digits long
+    field_value = np.zeros(len(sep_at), dtype=np.int64)
+    field_valid = (length > 0) & (length <= _MAX_DIGITS)
+    for i in range(min(int(length.max()), _MAX_DIGITS)):
+        present = length > i
+        digit = _HEX_DIGITS[buf[np.where(present, field_start + i, 0)]]
+        field_value = np.where(present, field_value * 16 + digit, field_value)
+        field_valid &= ~present | (digit >= 0)
+
+    keep = position < FRAME_WIDTH
+    rows, cols = frame_of_field[keep], position[keep]
+    values[rows, cols] = np.where(field_valid[keep], field_value[keep], 0)
+    valid[rows, cols] = field_valid[keep]
+    return values, valid
+
+
+def _convert_column(message_type: str, raw: np.ndarray) -> np.ndarray:
+    """Vectorised MaestroController._convert_value."""
+    if message_type == "temperature":
+        return raw / 2.0
+    if message_type == "onoff":
+        return raw == 1
+    return raw
+
+
+def decode_info_frames(
+    frames: Iterable[str], timestamps: Sequence[float] | None = None,
+) -> DecodedFrames:
+    """Decode raw frames into columns. Frames other than Info are dropped.
+
+    `timestamps`, if given, runs parallel to `frames`.
+    """
+    info_frames = []
+    kept_times = []
+    for index, frame in enumerate(frames):
+        if frame.startswith(INFO_PREFIX):
+            info_frames.append(frame)
+            kept_times.append(timestamps[index] if timestamps is not None else np.nan)
+    values, valid = _parse_hex(info_frames)
+
+    columns = {}
+    valid_by_name = {}
+    for position, info in MAESTRO_INFO.items():
+        columns[info.name] = _convert_column(info.message_type, values[:, position])
+        valid_by_name[info.name] = valid[:, position]
+    return DecodedFrames(np.asarray(kept_times, dtype=np.float64), columns, valid_by_name)
+
+
+def load_recording(path: str | Path) -> DecodedFrames:
+    """Decode every Info frame of a recorded frame file (see iter_recording)."""
+    timestamps = []
+    frames = []
+    for timestamp, frame in iter_recording(path):
+        timestamps.append(timestamp)
+        frames.append(frame)
+    return decode_info_frames(frames, timestamps)
+
+
+def iter_recording_chunks(
+    path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[DecodedFrames]:
+    """Decode a recorded frame file `chunk_size` frames at a time.
+
+    Memory stays bounded by the chunk size however long the recording is.
+    """
+    records = iter_recording(path)
+    while chunk := list(islice(records, chunk_size)):
+        timestamps = [timestamp for timestamp, _ in chunk]
+        yield decode_info_frames([frame for _, frame in chunk], timestamps)
@@ -0,0 +1,102 @@
+"""Chronostat weekly program for Maestro MCZ.
+
+MCZ does not document the ChronoDays (04) frame. The layout below is the one
+this integration assumes; every encoder and decoder goes through these
+constants so it can be corrected in one place:
+
+- from position CHRONO_FIRST_POSITION on, days Monday to Sunday, each with
+  CHRONO_SLOTS_PER_DAY programs of three fields: start, stop and enabled
+- start and stop are quarter hours since midnight (0-96), enabled is 0/1
+
+The program is read-only: the parameter registers holding these fields are
+not known, and writing guessed registers could change unrelated settings.
+It is requested with CHRONO_REQUEST, also an assumption.
+"""
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+CHRONO_REQUEST = "C|RecuperoChrono"
+CHRONO_DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+CHRONO_SLOTS_PER_DAY = 3
+CHRONO_FIELDS_PER_SLOT = 3  # start, stop, enabled
+CHRONO_FIRST_POSITION = 1
+CHRONO_MINUTES_PER_STEP = 15
+
+
+@dataclass(frozen=True)
+class ChronoSlot:
+    """One daily program: heat from start to stop when enabled."""
+    start: int  # minutes since midnight
+    stop: int
+    enabled: bool
+
+
+OFF_SLOT = ChronoSlot(0, 0, False)
+
+# ChronoProgram[day][slot], Monday first
+ChronoProgram = tuple[tuple[ChronoSlot, ...], ...]
+
+
+def _slot_index(day: int, slot: int) -> int:
+    return (day * CHRONO_SLOTS_PER_DAY + slot) * CHRONO_FIELDS_PER_SLOT
+
+
+def decode_chrono_frame(parts: list[str]) -> ChronoProgram | None:
+    """Decode a split ChronoDays frame. Returns None if it is short or malformed."""
+    fields_needed = len(CHRONO_DAYS) * CHRONO_SLOTS_PER_DAY * CHRONO_FIELDS_PER_SLOT
+    fields = parts[CHRONO_FIRST_POSITION:CHRONO_FIRST_POSITION + fields_needed]
+    if len(fields) < fields_needed:
+        return None
+    try:
+        raw = [int(field, 16) for field in fields]
+    except ValueError:
+        return None
+    days = []
+    for day in range(len(CHRONO_DAYS)):
+        slots = []
+        for slot in range(CHRONO_SLOTS_PER_DAY):
+            i = _slot_index(day, slot)
+            slots.append(ChronoSlot(
+                raw[i] * CHRONO_MINUTES_PER_STEP,
+                raw[i + 1] * CHRONO_MINUTES_PER_STEP,
+                raw[i + 2] == 1,
+            ))
+        days.append(tuple(slots))
+    return tuple(days)
+
+
+def _format_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _parse_time(value: str) -> int:
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def program_to_dict(program: ChronoProgram) -> dict[str, list[dict[str, Any]]]:
+    """Return the program keyed by day name, times as 'HH:MM'."""
+    return {
+        day: [
+            {"start": _format_time(s.start), "stop": _format_time(s.stop), "enabled": s.enabled}
+            for s in slots
+        ]
+        for day, slots in zip(CHRONO_DAYS, program)
+    }
+
+
+def program_from_dict(data: Mapping[str, list[Mapping[str, Any]]]) -> ChronoProgram:
+    """Rebuild a program stored by program_to_dict.
+
+    Days missing from `data`, and the slots a day doesn't list, are off.
+    Raises AttributeError, KeyError, TypeError or ValueError on malformed data.
+    """
+    days = []
+    for day in CHRONO_DAYS:
+        slots = [
+            ChronoSlot(_parse_time(entry["start"]), _parse_time(entry["stop"]), bool(entry["enabled"]))
+            for entry in data.get(day, [])[:CHRONO_SLOTS_PER_DAY]
+        ]
+        slots.extend([OFF_SLOT] * (CHRONO_SLOTS_PER_DAY - len(slots)))
+        days.append(tuple(slots))
+    return tuple(days)
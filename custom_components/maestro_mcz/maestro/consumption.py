@@ -0,0 +1,76 @@
+"""Pellet consumption and burner runtime estimation for Maestro MCZ."""
+from typing import Any
+
+# Mass of pellets moved per auger (worm wheel) revolution. Stove-specific;
+# calibrate against a weighed bag if the estimate drifts.
+DEFAULT_PELLET_GRAMS_PER_REVOLUTION = 1.5
+# Intervals longer than this between frames are not integrated: we don't
+# know what the stove did while we weren't hearing from it.
+MAX_INTEGRATION_GAP = 600  # seconds
+
+POWER_LEVELS = (1, 2, 3, 4, 5)
+
+
+class ConsumptionEstimator:
+    """Streaming accumulator of estimated pellet use and runtime per power level.
+
+    Each frame closes the interval since the previous one, which is credited
+    to the previous frame's readings (the stove is assumed to hold its power
+    level and auger speed until told otherwise). Work per frame is constant,
+    and only the running totals are kept.
+    """
+
+    def __init__(self, grams_per_revolution: float = DEFAULT_PELLET_GRAMS_PER_REVOLUTION):
+        self._grams_per_revolution = grams_per_revolution
+        self._pellets_kg = 0.0
+        self._runtime = dict.fromkeys(POWER_LEVELS, 0.0)  # seconds
+        self._last_at: float | None = None
+        self._last_level: int | None = None
+        self._last_rpm: int | None = None
+
+    @property
+    def pellets_kg(self) -> float:
+        """Return the estimated pellets burnt, in kilograms."""
+        return self._pellets_kg
+
+    def runtime_hours(self, level: int | None = None) -> float:
+        """Return burner runtime in hours, for one power level or in total."""
+        if level is None:
+            return sum(self._runtime.values()) / 3600
+        return self._runtime[level] / 3600
+
+    def update(self, now: float, power_level: int | None, auger_rpm: int | None) -> bool:
+        """Account for the interval ending at `now`. Returns True if totals grew."""
+        grew = False
+        if self._last_at is not None:
+            elapsed = now - self._last_at
+            if 0 < elapsed <= MAX_INTEGRATION_GAP:
+                if self._last_level in self._runtime:
+                    self._runtime[self._last_level] += elapsed
+                    grew = True
+                if self._last_rpm:
+                    revolutions = self._last_rpm * elapsed / 60
+                    self._pellets_kg += revolutions * self._grams_per_revolution / 1000
+                    grew = True
+        self._last_at = now
+        self._last_level = power_level
+        self._last_rpm = auger_rpm
+        return grew
+
+    def reset_interval(self):
+        """Forget the open interval, e.g. after a disconnect."""
+        self._last_at = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals in a JSON-serialisable form for storage."""
+        return {
+            "pellets_kg": self._pellets_kg,
+            "runtime": {str(level): seconds for level, seconds in self._runtime.items()},
+        }
+
+    def restore(self, data: dict[str, Any]):
+        """Load totals previously returned by as_dict()."""
+        self._pellets_kg = float(data.get("pellets_kg", 0.0))
+        for level, seconds in data.get("runtime", {}).items():
+            if int(level) in self._runtime:
+                self._runtime[int(level)] = float(seconds)
@@ -1,18 +1,42 @@
 """Maestro MCZ Controller."""
 import asyncio
+import inspect
 import logging
+import random
 import time
-from typing import Any, Callable
+import weakref
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Hashable, Mapping
 
-import socketio
 from homeassistant.exceptions import HomeAssistantError
 
+from .chrono import CHRONO_REQUEST, ChronoProgram, decode_chrono_frame
+from .consumption import ConsumptionEstimator
+from .encoders import COMMAND_ENCODERS
+from .layouts import DATABASE_NAME_REQUEST, DEFAULT_DECODER, InfoDecoder, decode_database_name, select_decoder
+from .outbound import OFFLINE_COMMAND_TTL, CommandPriority, CommandQueue, OfflineBuffer
+from .parameters import (
+    SOFTWARE_VERSION_REQUEST,
+    TABLE_FRAMES,
+    TABLE_REQUESTS,
+    ParameterCache,
+    decode_software_version,
+    decode_table_frame,
+)
+from .reconciler import MaestroReconciler
+from .transport import CloudTransport, MaestroTransport
 from .types import (
-    MAESTRO_COMMANDS_BY_NAME,
-    MAESTRO_INFO,
+    CHRONO_FIELD,
+    CONSUMPTION_FIELD,
+    MAESTRO_ALARM_STATE_IDS,
+    MAESTRO_POWER_LEVEL_STATE_IDS,
     MAESTRO_STOVE_STATES_BY_ID,
+    PARAMETERS_FIELD,
     MaestroMessageType,
     MaestroStoveState,
+    MaestroStoveStateInfo,
+    get_stove_state_info,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,38 +44,81 @@ _LOGGER = logging.getLogger(__name__)
 POLL_INTERVAL = 120  # seconds between periodic GetInfo requests
 RECONNECT_BASE_DELAY = 10
 RECONNECT_MAX_DELAY = 300
+RECONNECT_FAST_DELAY = 1.0  # upper bound of the first retry after a working link drops
+RECONNECT_JITTER = 0.2  # backoff delays vary by +-20% so a fleet doesn't retry in lockstep
+CONFIRM_TIMEOUT = 15  # seconds to wait for the Info frame confirming a write
+INFO_MAX_AGE = 5  # seconds an Info frame answers request_info without asking the stove
+REFRESH_MIN_INTERVAL = 10  # seconds an Info frame answers an on-demand refresh
+DIAGNOSTICS_FRAMES = 20  # raw frames kept for the diagnostics download
+GET_INFO_REQUEST = "C|RecuperoInfo"
 
 
 class MaestroController:
-    """Maestro Controller handling Cloud Socket.IO connection."""
-
-    URL = "http://app.mcz.it:9000"
+    """Maestro Controller driving a stove over a pluggable transport."""
 
-    def __init__(self, serial: str, mac: str):
+    def __init__(self, serial: str, mac: str, transport: MaestroTransport | None = None):
         self._serial = serial
         self._mac = mac
-        # Disable built-in reconnection — we manage our own loop
-        self._sio = socketio.AsyncClient(
-            logger=False, engineio_logger=False, reconnection=False,
-        )
+        self._transport = transport or CloudTransport(serial, mac)
+        self._transport.attach(self._on_connect, self._on_disconnect, self._on_message)
         self._state: dict[str, Any] = {}
-        self._listeners: list[Callable] = []
+        self._stove_state: MaestroStoveStateInfo | None = None
+        self._changed_fields: frozenset[str] = frozenset()
+        # Bound methods are held weakly so a missed remove_listener doesn't
+        # keep an entity alive; plain functions are held strongly.
+        self._listeners: dict[Hashable, Callable | weakref.WeakMethod] = {}
+        self._collected_listeners = 0
+        self._alarm_listeners: dict[Hashable, Callable[[MaestroStoveStateInfo, bool], None]] = {}
+        self._active_alarm: MaestroStoveStateInfo | None = None
         self._connected = False
         self._running = False
         self._retry_delay = RECONNECT_BASE_DELAY
+        self._fast_retry = False  # set once a link has worked, see _next_retry_delay
+        self._reconnects = 0
+        self._link_lost_at: float | None = None
+        self._connected_at: float | None = None
+        self._awaiting_first_frame = False
+        self._last_first_frame: float | None = None
+        self._last_recovery: float | None = None
         self._poll_task: asyncio.Task | None = None
         self._last_data_at: float = 0.0
-
-        # Register events
-        self._sio.on("connect", self._on_connect)
-        self._sio.on("disconnect", self._on_disconnect)
-        self._sio.on("rispondo", self._on_rispondo)
+        self._last_poll_at: float = 0.0
+        self._recent_frames: deque[tuple[float, str]] = deque(maxlen=DIAGNOSTICS_FRAMES)
+        self._decode_count = 0
+        self._decode_last = 0.0
+        self._decode_max = 0.0
+        self._decode_total = 0.0
+        self._info_waiters: list[asyncio.Future] = []
+        self._info_flight: asyncio.Future | None = None
+        self._info_flight_at = 0.0
+        self._last_info_at = 0.0
+        self._info_frames = 0  # Info frames decoded so far
+        self._info_frames_at_request = 0  # _info_frames when the last GetInfo was sent
+        self._consumption = ConsumptionEstimator()
+        self._chrono: ChronoProgram | None = None
+        self._firmware: str | None = None
+        self._database_name: str | None = None
+        self._info_decoder: InfoDecoder = DEFAULT_DECODER
+        self._parameters = ParameterCache()
+        self._table_waiters: dict[str, list[asyncio.Future]] = {}
+        self._table_task: asyncio.Task | None = None
+        self._chrono_task: asyncio.Task | None = None
+        self._encoders = COMMAND_ENCODERS
+        self._queue = CommandQueue(self._send_request)
+        self._offline = OfflineBuffer()
+        self._flush_task: asyncio.Task | None = None
+        self._reconciler = MaestroReconciler(self)
 
     @property
     def serial(self) -> str:
         """Return the stove serial number."""
         return self._serial
 
+    @property
+    def endpoint(self) -> str:
+        """Return where the transport connects to."""
+        return self._transport.endpoint
+
     @property
     def connected(self) -> bool:
         return self._connected
@@ -60,30 +127,133 @@ class MaestroController:
     def state(self) -> dict[str, Any]:
         return self._state
 
+    @property
+    def changed_fields(self) -> frozenset[str]:
+        """Return the state fields changed by the update being notified.
+
+        Empty when listeners are notified of a connection change only.
+        """
+        return self._changed_fields
+
+    @property
+    def stove_state(self) -> MaestroStoveStateInfo | None:
+        """Return the derived row for the last reported Stove_State."""
+        return self._stove_state
+
+    @property
+    def active_alarm(self) -> MaestroStoveStateInfo | None:
+        """Return the alarm state the stove is in, if any."""
+        return self._active_alarm
+
+    @property
+    def reconciler(self) -> MaestroReconciler:
+        """Return the desired-state reconciler for this stove."""
+        return self._reconciler
+
+    @property
+    def chrono_program(self) -> ChronoProgram | None:
+        """Return the last chronostat program reported by the stove, if any."""
+        return self._chrono
+
+    def restore_chrono_program(self, program: ChronoProgram):
+        """Seed the cached program, e.g. from storage, until the stove sends its own."""
+        if self._chrono is None:
+            self._chrono = program
+
+    @property
+    def firmware_version(self) -> str | None:
+        """Return the firmware version the stove reported on this connection."""
+        return self._firmware
+
+    @property
+    def database_name(self) -> str | None:
+        """Return the database (model) name the stove reported, if any."""
+        return self._database_name
+
+    @property
+    def info_decoder(self) -> InfoDecoder:
+        """Return the Info frame layout selected for this stove."""
+        return self._info_decoder
+
+    @property
+    def parameters(self) -> ParameterCache:
+        """Return the cached Parameters and Database tables."""
+        return self._parameters
+
+    @property
+    def consumption(self) -> ConsumptionEstimator:
+        """Return the pellet consumption and runtime estimator."""
+        return self._consumption
+
+    @property
+    def queue_stats(self) -> dict[str, Any]:
+        """Return outbound queue depth and wait-time metrics."""
+        return self._queue.stats
+
+    @property
+    def listener_count(self) -> int:
+        """Return the number of registered listeners."""
+        return len(self._listeners)
+
+    @property
+    def collected_listeners(self) -> int:
+        """Return how many listeners were garbage collected without being removed."""
+        return self._collected_listeners
+
     def add_listener(self, callback: Callable):
-        self._listeners.append(callback)
+        key = _listener_key(callback)
+        if inspect.ismethod(callback):
+            self._listeners[key] = weakref.WeakMethod(
+                callback, partial(self._on_listener_collected, key),
+            )
+        else:
+            self._listeners[key] = callback
 
     def remove_listener(self, callback: Callable):
-        if callback in self._listeners:
-            self._listeners.remove(callback)
+        self._listeners.pop(_listener_key(callback), None)
+
+    def add_alarm_listener(self, callback: Callable[[MaestroStoveStateInfo, bool], None]):
+        """Register `callback(alarm, active)`, called as soon as an alarm starts or clears.
 
-    def _notify_listeners(self):
-        for callback in list(self._listeners):
+        Called straight from frame decoding, ahead of the ordinary listeners,
+        once per alarm: repeated frames for the same alarm are suppressed.
+        """
+        self._alarm_listeners[_listener_key(callback)] = callback
+
+    def remove_alarm_listener(self, callback: Callable[[MaestroStoveStateInfo, bool], None]):
+        self._alarm_listeners.pop(_listener_key(callback), None)
+
+    def _on_listener_collected(self, key: Hashable, ref: weakref.WeakMethod):
+        if self._listeners.get(key) is ref:
+            del self._listeners[key]
+            self._collected_listeners += 1
+            _LOGGER.debug("Listener %s was garbage collected without being removed", key[1])
+
+    def _notify_listeners(self, changed_fields: frozenset[str] = frozenset()):
+        self._changed_fields = changed_fields
+        for entry in list(self._listeners.values()):
+            callback = entry() if isinstance(entry, weakref.WeakMethod) else entry
+            if callback is None:
+                continue
             try:
                 callback()
             except Exception as e:
                 _LOGGER.error("Error in listener: %s", e)
 
     async def connect_once(self):
-        """Attempt a single connection to MCZ Cloud. Raises on failure."""
-        _LOGGER.info("Connecting to MCZ Cloud at %s for Serial %s", self.URL, self._serial)
-        await self._sio.connect(self.URL)
+        """Attempt a single connection through the transport. Raises on failure."""
+        _LOGGER.info(
+            "Connecting to %s at %s for Serial %s",
+            self._transport.name, self.endpoint, self._serial,
+        )
+        await self._transport.open()
 
     async def connect(self):
-        """Connect to MCZ Cloud with automatic reconnection.
+        """Connect through the transport with automatic reconnection.
 
-        Socket.IO's built-in ping/pong (25s interval + 20s timeout) detects
-        dead connections, so we don't need an artificial timeout on wait().
+        Liveness is the transport's job (Socket.IO's built-in ping/pong with a
+        25s interval + 20s timeout, WebSocket heartbeats locally), so we don't
+        need an artificial timeout on wait().
         """
         if self._running:
             _LOGGER.warning("Connection loop already running, skipping duplicate")
@@ -91,41 +261,65 @@ class MaestroController:
         self._running = True
         while self._running:
             try:
-                if not self._sio.connected:
+                if not self._transport.connected:
                     _LOGGER.info(
-                        "Connecting to MCZ Cloud at %s for serial %s",
-                        self.URL, self._serial,
+                        "Connecting to %s at %s for serial %s",
+                        self._transport.name, self.endpoint, self._serial,
                     )
-                    await self._sio.connect(self.URL)
+                    await self._transport.open()
                 # Block until the server disconnects us or the transport dies.
-                # No artificial timeout — engineio ping/pong handles liveness.
-                await self._sio.wait()
+                # No artificial timeout — the transport handles liveness.
+                await self._transport.wait()
             except asyncio.CancelledError:
                 self._running = False
                 raise
             except Exception as e:
-                _LOGGER.warning("Cloud connection lost: %s", e)
+                _LOGGER.warning("%s connection lost: %s", self._transport.name, e)
+                self._mark_link_lost()
                 self._connected = False
                 self._stop_polling()
                 self._notify_listeners()
                 try:
-                    await self._sio.disconnect()
+                    await self._transport.close()
                 except Exception:
                     pass
                 if self._running:
-                    _LOGGER.info(
-                        "Reconnecting in %ds", self._retry_delay,
-                    )
-                    await asyncio.sleep(self._retry_delay)
-                    self._retry_delay = min(
-                        self._retry_delay * 2, RECONNECT_MAX_DELAY,
-                    )
+                    delay = self._next_retry_delay()
+                    _LOGGER.info("Reconnecting in %.1fs", delay)
+                    await asyncio.sleep(delay)
+
+    def _next_retry_delay(self) -> float:
+        """Return how long to wait before the next connection attempt.
+
+        The first retry after a working link drops comes within a second, so
+        a brief blip recovers at once. Failures after that back off
+        exponentially from RECONNECT_BASE_DELAY, with jitter.
+        """
+        if self._fast_retry:
+            self._fast_retry = False
+            return random.uniform(0, RECONNECT_FAST_DELAY)
+        delay = self._retry_delay * random.uniform(1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER)
+        self._retry_delay = min(self._retry_delay * 2, RECONNECT_MAX_DELAY)
+        return delay
+
+    def _mark_link_lost(self):
+        """Start timing the outage, once per working link."""
+        if self._connected and self._link_lost_at is None:
+            self._link_lost_at = time.monotonic()
 
     async def disconnect(self):
         self._running = False
         self._stop_polling()
-        if self._sio.connected:
-            await self._sio.disconnect()
+        self._reconciler.stop()
+        if self._table_task is not None:
+            self._table_task.cancel()
+        if self._chrono_task is not None:
+            self._chrono_task.cancel()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        self._offline.clear(self._dropped_command_error)
+        self._queue.clear(self._dropped_command_error)
+        await self._transport.close()
 
     def _stop_polling(self):
         """Cancel the periodic poll task if running."""
@@ -140,7 +334,10 @@ class MaestroController:
                 await asyncio.sleep(POLL_INTERVAL)
                 if not self._connected:
                     break
+                if self._info_is_fresh(INFO_MAX_AGE):
+                    continue
                 try:
+                    self._last_poll_at = time.monotonic()
                     await self._request_info()
                     _LOGGER.debug("Periodic GetInfo poll sent")
                 except Exception as e:
@@ -156,35 +353,39 @@ class MaestroController:
             pass
 
     async def _on_connect(self):
-        _LOGGER.info("Connected to MCZ Cloud for serial %s", self._serial)
+        _LOGGER.info("Connected to %s for serial %s", self._transport.name, self._serial)
         self._connected = True
         self._retry_delay = RECONNECT_BASE_DELAY
+        self._fast_retry = True
+        self._connected_at = time.monotonic()
+        self._awaiting_first_frame = True
+        if self._link_lost_at is not None:
+            self._reconnects += 1
         self._notify_listeners()
 
         try:
             _LOGGER.debug("Emitting join for serial %s", self._serial)
-            await self._sio.emit(
-                "join",
-                {
-                    "serialNumber": self._serial,
-                    "macAddress": self._mac,
-                    "type": "Android-App",
-                },
-            )
-            _LOGGER.info("Joined MCZ Cloud room, requesting initial state")
+            await self._transport.join()
+            _LOGGER.info("Joined %s, requesting initial state", self._transport.name)
+            if self._offline:
+                # Through the queue, so the held commands go out in priority order
+                self._flush_task = asyncio.create_task(
+                    self._offline.flush(self._queue.submit, self._dropped_command_error)
+                )
             # Emit GetInfo directly — do NOT go through send_command() here.
             # send_command checks self._connected, which can race with
             # _on_disconnect if the server bounces us during the join await.
-            await self._sio.emit(
-                "chiedo",
-                {
-                    "serialNumber": self._serial,
-                    "macAddress": self._mac,
-                    "tipoChiamata": 1,
-                    "richiesta": "C|RecuperoInfo",
-                },
-            )
+            # request_info() callers in the meantime share this request.
+            self._open_info_flight()
+            await self._send_request(GET_INFO_REQUEST)
             _LOGGER.info("Initial GetInfo request sent")
+            # The answers select the Info layout and decide whether the
+            # parameter tables need fetching. The model never changes.
+            await self._transport.send(SOFTWARE_VERSION_REQUEST)
+            if self._database_name is None:
+                await self._transport.send(DATABASE_NAME_REQUEST)
+            # The program may have been changed on the stove while we were away
+            await self._transport.send(CHRONO_REQUEST)
         except Exception as e:
             _LOGGER.error("Handshake failed after connect: %s", e, exc_info=True)
 
@@ -198,10 +399,15 @@ class MaestroController:
             )
 
     async def _on_disconnect(self):
-        _LOGGER.warning("Disconnected from MCZ Cloud (serial %s)", self._serial)
+        _LOGGER.warning(
+            "Disconnected from %s (serial %s)", self._transport.name, self._serial,
+        )
         was_connected = self._connected
+        self._mark_link_lost()
         self._connected = False
         self._stop_polling()
+        self._queue.clear(self._dropped_command_error)
+        self._consumption.reset_interval()
         if was_connected:
             _LOGGER.info("Connection was active, notifying listeners of disconnect")
         # Keep last known state — entities use self.connected for availability,
@@ -209,124 +415,466 @@ class MaestroController:
         # flash "unavailable" with no data during brief reconnect cycles.
         self._notify_listeners()
 
-    async def _on_rispondo(self, data):
-        """Handle 'rispondo' event."""
+    def _on_message(self, message: str):
+        """Dispatch a raw pipe-delimited frame received from the stove."""
+        self._last_data_at = time.monotonic()
+        if self._awaiting_first_frame:
+            self._record_first_frame()
+        self._recent_frames.append((time.time(), message))
+        parts = message.split("|")
+        msg_type = parts[0] if parts else "empty"
+        _LOGGER.debug(
+            "Received message type=%s len=%d", msg_type, len(message),
+        )
+        if msg_type == MaestroMessageType.Info.value:
+            started = time.perf_counter()
+            self._process_info_frame(parts)
+            elapsed = time.perf_counter() - started
+            self._decode_count += 1
+            self._decode_last = elapsed
+            self._decode_max = max(self._decode_max, elapsed)
+            self._decode_total += elapsed
+        elif msg_type == MaestroMessageType.ChronoDays.value:
+            self._process_chrono_frame(parts)
+        elif msg_type == MaestroMessageType.SoftwareVersion.value:
+            self._process_version_frame(parts)
+        elif msg_type == MaestroMessageType.DatabaseName.value:
+            self._process_database_name_frame(parts)
+        elif msg_type in TABLE_FRAMES:
+            self._process_table_frame(TABLE_FRAMES[msg_type], parts)
+        else:
+            _LOGGER.debug("Non-info message type: %s", msg_type)
+
+    def _record_first_frame(self):
+        """Time the first frame of a connection, and the outage it ends."""
+        self._awaiting_first_frame = False
+        now = self._last_data_at
+        self._last_first_frame = now - self._connected_at
+        if self._link_lost_at is not None:
+            self._last_recovery = now - self._link_lost_at
+            self._link_lost_at = None
+            _LOGGER.info(
+                "Data flowing again %.2fs after the link dropped (%.2fs after reconnecting)",
+                self._last_recovery, self._last_first_frame,
+            )
+
+    def _process_chrono_frame(self, parts: list[str]):
+        """Cache the weekly program from a ChronoDays frame."""
+        program = decode_chrono_frame(parts)
+        if program is None:
+            _LOGGER.warning("Ignoring malformed ChronoDays frame with %d fields", len(parts))
+            return
+        if program != self._chrono:
+            _LOGGER.debug("Chronostat program changed")
+            self._chrono = program
+            self._notify_listeners(frozenset({CHRONO_FIELD}))
+
+    async def _request_chrono(self):
         try:
-            self._last_data_at = time.monotonic()
-            if "stringaRicevuta" in data:
-                message = data["stringaRicevuta"]
-                parts = message.split("|")
-                msg_type = parts[0] if parts else "empty"
-                _LOGGER.debug(
-                    "Received cloud message type=%s len=%d",
-                    msg_type, len(message),
-                )
-                if msg_type == MaestroMessageType.Info.value:
-                    self._process_info_frame(parts)
-                else:
-                    _LOGGER.debug("Non-info message type: %s", msg_type)
-            else:
-                _LOGGER.debug(
-                    "Received rispondo without stringaRicevuta: keys=%s",
-                    list(data.keys()),
-                )
+            await self._queue.submit(CHRONO_REQUEST, CommandPriority.POLL)
         except Exception as e:
-            _LOGGER.error("Error processing cloud message: %s", e, exc_info=True)
+            _LOGGER.warning("Failed to request the chronostat program: %s", e)
+
+    def _process_version_frame(self, parts: list[str]):
+        """Record the firmware version and fetch the parameter tables it invalidates."""
+        firmware = decode_software_version(parts)
+        if firmware is None:
+            _LOGGER.warning("Ignoring empty SoftwareVersion frame")
+            return
+        if firmware != self._firmware:
+            _LOGGER.info("Stove %s runs firmware %s", self._serial, firmware)
+            if self._firmware is not None:
+                # An update may reset the program; the connect already asked for it otherwise
+                self._chrono_task = asyncio.create_task(self._request_chrono())
+            self._firmware = firmware
+            # Tables still in flight belong to the previous firmware
+            if self._table_task is not None:
+                self._table_task.cancel()
+                self._table_task = None
+            self._select_info_decoder()
+        stale = self._parameters.stale_tables(firmware)
+        if stale and (self._table_task is None or self._table_task.done()):
+            self._table_task = asyncio.create_task(self._fetch_stale_tables(stale))
+
+    def _process_database_name_frame(self, parts: list[str]):
+        """Record the stove model and pick the Info layout for it."""
+        name = decode_database_name(parts)
+        if name is None:
+            _LOGGER.warning("Ignoring empty DatabaseName frame")
+            return
+        if name != self._database_name:
+            _LOGGER.info("Stove %s reports database %s", self._serial, name)
+            self._database_name = name
+            self._select_info_decoder()
+
+    def _select_info_decoder(self):
+        decoder = select_decoder(self._database_name, self._firmware)
+        if decoder is not self._info_decoder:
+            _LOGGER.info("Decoding Info frames with the %s layout", decoder.name)
+            # Don't keep reporting fields the new layout doesn't carry
+            kept = {info.name for info in decoder.fields}
+            for info in self._info_decoder.fields:
+                if info.name not in kept:
+                    self._state.pop(info.name, None)
+            self._info_decoder = decoder
+
+    async def _fetch_stale_tables(self, tables: list[str]):
+        try:
+            await self._fetch_tables(tables, CommandPriority.POLL)
+        except HomeAssistantError as e:
+            _LOGGER.warning("Fetching parameter tables failed: %s", e)
+
+    def _process_table_frame(self, table: str, parts: list[str]):
+        """Cache a Parameters or Database table."""
+        if self._firmware is None:
+            _LOGGER.debug("Ignoring %s table received before the firmware version", table)
+            return
+        if self._parameters.store(self._firmware, table, decode_table_frame(parts)):
+            _LOGGER.debug("Cached %s table (%d fields)", table, len(parts) - 1)
+            self._notify_listeners(frozenset({PARAMETERS_FIELD}))
+        for waiter in self._table_waiters.pop(table, []):
+            if not waiter.done():
+                waiter.set_result(None)
 
     def _process_info_frame(self, parts: list[str]):
         """Process the Info frame."""
+        self._last_info_at = self._last_data_at
+        self._info_frames += 1
         updates = {}
-        for i in range(1, len(parts)):
-            if i in MAESTRO_INFO:
-                info_def = MAESTRO_INFO[i]
-                try:
-                    raw_value = int(parts[i], 16)
-                except ValueError:
-                    _LOGGER.warning(
-                        "Invalid hex value '%s' at position %d for %s",
-                        parts[i],
-                        i,
-                        info_def.name,
-                    )
-                    continue
-                processed_value = self._convert_value(info_def.message_type, raw_value)
-                if self._state.get(info_def.name) != processed_value:
-                    self._state[info_def.name] = processed_value
-                    updates[info_def.name] = processed_value
-
-                if info_def.name == "Stove_State":
-                    stove_state = self._get_stove_state(raw_value)
-                    if stove_state:
-                        if self._state.get("Stove_State_Desc") != stove_state.description:
-                            self._state["Stove_State_Desc"] = stove_state.description
-                            updates["Stove_State_Desc"] = stove_state.description
-                        if self._state.get("Power") != stove_state.on_or_off:
-                            self._state["Power"] = stove_state.on_or_off
-                            updates["Power"] = stove_state.on_or_off
+        # Fields are sorted by position, so a short frame ends the pass early
+        length = len(parts)
+        for info_def in self._info_decoder.fields:
+            i = info_def.id
+            if i >= length:
+                break
+            try:
+                raw_value = int(parts[i], 16)
+            except ValueError:
+                _LOGGER.warning(
+                    "Invalid hex value '%s' at position %d for %s",
+                    parts[i],
+                    i,
+                    info_def.name,
+                )
+                continue
+            processed_value = self._convert_value(info_def.message_type, raw_value)
+            if self._state.get(info_def.name) != processed_value:
+                self._state[info_def.name] = processed_value
+                updates[info_def.name] = processed_value
+
+            if info_def.name == "Stove_State":
+                stove_state = get_stove_state_info(raw_value)
+                self._stove_state = stove_state
+                self._update_alarm(stove_state)
+                if stove_state.description is not None:
+                    if self._state.get("Stove_State_Desc") != stove_state.description:
+                        self._state["Stove_State_Desc"] = stove_state.description
+                        updates["Stove_State_Desc"] = stove_state.description
+                    if self._state.get("Power") != stove_state.on_or_off:
+                        self._state["Power"] = stove_state.on_or_off
+                        updates["Power"] = stove_state.on_or_off
+
+        changed = set(updates)
+        stove_state = self._stove_state
+        power_level = None
+        if stove_state is not None and stove_state.id in MAESTRO_POWER_LEVEL_STATE_IDS:
+            power_level = stove_state.id - 10
+        if self._consumption.update(self._last_data_at, power_level, self._state.get("RPM_WormWheel")):
+            changed.add(CONSUMPTION_FIELD)
 
         if updates:
-            _LOGGER.info("State updates (%d fields): %s", len(updates), updates)
-            self._notify_listeners()
+            _LOGGER.debug("State updates (%d fields): %s", len(updates), updates)
+        if changed:
+            self._notify_listeners(frozenset(changed))
+
+        if self._info_waiters:
+            snapshot = dict(self._state)
+            for waiter in self._info_waiters:
+                if not waiter.done():
+                    waiter.set_result(snapshot)
+            self._info_waiters.clear()
+
+    def _update_alarm(self, stove_state: MaestroStoveStateInfo):
+        """Report alarm transitions to the alarm listeners."""
+        active = self._active_alarm
+        alarm = stove_state if stove_state.id in MAESTRO_ALARM_STATE_IDS else None
+        if alarm == active:
+            return
+        self._active_alarm = alarm
+        if active is not None:
+            _LOGGER.info("Alarm cleared: %s", active.description)
+            self._notify_alarm(active, False)
+        if alarm is not None:
+            _LOGGER.warning("Stove alarm: %s", alarm.description)
+            self._notify_alarm(alarm, True)
+
+    def _notify_alarm(self, alarm: MaestroStoveStateInfo, active: bool):
+        for callback in list(self._alarm_listeners.values()):
+            try:
+                callback(alarm, active)
+            except Exception as e:
+                _LOGGER.error("Error in alarm listener: %s", e)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return a snapshot of the controller internals for troubleshooting."""
+        now = time.monotonic()
+        return {
+            "transport": self._transport.name,
+            "endpoint": self.endpoint,
+            "connected": self._connected,
+            "running": self._running,
+            "retry_delay": self._retry_delay,
+            "reconnect": {
+                "count": self._reconnects,
+                "seconds_to_first_frame": self._last_first_frame,
+                "last_outage_seconds": self._last_recovery,
+            },
+            "seconds_since_last_data": now - self._last_data_at if self._last_data_at else None,
+            "poll": {
+                "interval": POLL_INTERVAL,
+                "active": self._poll_task is not None and not self._poll_task.done(),
+                "seconds_since_last_poll": now - self._last_poll_at if self._last_poll_at else None,
+            },
+            "listeners": {
+                "count": self.listener_count,
+                "collected": self._collected_listeners,
+            },
+            "decode": {
+                "frames": self._decode_count,
+                "last_ms": self._decode_last * 1000,
+                "max_ms": self._decode_max * 1000,
+                "mean_ms": self._decode_total / self._decode_count * 1000 if self._decode_count else 0.0,
+            },
+            "queue": {**self._queue.stats, "pending": self._queue.pending},
+            "offline": {**self._offline.stats, "pending": self._offline.pending},
+            "active_alarm": self._active_alarm.description if self._active_alarm else None,
+            "desired_state": self._reconciler.desired,
+            "recent_frames": [
+                {"received_at": received_at, "frame": frame}
+                for received_at, frame in self._recent_frames
+            ],
+            "state": dict(self._state),
+            "consumption": self._consumption.as_dict(),
+            "firmware": self._firmware,
+            "database_name": self._database_name,
+            "info_decoder": self._info_decoder.name,
+            "parameter_tables": {
+                "firmware": self._parameters.firmware,
+                "fields": self._parameters.tables,
+            },
+        }
 
-    async def send_command(self, command_name: str, value: Any):
-        """Send command via 'chiedo' event."""
-        if not self._connected:
+    async def send_command(self, command_name: str, value: Any, ttl: float = OFFLINE_COMMAND_TTL):
+        """Send a single command to the stove.
+
+        While the connection loop is reconnecting, the command is held for up
+        to `ttl` seconds and sent after the next join; a newer value for the
+        same command replaces it. GetInfo is never held.
+        """
+        if not self._connected and not self._running:
             raise HomeAssistantError(
-                f"Cannot send command '{command_name}': not connected to MCZ Cloud"
+                f"Cannot send command '{command_name}': not connected to {self._transport.name}"
             )
 
-        cmd_def = MAESTRO_COMMANDS_BY_NAME.get(command_name)
-        if not cmd_def:
-            raise HomeAssistantError(f"Unknown command: '{command_name}'")
-
-        # Prepare payload
-        payload = {
-            "serialNumber": self._serial,
-            "macAddress": self._mac,
-            "tipoChiamata": 1,
-            "richiesta": "",
-        }
+        richiesta = self.encode_command(command_name, value)
+        priority = self._command_priority(command_name, richiesta)
+        if self._connected:
+            await self._queue.submit(richiesta, priority)
+            return
+        if priority == CommandPriority.POLL:
+            raise HomeAssistantError(
+                f"Cannot send command '{command_name}': not connected to {self._transport.name}"
+            )
+        _LOGGER.info("Not connected, holding %s for up to %ss", command_name, ttl)
+        try:
+            await self._offline.hold(command_name, richiesta, priority, ttl)
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"Command '{command_name}' expired after {ttl}s waiting for {self._transport.name}"
+            ) from err
+
+    async def set_parameters(
+        self, values: Mapping[str, Any], timeout: float = CONFIRM_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Write several commands at once and wait for one confirming Info frame.
+
+        Every value is validated before anything is sent, so a bad entry
+        rejects the whole batch. The writes are emitted back to back, followed
+        by a single GetInfo; the returned snapshot is the state decoded from
+        the first Info frame received after them.
+        """
+        if not values:
+            raise HomeAssistantError("No parameters to set")
+        if not self._connected:
+            raise HomeAssistantError(
+                f"Cannot set parameters: not connected to {self._transport.name}"
+            )
 
-        if cmd_def.category == "GetInfo":
-            payload["tipoChiamata"] = 1
-            payload["richiesta"] = "C|RecuperoInfo"
-        elif cmd_def.category == "SetDateTime":
-            payload["tipoChiamata"] = 1
-            payload["richiesta"] = f"C|SalvaDataOra|{value}"
-        else:
-            if cmd_def.category == "Diagnostics":
-                cmd_header = "C|Diagnostica|"
-            else:
-                cmd_header = "C|WriteParametri|"
-
-            processed_value = value
-            if isinstance(value, str):
-                if value.upper() == "ON":
-                    processed_value = 1
-                elif value.upper() == "OFF":
-                    processed_value = 0
-                else:
-                    try:
-                        processed_value = float(value)
-                    except ValueError:
-                        raise HomeAssistantError(
-                            f"Invalid value '{value}' for command '{command_name}'"
-                        )
+        requests = [
+            (name, self.encode_command(name, value)) for name, value in values.items()
+        ]
+        requests.append(("GetInfo", self.encode_command("GetInfo", 0)))
 
-            if cmd_def.command_type == "temperature":
-                processed_value = round(float(processed_value) * 2)
-            elif cmd_def.command_type == "onoff40":
-                processed_value = 1 if int(processed_value) else 40
-            elif cmd_def.command_type in ("onoff", "percentage", "int"):
-                processed_value = int(processed_value)
+        _LOGGER.debug("Pipelining %d parameter writes", len(values))
+        await asyncio.gather(
+            *(
+                self._queue.submit(richiesta, self._command_priority(name, richiesta))
+                for name, richiesta in requests
+            )
+        )
+        # Only a frame decoded after the trailing GetInfo went out reflects the writes
+        if self._info_frames > self._info_frames_at_request:
+            return dict(self._state)
+        waiter = asyncio.get_running_loop().create_future()
+        self._info_waiters.append(waiter)
+        try:
+            async with asyncio.timeout(timeout):
+                return await waiter
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"Stove did not confirm {len(values)} parameter writes within {timeout}s"
+            ) from err
+        finally:
+            if waiter in self._info_waiters:
+                self._info_waiters.remove(waiter)
+
+    async def refresh_parameters(self, timeout: float = CONFIRM_TIMEOUT):
+        """Fetch the Parameters and Database tables again, whatever the cache holds."""
+        if not self._connected:
+            raise HomeAssistantError(
+                f"Cannot refresh parameters: not connected to {self._transport.name}"
+            )
+        if self._firmware is None:
+            raise HomeAssistantError("The stove has not reported its firmware version yet")
+        await self._fetch_tables(list(TABLE_REQUESTS), CommandPriority.USER, timeout)
+
+    async def _fetch_tables(
+        self, tables: list[str], priority: CommandPriority, timeout: float = CONFIRM_TIMEOUT,
+    ):
+        """Request parameter tables and wait until each has been received."""
+        loop = asyncio.get_running_loop()
+        waiters = {table: loop.create_future() for table in tables}
+        for table, waiter in waiters.items():
+            self._table_waiters.setdefault(table, []).append(waiter)
+        try:
+            _LOGGER.debug("Requesting parameter tables: %s", ", ".join(tables))
+            await asyncio.gather(
+                *(self._queue.submit(TABLE_REQUESTS[table], priority) for table in tables)
+            )
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(*waiters.values())
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"Stove did not send its {', '.join(tables)} table within {timeout}s"
+            ) from err
+        finally:
+            for table, waiter in waiters.items():
+                pending = self._table_waiters.get(table, [])
+                if waiter in pending:
+                    pending.remove(waiter)
+                if not pending:
+                    self._table_waiters.pop(table, None)
+
+    @staticmethod
+    def _command_priority(command_name: str, richiesta: str) -> CommandPriority:
+        """Classify a request for the outbound queue."""
+        if command_name == "GetInfo":
+            return CommandPriority.POLL
+        if command_name == "Reset_Alarm" or (command_name == "Power" and richiesta.endswith("|40")):
+            return CommandPriority.SAFETY
+        return CommandPriority.USER
+
+    async def _send_request(self, request: str):
+        """Send a request, noting which Info frames may answer it if it's a GetInfo."""
+        if request == GET_INFO_REQUEST:
+            # Noted before sending: the answer may be decoded before send() returns
+            self._info_frames_at_request = self._info_frames
+        await self._transport.send(request)
+
+    def _dropped_command_error(self) -> HomeAssistantError:
+        return HomeAssistantError(
+            f"Disconnected from {self._transport.name} before the command was sent"
+        )
 
-            payload["richiesta"] = f"{cmd_header}{cmd_def.id}|{int(processed_value)}"
+    def encode_command(self, command_name: str, value: Any) -> str:
+        """Validate a command value and build its 'C|...' request string."""
+        encoder = self._encoders.get(command_name)
+        if encoder is None:
+            raise HomeAssistantError(f"Unknown command: '{command_name}'")
+        return encoder(value)
 
-        _LOGGER.debug("Sending cloud command: %s", payload)
-        await self._sio.emit("chiedo", payload)
+    async def request_info(
+        self, timeout: float = CONFIRM_TIMEOUT, max_age: float = INFO_MAX_AGE,
+    ) -> dict[str, Any]:
+        """Return a state snapshot decoded from an Info frame.
 
-    async def _request_info(self):
-        await self.send_command("GetInfo", 0)
+        A frame received within the last `max_age` seconds is served without
+        asking the stove. Otherwise concurrent callers share one in-flight
+        GetInfo and all get the snapshot of the frame answering it.
+        """
+        if self._info_is_fresh(max_age):
+            return dict(self._state)
+        flight = await self._request_info()
+        try:
+            async with asyncio.timeout(timeout):
+                # Shielded: one caller timing out must not cancel the others
+                return await asyncio.shield(flight)
+        except TimeoutError as err:
+            raise HomeAssistantError(f"Stove did not answer GetInfo within {timeout}s") from err
+
+    async def refresh(self):
+        """Refresh the state on demand, e.g. for homeassistant.update_entity.
+
+        Served from memory when an Info frame arrived in the last
+        REFRESH_MIN_INTERVAL seconds; otherwise every entity refreshing at
+        once shares a single GetInfo. Failures are logged, not raised: the
+        entities keep their last state and availability says the rest.
+        """
+        if not self._connected:
+            _LOGGER.debug("Skipping refresh: not connected to %s", self._transport.name)
+            return
+        try:
+            await self.request_info(max_age=REFRESH_MIN_INTERVAL)
+        except HomeAssistantError as e:
+            _LOGGER.warning("Refresh failed: %s", e)
+
+    def _info_is_fresh(self, max_age: float) -> bool:
+        return max_age > 0 and self._last_info_at > 0 and time.monotonic() - self._last_info_at <= max_age
+
+    def _open_info_flight(self) -> asyncio.Future:
+        """Register the future resolved by the answer to a GetInfo about to be sent."""
+        flight = asyncio.get_running_loop().create_future()
+        self._info_flight = flight
+        self._info_flight_at = time.monotonic()
+        self._info_waiters.append(flight)
+        return flight
+
+    async def _request_info(self) -> asyncio.Future:
+        """Make sure a GetInfo is in flight; return the future its answer resolves.
+
+        A request still unanswered after CONFIRM_TIMEOUT is not joined any
+        more: a new one is sent. Its future stays registered and resolves
+        with the next Info frame like any other.
+        """
+        flight = self._info_flight
+        if (
+            flight is not None
+            and not flight.done()
+            and time.monotonic() - self._info_flight_at < CONFIRM_TIMEOUT
+        ):
+            return flight
+        flight = self._open_info_flight()
+        try:
+            await self.send_command("GetInfo", 0)
+        except Exception as err:
+            if flight in self._info_waiters:
+                self._info_waiters.remove(flight)
+            if not flight.done():
+                # Fail the callers that joined while the request was being sent
+                flight.set_exception(err)
+                flight.exception()
+            raise
+        return flight
 
     def _convert_value(self, value_type: str, value: int):
         if value_type == "temperature":
@@ -339,3 +887,10 @@ class MaestroController:
 
     def _get_stove_state(self, state_id: int) -> MaestroStoveState | None:
         return MAESTRO_STOVE_STATES_BY_ID.get(state_id)
+
+
+def _listener_key(callback: Callable) -> Hashable:
+    """Key a listener so each access of the same bound method maps to one entry."""
+    if inspect.ismethod(callback):
+        return (id(callback.__self__), callback.__func__)
+    return callback
@@ -0,0 +1,96 @@
+"""Command encoders for Maestro MCZ.
+
+Every MaestroCommand is compiled once into a closure that validates a value
+and returns the 'C|...' request string. Everything that depends only on the
+command (request prefix, conversion, bounds) is worked out at compile time,
+so encoding a value is a parse, a conversion, a step and range check and a
+string concatenation. Values are never rounded: a value off the command's
+step (0.5 °C for temperatures, 1 otherwise) is rejected like one out of range.
+"""
+import math
+from typing import Any, Callable
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .types import MAESTRO_COMMAND_RANGES, MAESTRO_COMMANDS, MaestroCommand
+
+CommandEncoder = Callable[[Any], str]
+
+# Bounds implied by the command type, in user units
+_TYPE_RANGES: dict[str, tuple[float, float]] = {
+    "onoff": (0, 1),
+    "percentage": (0, 100),
+}
+
+
+def _to_number(command_name: str, value: Any) -> float:
+    """Parse a command value: a number, or "ON"/"OFF"/a numeric string."""
+    if isinstance(value, str):
+        upper = value.upper()
+        if upper == "ON":
+            return 1
+        if upper == "OFF":
+            return 0
+        try:
+            number = float(value)
+        except ValueError:
+            raise HomeAssistantError(
+                f"Invalid value '{value}' for command '{command_name}'"
+            ) from None
+    elif isinstance(value, (int, float)):
+        number = value
+    else:
+        raise HomeAssistantError(f"Invalid value '{value}' for command '{command_name}'")
+    if not math.isfinite(number):
+        raise HomeAssistantError(f"Invalid value '{value}' for command '{command_name}'")
+    return number
+
+
+def compile_encoder(command: MaestroCommand) -> CommandEncoder:
+    """Build the encoder for one command."""
+    name = command.name
+    if command.category == "GetInfo":
+        return lambda value: "C|RecuperoInfo"
+    if command.category == "SetDateTime":
+        return lambda value: f"C|SalvaDataOra|{value}"
+
+    header = "C|Diagnostica|" if command.category == "Diagnostics" else "C|WriteParametri|"
+    prefix = f"{header}{command.id}|"
+
+    # Raw units per user unit: temperatures go in half degrees
+    scale = 2 if command.command_type == "temperature" else 1
+    step = 1 / scale
+
+    def to_raw(value: Any) -> int:
+        number = value if type(value) is int else _to_number(name, value)
+        raw = number * scale
+        if raw != int(raw):
+            raise HomeAssistantError(
+                f"Value '{value}' for command '{name}' is not a multiple of {step:g}"
+            )
+        return int(raw)
+
+    if command.command_type == "onoff40":
+        return lambda value: prefix + ("1" if to_raw(value) else "40")
+
+    bounds = MAESTRO_COMMAND_RANGES.get(name) or _TYPE_RANGES.get(command.command_type)
+    if bounds is None:
+        return lambda value: prefix + str(to_raw(value))
+
+    low, high = bounds
+    raw_low, raw_high = round(low * scale), round(high * scale)
+
+    def encode_checked(value: Any) -> str:
+        raw = to_raw(value)
+        if not raw_low <= raw <= raw_high:
+            raise HomeAssistantError(
+                f"Value '{value}' for command '{name}' is outside {low:g}-{high:g}"
+            )
+        return prefix + str(raw)
+    return encode_checked
+
+
+# Commands don't depend on the stove, so one set of encoders serves every controller
+COMMAND_ENCODERS: dict[str, CommandEncoder] = {
+    command.name: compile_encoder(command) for command in MAESTRO_COMMANDS
+}
@@ -0,0 +1,96 @@
+"""Info frame layouts per stove model and firmware.
+
+MAESTRO_INFO is the layout of a hydro stove, the widest one known. Other
+models and firmware versions carry a subset of it, or the same fields at
+other positions. Each layout is compiled once into an InfoDecoder; the
+controller picks one from DECODER_REGISTRY once the stove has reported its
+DatabaseName (0D) and SoftwareVersion (0E), and keeps MAESTRO_INFO
+otherwise.
+
+MCZ does not document the DatabaseName request or the model names it
+returns; DATABASE_NAME_REQUEST and the model patterns in DECODER_REGISTRY
+are assumptions.
+"""
+from dataclasses import dataclass
+from typing import Mapping
+
+from .types import MAESTRO_INFO, MaestroInformation
+
+DATABASE_NAME_REQUEST = "C|RecuperoNomeDatabase"
+
+# Fields only hydro stoves (Puffer / Boiler circuit) report
+HYDRO_ONLY_FIELDS = frozenset({
+    "Puffer_Temperature",
+    "Boiler_Temperature",
+    "SetPuffer",
+    "SetBoiler",
+    "SetHealth",
+    "Return_Temperature",
+})
+
+
+@dataclass(frozen=True)
+class InfoDecoder:
+    """An Info frame layout compiled for a single pass over the frame."""
+    name: str
+    fields: tuple[MaestroInformation, ...]  # sorted by id, the position in the frame
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+
+def compile_decoder(
+    name: str, info: Mapping[int, MaestroInformation], exclude: frozenset[str] = frozenset(),
+) -> InfoDecoder:
+    """Compile a position -> field map, leaving out the fields named in `exclude`."""
+    return InfoDecoder(
+        name,
+        tuple(info[position] for position in sorted(info) if info[position].name not in exclude),
+    )
+
+
+DEFAULT_DECODER = compile_decoder("default", MAESTRO_INFO)
+AIR_DECODER = compile_decoder("air", MAESTRO_INFO, exclude=HYDRO_ONLY_FIELDS)
+
+
+@dataclass(frozen=True)
+class DecoderRule:
+    """Use `decoder` for stoves matching every criterion given.
+
+    `model` is looked for in the DatabaseName, ignoring case; `firmware` is
+    a prefix of the SoftwareVersion.
+    """
+    decoder: InfoDecoder
+    model: str | None = None
+    firmware: str | None = None
+
+    def matches(self, database_name: str | None, firmware: str | None) -> bool:
+        if self.model is not None and (
+            database_name is None or self.model.casefold() not in database_name.casefold()
+        ):
+            return False
+        if self.firmware is not None and (firmware is None or not firmware.startswith(self.firmware)):
+            return False
+        return True
+
+
+# First match wins; more specific rules go first
+DECODER_REGISTRY: list[DecoderRule] = [
+    DecoderRule(DEFAULT_DECODER, model="hydro"),
+    DecoderRule(DEFAULT_DECODER, model="idro"),
+    DecoderRule(AIR_DECODER, model="air"),
+]
+
+
+def select_decoder(database_name: str | None, firmware: str | None) -> InfoDecoder:
+    """Return the decoder for a stove, DEFAULT_DECODER if no rule matches."""
+    for rule in DECODER_REGISTRY:
+        if rule.matches(database_name, firmware):
+            return rule.decoder
+    return DEFAULT_DECODER
+
+
+def decode_database_name(parts: list[str]) -> str | None:
+    """Return the database (model) name carried by a split DatabaseName frame."""
+    name = "|".join(parts[1:]).strip()
+    return name or None
@@ -0,0 +1,110 @@
+"""Maestro MCZ transport talking to the stove over the local network."""
+import asyncio
+import logging
+
+import aiohttp
+
+from .controller import MaestroController
+from .transport import MaestroTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_HOST = "192.168.120.1"
+DEFAULT_LOCAL_PORT = 81
+LOCAL_HEARTBEAT = 30  # seconds between WebSocket pings
+
+
+class LocalTransport(MaestroTransport):
+    """Transport over a direct WebSocket connection to the stove.
+
+    The stove's own WebSocket speaks the same pipe-delimited frames the cloud
+    relays inside 'chiedo'/'rispondo' events, just without the envelope: we
+    send 'C|RecuperoInfo' as a text message and receive '01|...' back.
+    """
+
+    name = "stove"
+
+    def __init__(
+        self,
+        host: str = DEFAULT_LOCAL_HOST,
+        port: int = DEFAULT_LOCAL_PORT,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        super().__init__()
+        self._host = host
+        self._port = port
+        self._session = session
+        self._owns_session = session is None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"ws://{self._host}:{self._port}"
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def open(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        try:
+            self._ws = await self._session.ws_connect(self.endpoint, heartbeat=LOCAL_HEARTBEAT)
+        except BaseException:
+            if self._owns_session:
+                await self._session.close()
+                self._session = None
+            raise
+        self._reader_task = asyncio.create_task(self._read_loop(self._ws))
+        await self._on_connect()
+
+    async def wait(self):
+        if self._reader_task is not None:
+            await asyncio.shield(self._reader_task)
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader_task is not None:
+            await self._reader_task
+            self._reader_task = None
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def send(self, request: str):
+        if not self.connected:
+            raise ConnectionError(f"Local WebSocket to {self.endpoint} is not open")
+        _LOGGER.debug("Sending local command: %s", request)
+        await self._ws.send_str(request)
+
+    async def _read_loop(self, ws: aiohttp.ClientWebSocketResponse):
+        """Feed text frames from the stove to the controller."""
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        _LOGGER.warning("Local WebSocket error: %s", ws.exception())
+                    continue
+                try:
+                    self._on_message(msg.data)
+                except Exception as e:
+                    _LOGGER.error("Error processing local message: %s", e, exc_info=True)
+        finally:
+            await self._on_disconnect()
+
+
+class MaestroLocalController(MaestroController):
+    """Maestro Controller connected straight to the stove's local WebSocket."""
+
+    def __init__(
+        self,
+        serial: str,
+        mac: str,
+        host: str = DEFAULT_LOCAL_HOST,
+        port: int = DEFAULT_LOCAL_PORT,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        super().__init__(serial, mac, LocalTransport(host, port, session))
@@ -0,0 +1,281 @@
+"""Outbound request queue for Maestro MCZ."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_RATE = 2.0  # sustained requests per second
+COMMAND_BURST = 5  # requests that may go out back to back
+OFFLINE_COMMAND_TTL = 60  # seconds a command issued while disconnected waits for the link
+
+
+class CommandPriority(IntEnum):
+    """Outbound priority classes, most urgent first."""
+    SAFETY = 0  # Power off, Reset_Alarm
+    USER = 1  # Ordinary writes
+    POLL = 2  # GetInfo; deduplicated while queued
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    priority: int
+    seq: int
+    request: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class CommandQueue:
+    """Priority queue in front of a transport, drained under a token bucket.
+
+    Requests are sent one at a time in (priority, arrival) order. A queued
+    POLL request absorbs identical POLL requests submitted after it, so every
+    caller waiting for a GetInfo shares one emit. The worker only runs while
+    there is something to send.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        rate: float = COMMAND_RATE,
+        burst: int = COMMAND_BURST,
+    ):
+        self._send = send
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._heap: list[_QueuedRequest] = []
+        self._seq = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._inflight: _QueuedRequest | None = None
+        # Metrics
+        self._max_depth = 0
+        self._sent = 0
+        self._deduplicated = 0
+        self._last_wait = 0.0
+        self._max_wait = 0.0
+        self._total_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return len(self._heap)
+
+    @property
+    def pending(self) -> list[str]:
+        """Return the requests not sent yet, in the order they will go out."""
+        requests = [queued.request for queued in sorted(self._heap)]
+        if self._inflight is not None:
+            requests.insert(0, self._inflight.request)
+        return requests
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and wait-time metrics."""
+        return {
+            "depth": len(self._heap),
+            "max_depth": self._max_depth,
+            "sent": self._sent,
+            "deduplicated": self._deduplicated,
+            "last_wait": self._last_wait,
+            "max_wait": self._max_wait,
+            "mean_wait": self._total_wait / self._sent if self._sent else 0.0,
+        }
+
+    async def submit(self, request: str, priority: CommandPriority = CommandPriority.USER):
+        """Queue a request and wait until it has been sent."""
+        if priority == CommandPriority.POLL:
+            for queued in self._heap:
+                if queued.priority == priority and queued.request == request:
+                    self._deduplicated += 1
+                    await asyncio.shield(queued.future)
+                    return
+
+        queued = _QueuedRequest(
+            priority,
+            next(self._seq),
+            request,
+            time.monotonic(),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._heap, queued)
+        self._max_depth = max(self._max_depth, len(self._heap))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        await asyncio.shield(queued.future)
+
+    def clear(self, make_exc: Callable[[], BaseException]):
+        """Fail every queued request with an exception from `make_exc` and stop the worker."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+        pending = [heapq.heappop(self._heap) for _ in range(len(self._heap))]
+        if self._inflight is not None:
+            pending.append(self._inflight)
+            self._inflight = None
+        for queued in pending:
+            if not queued.future.done():
+                queued.future.set_exception(make_exc())
+                # The submitter may have given up already; don't warn about it
+                queued.future.exception()
+
+    async def _drain(self):
+        while self._heap:
+            await self._acquire_token()
+            if not self._heap:
+                break
+            queued = heapq.heappop(self._heap)
+            wait = time.monotonic() - queued.enqueued_at
+            self._last_wait = wait
+            self._max_wait = max(self._max_wait, wait)
+            self._total_wait += wait
+            self._sent += 1
+            self._inflight = queued
+            try:
+                await self._send(queued.request)
+            except Exception as e:
+                if not queued.future.done():
+                    queued.future.set_exception(e)
+                    queued.future.exception()
+            else:
+                if not queued.future.done():
+                    queued.future.set_result(None)
+            finally:
+                self._inflight = None
+
+    async def _acquire_token(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+        if self._tokens < 1:
+            delay = (1 - self._tokens) / self._rate
+            _LOGGER.debug("Rate limit reached, delaying next request %.2fs", delay)
+            await asyncio.sleep(delay)
+            self._tokens = 1.0
+            self._refilled_at = time.monotonic()
+        self._tokens -= 1
+
+
+@dataclass(order=True)
+class _HeldRequest:
+    priority: int
+    seq: int
+    request: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    flushing: bool = field(default=False, compare=False)
+
+
+class OfflineBuffer:
+    """Commands issued while the link is down, held until it comes back.
+
+    One request is held per command: a newer value replaces the held one and
+    releases its caller, since that write would be overwritten anyway. A
+    caller gives up, and its request is dropped, once its TTL passes before
+    the flush starts. flush() sends what is left in (priority, arrival) order.
+    """
+
+    def __init__(self):
+        self._held: dict[str, _HeldRequest] = {}
+        self._flushing: list[_HeldRequest] = []
+        self._seq = itertools.count()
+        # Metrics
+        self._expired = 0
+        self._superseded = 0
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    @property
+    def pending(self) -> list[str]:
+        """Return the held requests, in the order they will be flushed."""
+        return [held.request for held in sorted(self._held.values())]
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return held, expired and superseded counts."""
+        return {"held": len(self._held), "expired": self._expired, "superseded": self._superseded}
+
+    async def hold(
+        self, key: str, request: str, priority: CommandPriority, ttl: float = OFFLINE_COMMAND_TTL,
+    ):
+        """Hold `request` under `key` and wait until it has been flushed.
+
+        Returns early if a newer request for the same key replaces it. Raises
+        TimeoutError if no flush starts within `ttl` seconds.
+        """
+        previous = self._held.get(key)
+        if previous is not None and not previous.future.done():
+            previous.future.set_result(None)
+            self._superseded += 1
+        held = _HeldRequest(priority, next(self._seq), request, asyncio.get_running_loop().create_future())
+        self._held[key] = held
+        try:
+            async with asyncio.timeout(ttl):
+                await asyncio.shield(held.future)
+        except TimeoutError:
+            if held.flushing:
+                # Too late to take it back; report how the send went
+                await asyncio.shield(held.future)
+                return
+            if self._held.get(key) is held:
+                del self._held[key]
+                self._expired += 1
+            raise
+
+    async def flush(
+        self,
+        submit: Callable[[str, CommandPriority], Awaitable[None]],
+        make_exc: Callable[[], BaseException],
+    ):
+        """Send every held request through `submit` and release the callers.
+
+        If the flush is cancelled, the callers still waiting get an exception
+        from `make_exc`.
+        """
+        if not self._held:
+            return
+        held = sorted(self._held.values())
+        self._held.clear()
+        for entry in held:
+            entry.flushing = True
+        self._flushing = held
+        _LOGGER.debug("Flushing %d commands held while disconnected", len(held))
+        try:
+            results = await asyncio.gather(
+                *(submit(entry.request, CommandPriority(entry.priority)) for entry in held),
+                return_exceptions=True,
+            )
+        except asyncio.CancelledError:
+            _fail(held, make_exc)
+            raise
+        finally:
+            self._flushing = []
+        for entry, result in zip(held, results):
+            if entry.future.done():
+                continue
+            if isinstance(result, BaseException):
+                entry.future.set_exception(result)
+                entry.future.exception()
+            else:
+                entry.future.set_result(None)
+
+    def clear(self, make_exc: Callable[[], BaseException]):
+        """Fail every held or flushing request with an exception from `make_exc`."""
+        held = [*self._held.values(), *self._flushing]
+        self._held.clear()
+        self._flushing = []
+        _fail(held, make_exc)
+
+
+def _fail(entries: list[_HeldRequest], make_exc: Callable[[], BaseException]):
+    for entry in entries:
+        if not entry.future.done():
+            entry.future.set_exception(make_exc())
+            entry.future.exception()
@@ -0,0 +1,102 @@
+"""Parameter-table cache for Maestro MCZ.
+
+The Parameters (00) and Database (02) frames carry the stove's configuration
+tables: long, and only expected to change with the firmware. They are
+fetched once, kept per stove together with the firmware version reported in
+the SoftwareVersion (0E) frame, and fetched again only when that version
+changes or on explicit request.
+
+MCZ does not document the requests answered with these frames; the strings
+below are the ones this integration assumes.
+"""
+from typing import Any
+
+from .types import MaestroMessageType
+
+SOFTWARE_VERSION_REQUEST = "C|RecuperoVersione"
+# Table name -> request answered with that table
+TABLE_REQUESTS = {
+    "parameters": "C|RecuperoParametri",
+    "database": "C|RecuperoDatabase",
+}
+# Frame type -> table name
+TABLE_FRAMES = {
+    MaestroMessageType.Parameters.value: "parameters",
+    MaestroMessageType.Database.value: "database",
+}
+
+
+def decode_table_frame(parts: list[str]) -> tuple[int | None, ...]:
+    """Decode the hex fields of a split table frame, None where a field isn't hex."""
+    values = []
+    for field in parts[1:]:
+        try:
+            values.append(int(field, 16))
+        except ValueError:
+            values.append(None)
+    return tuple(values)
+
+
+def decode_software_version(parts: list[str]) -> str | None:
+    """Return the firmware version carried by a split SoftwareVersion frame."""
+    version = "|".join(parts[1:]).strip()
+    return version or None
+
+
+class ParameterCache:
+    """Parameter tables for one firmware version.
+
+    Positions follow the frame: position 1 is the first field after the
+    message type, as in MAESTRO_INFO.
+    """
+
+    def __init__(self):
+        self.firmware: str | None = None
+        self._tables: dict[str, tuple[int | None, ...]] = {}
+
+    @property
+    def tables(self) -> dict[str, int]:
+        """Return the number of fields cached per table."""
+        return {name: len(values) for name, values in self._tables.items()}
+
+    def get(self, table: str, position: int) -> int | None:
+        """Return a raw parameter value, or None if it isn't cached."""
+        values = self._tables.get(table)
+        if values is None or not 1 <= position <= len(values):
+            return None
+        return values[position - 1]
+
+    def stale_tables(self, firmware: str) -> list[str]:
+        """Return the tables to fetch for a stove running `firmware`."""
+        if firmware != self.firmware:
+            return list(TABLE_REQUESTS)
+        return [name for name in TABLE_REQUESTS if name not in self._tables]
+
+    def store(self, firmware: str, table: str, values: tuple[int | None, ...]) -> bool:
+        """Cache a table read from a stove running `firmware`. Returns True if it changed.
+
+        Tables cached for another firmware version are dropped.
+        """
+        if firmware != self.firmware:
+            self.firmware = firmware
+            self._tables = {}
+        if self._tables.get(table) == values:
+            return False
+        self._tables[table] = values
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache in a JSON-serialisable form for storage."""
+        return {
+            "firmware": self.firmware,
+            "tables": {name: list(values) for name, values in self._tables.items()},
+        }
+
+    def restore(self, data: dict[str, Any]):
+        """Load a cache previously returned by as_dict()."""
+        self.firmware = data.get("firmware")
+        self._tables = {
+            name: tuple(values)
+            for name, values in data.get("tables", {}).items()
+            if name in TABLE_REQUESTS
+        }
@@ -0,0 +1,139 @@
+"""Desired-state reconciliation for Maestro MCZ."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Mapping
+
+from homeassistant.exceptions import HomeAssistantError
+
+if TYPE_CHECKING:
+    from .controller import MaestroController
+
+_LOGGER = logging.getLogger(__name__)
+
+RECONCILE_BASE_DELAY = 5  # seconds before re-checking a write that did not stick
+RECONCILE_MAX_DELAY = 120
+RECONCILE_MAX_ATTEMPTS = 6
+
+# Commands whose value the Info frame reports under a different name.
+# Everything else is reported (if at all) under the command name itself.
+COMMAND_STATE_FIELDS: dict[str, str] = {
+    "Temperature_Setpoint": "Active_Set_Point",
+}
+
+
+class MaestroReconciler:
+    """Drive a stove towards a declared desired state.
+
+    Desired values are compared with the decoded state by encoding both
+    through the command encoder, so 21 vs 21.0, "ON" vs 1 or Power 0 vs the
+    stove's on/off flag compare the way the stove would see them. Only the
+    commands that differ are written. Writes that the next Info frames don't
+    reflect are retried with exponential backoff; after a reconnect the
+    remaining gap is picked up again. An entry is dropped once the stove
+    reports it, so later changes made on the stove itself are not fought.
+    Commands whose value the Info frame does not carry are written once.
+    """
+
+    def __init__(self, controller: MaestroController):
+        self._controller = controller
+        self._desired: dict[str, Any] = {}
+        self._unverifiable_sent: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._was_connected = controller.connected
+        controller.add_listener(self._on_update)
+
+    @property
+    def desired(self) -> dict[str, Any]:
+        """Return the desired values not yet reported by the stove."""
+        return dict(self._desired)
+
+    def set_desired(self, values: Mapping[str, Any]):
+        """Merge `values` into the desired state and start closing the gap."""
+        # Validate everything before touching the desired state
+        for name, value in values.items():
+            self._controller.encode_command(name, value)
+        self._desired.update(values)
+        self._unverifiable_sent.difference_update(values)
+        self._restart()
+
+    def clear(self):
+        """Forget the desired state and stop retrying."""
+        self._desired.clear()
+        self._unverifiable_sent.clear()
+        self.stop()
+
+    def stop(self):
+        """Stop the running reconcile loop, keeping the desired state."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def gap(self) -> dict[str, Any]:
+        """Return the desired values the stove does not report yet."""
+        state = self._controller.state
+        gap = {}
+        for name, value in list(self._desired.items()):
+            field = COMMAND_STATE_FIELDS.get(name, name)
+            if field not in state:
+                if name in self._unverifiable_sent:
+                    del self._desired[name]
+                else:
+                    gap[name] = value
+                continue
+            encode = self._controller.encode_command
+            try:
+                converged = encode(name, value) == encode(name, state[field])
+            except HomeAssistantError:
+                converged = False
+            if converged:
+                del self._desired[name]
+                self._unverifiable_sent.discard(name)
+            else:
+                gap[name] = value
+        return gap
+
+    def _restart(self):
+        self.stop()
+        if self._desired and self._controller.connected:
+            self._task = asyncio.create_task(self._run())
+
+    def _on_update(self):
+        connected = self._controller.connected
+        if connected and not self._was_connected and self._desired:
+            _LOGGER.info("Reconnected, resuming reconciliation of %s", list(self._desired))
+            self._restart()
+        self._was_connected = connected
+
+    async def _run(self):
+        delay = RECONCILE_BASE_DELAY
+        for attempt in range(1, RECONCILE_MAX_ATTEMPTS + 1):
+            gap = self.gap()
+            if not gap:
+                _LOGGER.debug("Stove converged to desired state")
+                return
+            if not self._controller.connected:
+                # _on_update restarts us after the reconnect
+                return
+            _LOGGER.debug("Reconcile attempt %d writing %s", attempt, gap)
+            try:
+                await self._controller.set_parameters(gap)
+            except HomeAssistantError as e:
+                _LOGGER.warning("Reconcile write failed: %s", e)
+            else:
+                state = self._controller.state
+                self._unverifiable_sent.update(
+                    name for name in gap if COMMAND_STATE_FIELDS.get(name, name) not in state
+                )
+            if not self.gap():
+                _LOGGER.debug("Stove converged to desired state")
+                return
+            if attempt == RECONCILE_MAX_ATTEMPTS:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONCILE_MAX_DELAY)
+        _LOGGER.warning(
+            "Stove did not converge after %d attempts, still differs in %s",
+            RECONCILE_MAX_ATTEMPTS, list(self.gap()),
+        )
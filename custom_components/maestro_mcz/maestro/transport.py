@@ -0,0 +1,289 @@
+"""Maestro MCZ transports.
+
+A transport moves raw pipe-delimited frames between a MaestroController and a
+stove. The controller owns the handshake sequencing, polling, frame decoding
+and listeners; a transport only knows how to open a link, send a 'C|...'
+request and hand back every frame the stove answers with.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+ConnectCallback = Callable[[], Awaitable[None]]
+MessageCallback = Callable[[str], None]
+
+
+class MaestroTransport(ABC):
+    """Base class for a link carrying Maestro frames."""
+
+    name = "transport"
+
+    def __init__(self):
+        self._on_connect: ConnectCallback | None = None
+        self._on_disconnect: ConnectCallback | None = None
+        self._on_message: MessageCallback | None = None
+
+    def attach(
+        self,
+        on_connect: ConnectCallback,
+        on_disconnect: ConnectCallback,
+        on_message: MessageCallback,
+    ):
+        """Register the controller callbacks driven by this transport."""
+        self._on_connect = on_connect
+        self._on_disconnect = on_disconnect
+        self._on_message = on_message
+
+    @property
+    def endpoint(self) -> str:
+        """Return a human-readable description of where the link goes."""
+        return self.name
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        """Return True while the link is up."""
+
+    @abstractmethod
+    async def open(self):
+        """Open the link and run the connect callback. Raises on failure."""
+
+    @abstractmethod
+    async def wait(self):
+        """Block until the link goes away."""
+
+    @abstractmethod
+    async def close(self):
+        """Close the link and release its resources. Safe to call when closed."""
+
+    async def join(self):
+        """Perform any handshake needed before requests are answered."""
+
+    @abstractmethod
+    async def send(self, request: str):
+        """Send a raw 'C|...' request to the stove."""
+
+
+class CloudTransport(MaestroTransport):
+    """Transport through the MCZ Cloud Socket.IO relay."""
+
+    name = "MCZ Cloud"
+    URL = "http://app.mcz.it:9000"
+
+    def __init__(self, serial: str, mac: str):
+        super().__init__()
+        self._serial = serial
+        self._mac = mac
+        self._payload = MappingProxyType(
+            {"serialNumber": serial, "macAddress": mac, "tipoChiamata": 1}
+        )
+        # Imported here: python-socketio is the integration's heaviest import
+        # and only the cloud transport needs it
+        import socketio
+
+        # Disable built-in reconnection — the controller manages its own loop
+        self._sio = socketio.AsyncClient(
+            logger=False, engineio_logger=False, reconnection=False,
+        )
+        self._sio.on("connect", self._on_sio_connect)
+        self._sio.on("disconnect", self._on_sio_disconnect)
+        self._sio.on("rispondo", self._on_rispondo)
+
+    @property
+    def endpoint(self) -> str:
+        return self.URL
+
+    @property
+    def connected(self) -> bool:
+        return self._sio.connected
+
+    async def open(self):
+        await self._sio.connect(self.URL)
+
+    async def wait(self):
+        await self._sio.wait()
+
+    async def close(self):
+        if self._sio.connected:
+            await self._sio.disconnect()
+
+    async def join(self):
+        await self._sio.emit(
+            "join",
+            {
+                "serialNumber": self._serial,
+                "macAddress": self._mac,
+                "type": "Android-App",
+            },
+        )
+
+    async def send(self, request: str):
+        payload = {**self._payload, "richiesta": request}
+        _LOGGER.debug("Sending cloud command: %s", payload)
+        await self._sio.emit("chiedo", payload)
+
+    async def _on_sio_connect(self):
+        await self._on_connect()
+
+    async def _on_sio_disconnect(self):
+        await self._on_disconnect()
+
+    async def _on_rispondo(self, data):
+        """Handle 'rispondo' event."""
+        try:
+            if "stringaRicevuta" in data:
+                self._on_message(data["stringaRicevuta"])
+            else:
+                _LOGGER.debug(
+                    "Received rispondo without stringaRicevuta: keys=%s",
+                    list(data.keys()),
+                )
+        except Exception as e:
+            _LOGGER.error("Error processing cloud message: %s", e, exc_info=True)
+
+
+class LoopbackTransport(MaestroTransport):
+    """In-memory transport for tests and benchmarks.
+
+    Requests are recorded in `sent` and handed to an optional responder whose
+    frames are delivered synchronously, before send() returns, so there is no
+    I/O or scheduling between a request and its answer.
+    """
+
+    name = "loopback"
+
+    def __init__(self, responder: Callable[[str], Iterable[str]] | None = None):
+        super().__init__()
+        self.sent: list[str] = []
+        self._responder = responder
+        self._open = False
+        self._closed = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self._open
+
+    async def open(self):
+        self._open = True
+        self._closed.clear()
+        await self._on_connect()
+
+    async def wait(self):
+        await self._closed.wait()
+
+    async def close(self):
+        await self.drop()
+
+    async def send(self, request: str):
+        if not self._open:
+            raise ConnectionError("Loopback transport is closed")
+        self.sent.append(request)
+        if self._responder is not None:
+            for message in self._responder(request):
+                self._on_message(message)
+
+    def inject(self, message: str):
+        """Deliver a frame as if the stove had pushed it."""
+        self._on_message(message)
+
+    async def drop(self):
+        """Close the link as if the remote end went away."""
+        if not self._open:
+            return
+        self._open = False
+        self._closed.set()
+        await self._on_disconnect()
+
+
+def iter_recording(path: str | Path) -> Iterator[tuple[float, str]]:
+    """Yield (timestamp, frame) pairs from a recorded frame file.
+
+    Each line holds a Unix timestamp and a raw frame separated by a tab, for
+    example '1697712000.0\\t01|0B|03|...'. Blank lines and lines starting
+    with '#' are skipped.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            timestamp, _, frame = line.partition("\t")
+            yield float(timestamp), frame
+
+
+class ReplayTransport(MaestroTransport):
+    """Transport that plays back a recorded frame file.
+
+    Frames are delivered with their recorded spacing divided by `speed`; a
+    speed of 0 replays as fast as possible. Requests are recorded in `sent`
+    and otherwise ignored. At the end of the recording the link closes, like
+    a dropped connection, and stays closed: open() raises from then on, so
+    a controller's connect() loop backs off instead of replaying forever.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str | Path, speed: float = 0):
+        super().__init__()
+        self._path = Path(path)
+        self._speed = speed
+        self.sent: list[str] = []
+        self._task: asyncio.Task | None = None
+        self._finished = False
+
+    @property
+    def endpoint(self) -> str:
+        return str(self._path)
+
+    @property
+    def connected(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def open(self):
+        if self._finished:
+            raise ConnectionError(f"Replay of {self._path} has finished")
+        if not self._path.is_file():
+            raise FileNotFoundError(self._path)
+        self._task = asyncio.create_task(self._play())
+        await self._on_connect()
+
+    async def wait(self):
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def send(self, request: str):
+        self.sent.append(request)
+
+    async def _play(self):
+        previous: float | None = None
+        started = time.monotonic()
+        try:
+            for timestamp, frame in iter_recording(self._path):
+                if self._speed and previous is not None:
+                    await asyncio.sleep(max(0.0, (timestamp - previous) / self._speed))
+                else:
+                    # Yield so a long recording cannot starve the event loop
+                    await asyncio.sleep(0)
+                previous = timestamp
+                self._on_message(frame)
+            self._finished = True
+            _LOGGER.debug(
+                "Replay of %s finished in %.2fs", self._path, time.monotonic() - started,
+            )
+        finally:
+            await self._on_disconnect()
+
@@ -2,6 +2,13 @@
 from dataclasses import dataclass
 from enum import Enum
 
+# Pseudo-field reported in MaestroController.changed_fields when the consumption totals grow
+CONSUMPTION_FIELD = "Consumption"
+# Pseudo-field reported in MaestroController.changed_fields when the chronostat program changes
+CHRONO_FIELD = "Chrono_Program"
+# Pseudo-field reported in MaestroController.changed_fields when a cached parameter table changes
+PARAMETERS_FIELD = "Parameter_Tables"
+
 
 class MaestroMessageType(Enum):
     """Maestro message type. This information is inside the first frame."""
@@ -35,6 +42,17 @@ class MaestroStoveState:
     on_or_off: int  # 0: Off, 1: On
 
 
+@dataclass(frozen=True)
+class MaestroStoveStateInfo:
+    """Everything derived from a Stove_State id, resolved once per frame."""
+    id: int
+    description: str | None  # None for ids missing from MAESTRO_STOVE_STATES
+    on_or_off: int  # 0: Off, 1: On
+    hvac_action: str  # "off", "heating" or "idle"
+    preset: str | None  # "Power 1".."Power 5" while burning at a power level
+    error_code: str | None  # "A01".."A23" for error states
+
+
 @dataclass
 class MaestroInformation:
     """Maestro Information definition."""
@@ -93,6 +111,19 @@ MAESTRO_COMMANDS_BY_NAME: dict[str, MaestroCommand] = {
     c.name: c for c in MAESTRO_COMMANDS
 }
 
+# Accepted value ranges (inclusive, in user units) for commands whose limits
+# we know. On/off and percentage commands are bounded by their type.
+MAESTRO_COMMAND_RANGES: dict[str, tuple[float, float]] = {
+    "Temperature_Setpoint": (10, 35),
+    "Chronostat_T1": (10, 35),
+    "Chronostat_T2": (10, 35),
+    "Chronostat_T3": (10, 35),
+    "Power_Level": (1, 5),
+    "Fan_State": (0, 6),
+    "DuctedFan1": (0, 6),
+    "DuctedFan2": (0, 6),
+}
+
 # Stove States
 MAESTRO_STOVE_STATES: list[MaestroStoveState] = [
     MaestroStoveState(0, "Off", 0),
@@ -148,6 +179,48 @@ MAESTRO_STOVE_STATES_BY_ID: dict[int, MaestroStoveState] = {
     s.id: s for s in MAESTRO_STOVE_STATES
 }
 
+# Stove states that indicate active heating (power levels, stabilising, start phases)
+MAESTRO_HEATING_STATE_IDS = frozenset(range(1, 16)) | {31}
+# Stove states that mean the stove is burning at a set power level (Power 1-5)
+MAESTRO_POWER_LEVEL_STATE_IDS = range(11, 16)
+# Stove states that are alarms (A01-A23 and waiting for security alarms)
+MAESTRO_ALARM_STATE_IDS = range(50, 70)
+
+
+def _derive_stove_state_info(state: MaestroStoveState) -> MaestroStoveStateInfo:
+    if state.id == 0:
+        hvac_action = "off"
+    elif state.id in MAESTRO_HEATING_STATE_IDS:
+        hvac_action = "heating"
+    else:
+        hvac_action = "idle"
+    preset = None
+    if state.id in MAESTRO_POWER_LEVEL_STATE_IDS:
+        preset = f"Power {state.id - 10}"
+    error_code = None
+    if state.description.startswith("Error "):
+        error_code = state.description.split()[1]
+    return MaestroStoveStateInfo(
+        state.id, state.description, state.on_or_off, hvac_action, preset, error_code,
+    )
+
+
+MAESTRO_STOVE_STATE_TABLE: dict[int, MaestroStoveStateInfo] = {
+    s.id: _derive_stove_state_info(s) for s in MAESTRO_STOVE_STATES
+}
+
+
+def get_stove_state_info(state_id: int) -> MaestroStoveStateInfo:
+    """Return the derived row for a Stove_State id.
+
+    Ids the table doesn't know get a row without a description, reported
+    as idle so the climate entity still shows something sensible.
+    """
+    row = MAESTRO_STOVE_STATE_TABLE.get(state_id)
+    if row is None:
+        row = MaestroStoveStateInfo(state_id, None, 0, "idle", None, None)
+    return row
+
 # Information Fields (Position in Info Frame -> Definition)
 # Position 0 is MessageType, so index 1 is first data field
 MAESTRO_INFO: dict[int, MaestroInformation] = {
@@ -1,17 +1,27 @@
 """Sensor entities for Maestro MCZ."""
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import REVOLUTIONS_PER_MINUTE, EntityCategory, UnitOfMass, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL, DOMAIN
 from .entity import MaestroEntity
-from .maestro.controller import MaestroController
+from .filters import DeadbandFilter, WriteScheduler, deadband_filter
+from .maestro.consumption import POWER_LEVELS, ConsumptionEstimator
+from .maestro.types import CONSUMPTION_FIELD
+
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
 
 
 async def async_setup_entry(
@@ -24,13 +34,51 @@ async def async_setup_entry(
 
     temp_cls = SensorDeviceClass.TEMPERATURE
     temp_unit = UnitOfTemperature.CELSIUS
+    options = entry.options
     entities = [
         MaestroSensor(controller, "Stove_State_Desc", "Stove State", None),
-        MaestroSensor(controller, "Fume_Temperature", "Fume Temperature", temp_cls, temp_unit),
         MaestroSensor(controller, "Ambient_Temperature", "Ambient Temperature", temp_cls, temp_unit),
         MaestroSensor(controller, "Fan_State", "Fan State", None),
     ]
-    async_add_entities(entities)
+    # Diagnostic and high-rate sensors: written at most every min_write_interval
+    throttled: list[MaestroEntity] = [
+        MaestroSensor(
+            controller, "Fume_Temperature", "Fume Temperature", temp_cls, temp_unit,
+            write_filter=deadband_filter(options, "Fume_Temperature"),
+        ),
+        MaestroSensor(
+            controller, "RPM_Fam_Fume", "Fume Fan Speed", None, REVOLUTIONS_PER_MINUTE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            write_filter=deadband_filter(options, "RPM_Fam_Fume"),
+        ),
+        MaestroSensor(
+            controller, "RPM_WormWheel", "Auger Speed", None, REVOLUTIONS_PER_MINUTE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            write_filter=deadband_filter(options, "RPM_WormWheel"),
+        ),
+        MaestroConsumptionSensor(
+            controller, "Pellet_Consumption", "Pellet Consumption",
+            lambda c: round(c.pellets_kg, 3), SensorDeviceClass.WEIGHT, UnitOfMass.KILOGRAMS,
+        ),
+        MaestroConsumptionSensor(
+            controller, "Burner_Runtime", "Burner Runtime",
+            lambda c: round(c.runtime_hours(), 2), SensorDeviceClass.DURATION, UnitOfTime.HOURS,
+        ),
+    ]
+    throttled.extend(
+        MaestroConsumptionSensor(
+            controller, f"Runtime_Power_{level}", f"Runtime Power {level}",
+            lambda c, level=level: round(c.runtime_hours(level), 2),
+            SensorDeviceClass.DURATION, UnitOfTime.HOURS,
+        )
+        for level in POWER_LEVELS
+    )
+    if interval := options.get(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL):
+        scheduler = WriteScheduler(hass.loop)
+        entry.async_on_unload(scheduler.shutdown)
+        for entity in throttled:
+            entity.throttle_writes(scheduler, interval)
+    async_add_entities([*entities, *throttled])
 
 
 class MaestroSensor(MaestroEntity, SensorEntity):
@@ -43,16 +91,67 @@ class MaestroSensor(MaestroEntity, SensorEntity):
         name: str,
         device_class: SensorDeviceClass | None = None,
         unit_of_measurement: str | None = None,
+        entity_category: EntityCategory | None = None,
+        write_filter: DeadbandFilter | None = None,
     ):
         super().__init__(controller)
         self._parameter_name = parameter_name
+        self._source_fields = frozenset({parameter_name})
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{controller.serial}_{parameter_name}"
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit_of_measurement
-        if device_class == SensorDeviceClass.TEMPERATURE:
+        self._attr_entity_category = entity_category
+        if device_class == SensorDeviceClass.TEMPERATURE or unit_of_measurement == REVOLUTIONS_PER_MINUTE:
             self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._filter = write_filter
+        self._filtered_value: Any = None
+        if write_filter is not None:
+            self._filtered_value = controller.state.get(parameter_name)
+            write_filter.accept(self._filtered_value, time.monotonic())
 
     @property
     def native_value(self):
+        if self._filter is not None:
+            return self._filtered_value
         return self._controller.state.get(self._parameter_name)
+
+    @callback
+    def _update_callback(self) -> None:
+        """Write the state, unless the deadband filter holds the new reading back."""
+        if not self._source_changed():
+            return
+        # Connection changes (no changed fields) always go through: availability
+        if self._filter is not None and self._controller.changed_fields:
+            value = self._controller.state.get(self._parameter_name)
+            if not self._filter.accept(value, time.monotonic()):
+                return
+            self._filtered_value = value
+        self._write_state()
+
+
+class MaestroConsumptionSensor(MaestroEntity, SensorEntity):
+    """Running total from the controller's consumption estimator."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _source_fields = frozenset({CONSUMPTION_FIELD})
+
+    def __init__(
+        self,
+        controller: MaestroController,
+        key: str,
+        name: str,
+        value_fn: Callable[[ConsumptionEstimator], float],
+        device_class: SensorDeviceClass,
+        unit_of_measurement: str,
+    ):
+        super().__init__(controller)
+        self._value_fn = value_fn
+        self._attr_name = name
+        self._attr_unique_id = f"{DOMAIN}_{controller.serial}_{key}"
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit_of_measurement
+
+    @property
+    def native_value(self) -> float:
+        return self._value_fn(self._controller.consumption)
@@ -1,5 +1,7 @@
 """Switch entities for Maestro MCZ."""
-from typing import Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -8,7 +10,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .entity import MaestroEntity
-from .maestro.controller import MaestroController
+
+if TYPE_CHECKING:
+    from .maestro.controller import MaestroController
 
 
 async def async_setup_entry(
@@ -34,6 +38,7 @@ class MaestroSwitch(MaestroEntity, SwitchEntity):
     def __init__(self, controller: MaestroController, parameter_name: str, name: str, command_name: str):
         super().__init__(controller)
         self._parameter_name = parameter_name
+        self._source_fields = frozenset({parameter_name})
         self._command_name = command_name
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{controller.serial}_{parameter_name}"
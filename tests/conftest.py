@@ -1,4 +1,5 @@
 """Shared test fixtures."""
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -6,10 +7,17 @@ import pytest
 from custom_components.maestro_mcz.maestro.controller import MaestroController
 
 
+async def wait_for(predicate, timeout=2.0):
+    """Poll until `predicate()` is true, failing after `timeout` seconds."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
 @pytest.fixture
 def controller():
     """Create a MaestroController with a mocked Socket.IO client."""
-    with patch("custom_components.maestro_mcz.maestro.controller.socketio.AsyncClient") as mock_sio_class:
+    with patch("socketio.AsyncClient") as mock_sio_class:
         mock_sio = AsyncMock()
         mock_sio.connected = False
         # socketio.AsyncClient.on() is synchronous — use MagicMock to avoid
@@ -17,5 +25,5 @@ def controller():
         mock_sio.on = MagicMock()
         mock_sio_class.return_value = mock_sio
         ctrl = MaestroController("12345", "AA:BB:CC:DD:EE:FF")
-        ctrl._sio = mock_sio
+        ctrl._transport._sio = mock_sio
         yield ctrl
@@ -0,0 +1,58 @@
+"""Tests for offline frame statistics."""
+import pytest
+
+pytest.importorskip("numpy")
+
+from custom_components.maestro_mcz.maestro.analytics import analyse_recording  # noqa: E402
+
+
+def _frame(state: int, fume_raw: int = 0, ambient_raw: int = 0) -> str:
+    return f"01|{state:02X}|00|00|00|{fume_raw:02X}|{ambient_raw:02X}"
+
+
+# (timestamp, Stove_State, raw fume, raw ambient)
+_SESSION = [
+    (0, 0, 0, 40),
+    (60, 1, 0, 40),  # ignition attempt
+    (120, 50, 0, 40),  # A01
+    (180, 0, 0, 40),
+    (240, 1, 0, 40),  # second attempt
+    (300, 11, 200, 40),  # Power 1, fume 100°C, ambient 20°C
+    (360, 11, 220, 41),
+    (420, 13, 240, 42),
+    (2420, 0, 0, 42),  # after a gap longer than MAX_INTEGRATION_GAP
+]
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "frames.tsv"
+    lines = [f"{t}.0\t{_frame(state, fume, ambient)}" for t, state, fume, ambient in _SESSION]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 100])
+def test_statistics_independent_of_chunking(recording, chunk_size):
+    stats = analyse_recording(recording, chunk_size=chunk_size)
+    assert stats.frames == len(_SESSION)
+    assert stats.time_in_state == {0: 120.0, 1: 120.0, 50: 60.0, 11: 120.0}
+    assert stats.ignition_attempts == 2
+    assert stats.fault_counts == {"A01": 1}
+    assert stats.ignition_failures == 1
+    assert stats.mean_fume_temperature(1) == 105.0
+    assert stats.mean_fume_temperature(3) == 120.0
+    assert stats.mean_fume_temperature(5) is None
+    # +1°C over the two minutes spent at Power 1
+    assert stats.heat_up_rate(1) == pytest.approx(30.0)
+    assert stats.heat_up_rate() == pytest.approx(30.0)
+    assert stats.heat_up_rate(3) is None
+
+
+def test_empty_recording(tmp_path):
+    path = tmp_path / "empty.tsv"
+    path.write_text("", encoding="utf-8")
+    stats = analyse_recording(path)
+    assert stats.frames == 0
+    assert stats.time_in_state == {}
+    assert stats.heat_up_rate() is None
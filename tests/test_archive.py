@@ -0,0 +1,70 @@
+"""Tests for the batch Info frame decoder."""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from custom_components.maestro_mcz.maestro.archive import (  # noqa: E402
+    decode_info_frames,
+    load_recording,
+)
+from custom_components.maestro_mcz.maestro.types import MAESTRO_INFO  # noqa: E402
+
+
+def _random_frame(rng: random.Random) -> str:
+    length = rng.choice([3, 14, 61])
+    fields = [f"{rng.randrange(256):02X}" for _ in range(1, length)]
+    return "01|" + "|".join(fields)
+
+
+class TestDecodeInfoFrames:
+    def test_matches_controller_decoding(self, controller):
+        rng = random.Random(42)
+        frames = [_random_frame(rng) for _ in range(50)]
+        decoded = decode_info_frames(frames)
+        assert len(decoded) == 50
+        for row, frame in enumerate(frames):
+            controller._state.clear()
+            controller._process_info_frame(frame.split("|"))
+            for info in MAESTRO_INFO.values():
+                if info.name in controller.state:
+                    assert decoded.valid[info.name][row]
+                    assert decoded.columns[info.name][row] == controller.state[info.name]
+                else:
+                    assert not decoded.valid[info.name][row]
+
+    def test_conversions(self):
+        decoded = decode_info_frames(["01|0D|03|00|00|FA|2B"] + ["01|" + "|".join(["00"] * 59 + ["01"])])
+        assert decoded.columns["Stove_State"].tolist() == [13, 0]
+        assert decoded.columns["Ambient_Temperature"][0] == 21.5
+        assert decoded.columns["Fume_Temperature"][0] == 125.0
+        assert decoded.columns["AntiFreeze"].dtype == bool
+        assert decoded.columns["AntiFreeze"].tolist() == [False, True]
+        assert decoded.valid["AntiFreeze"].tolist() == [False, True]
+
+    def test_invalid_hex_marked(self):
+        decoded = decode_info_frames(["01|ZZ|1f4|"])
+        assert not decoded.valid["Stove_State"][0]
+        assert decoded.valid["Fan_State"][0]
+        assert decoded.columns["Fan_State"][0] == 500
+        assert not decoded.valid["DuctedFan1"][0]
+
+    def test_non_info_frames_dropped(self):
+        decoded = decode_info_frames(["0E|1.2.3", "01|0B", "PING"], timestamps=[1.0, 2.0, 3.0])
+        assert decoded.timestamps.tolist() == [2.0]
+        assert decoded.columns["Stove_State"].tolist() == [11]
+
+    def test_empty(self):
+        decoded = decode_info_frames([])
+        assert len(decoded) == 0
+        assert decoded.columns["Ambient_Temperature"].shape == (0,)
+
+
+def test_load_recording(tmp_path):
+    path = tmp_path / "frames.tsv"
+    path.write_text("# stove 12345\n1000.0\t01|0B|03\n1060.0\t01|0C|04\n", encoding="utf-8")
+    decoded = load_recording(path)
+    assert decoded.timestamps.tolist() == [1000.0, 1060.0]
+    assert decoded.columns["Stove_State"].tolist() == [11, 12]
+    assert decoded.columns["Fan_State"].tolist() == [3, 4]
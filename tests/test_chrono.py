@@ -0,0 +1,118 @@
+"""Tests for the chronostat program codec and controller cache."""
+import pytest
+
+from custom_components.maestro_mcz.maestro.chrono import (
+    CHRONO_DAYS,
+    CHRONO_FIELDS_PER_SLOT,
+    CHRONO_REQUEST,
+    CHRONO_SLOTS_PER_DAY,
+    OFF_SLOT,
+    ChronoSlot,
+    decode_chrono_frame,
+    program_from_dict,
+    program_to_dict,
+)
+from custom_components.maestro_mcz.maestro.controller import CHRONO_FIELD, MaestroController
+from custom_components.maestro_mcz.maestro.parameters import SOFTWARE_VERSION_REQUEST
+from custom_components.maestro_mcz.maestro.transport import LoopbackTransport
+
+FIELDS = len(CHRONO_DAYS) * CHRONO_SLOTS_PER_DAY * CHRONO_FIELDS_PER_SLOT
+
+
+def chrono_frame(monday_first=(24, 34, 1)) -> str:
+    """Return a ChronoDays frame with only Monday's first program set."""
+    fields = ["00"] * FIELDS
+    fields[:3] = [f"{value:02X}" for value in monday_first]
+    return "04|" + "|".join(fields)
+
+
+class TestCodec:
+    def test_decode(self):
+        program = decode_chrono_frame(chrono_frame().split("|"))
+        assert program[0][0] == ChronoSlot(6 * 60, 8 * 60 + 30, True)
+        assert program[0][1] == OFF_SLOT
+        assert len(program) == 7 and all(len(day) == CHRONO_SLOTS_PER_DAY for day in program)
+
+    def test_decode_short_frame(self):
+        assert decode_chrono_frame(["04", "18", "22"]) is None
+
+    def test_decode_invalid_hex(self):
+        parts = chrono_frame().split("|")
+        parts[5] = "ZZ"
+        assert decode_chrono_frame(parts) is None
+
+
+OFF_SLOT_DICT = {"start": "00:00", "stop": "00:00", "enabled": False}
+
+
+class TestDictConversion:
+    def test_round_trip(self):
+        program = decode_chrono_frame(chrono_frame().split("|"))
+        data = program_to_dict(program)
+        assert data["monday"][0] == {"start": "06:00", "stop": "08:30", "enabled": True}
+        assert program_from_dict(data) == program
+
+    def test_missing_days_and_slots_off(self):
+        program = program_from_dict({"monday": [{"start": "06:00", "stop": "08:00", "enabled": True}]})
+        assert program[0][1:] == (OFF_SLOT,) * (CHRONO_SLOTS_PER_DAY - 1)
+        assert program[6] == (OFF_SLOT,) * CHRONO_SLOTS_PER_DAY
+
+    @pytest.mark.parametrize(
+        "slot",
+        [
+            {"start": "six", "stop": "08:00", "enabled": True},
+            {"start": "06:00", "enabled": True},
+            {"start": 6, "stop": "08:00", "enabled": True},
+        ],
+    )
+    def test_malformed_data_raises(self, slot):
+        with pytest.raises((KeyError, TypeError, ValueError, AttributeError)):
+            program_from_dict({"monday": [slot]})
+
+
+class TestControllerIntegration:
+    def test_frame_cached_and_notified_once(self, controller):
+        seen = []
+        controller.add_listener(lambda: seen.append(controller.changed_fields))
+        controller._on_message(chrono_frame())
+        controller._on_message(chrono_frame())
+        assert controller.chrono_program[0][0].enabled is True
+        assert seen == [frozenset({CHRONO_FIELD})]
+
+    def test_malformed_frame_ignored(self, controller):
+        controller._on_message("04|18|22")
+        assert controller.chrono_program is None
+
+    def test_restore_does_not_override_stove(self, controller):
+        controller._on_message(chrono_frame())
+        controller.restore_chrono_program(program_from_dict({}))
+        assert controller.chrono_program[0][0].enabled is True
+
+
+class TestProgramRequest:
+    @staticmethod
+    def _stove(request: str) -> list[str]:
+        if request == CHRONO_REQUEST:
+            return [chrono_frame()]
+        if request == SOFTWARE_VERSION_REQUEST:
+            return ["0E|1.12"]
+        return []
+
+    @pytest.mark.asyncio
+    async def test_requested_on_connect(self):
+        transport = LoopbackTransport(self._stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        assert CHRONO_REQUEST in transport.sent
+        assert controller.chrono_program[0][0].enabled is True
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_requested_again_after_firmware_change(self):
+        transport = LoopbackTransport(self._stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        transport.inject("0E|1.13")
+        await controller._chrono_task
+        assert transport.sent.count(CHRONO_REQUEST) == 2
+        await controller.disconnect()
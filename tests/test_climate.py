@@ -3,8 +3,11 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from homeassistant.components.climate import HVACAction, HVACMode
+from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.maestro_mcz.climate import MaestroClimate
+from custom_components.maestro_mcz.maestro.chrono import program_from_dict
+from custom_components.maestro_mcz.maestro.types import get_stove_state_info
 
 
 def _make_climate(state: dict) -> MaestroClimate:
@@ -12,10 +15,14 @@ def _make_climate(state: dict) -> MaestroClimate:
     controller = MagicMock()
     controller.serial = "12345"
     controller.state = state
+    # The controller resolves the derived Stove_State row once per frame
+    stove_state = state.get("Stove_State")
+    controller.stove_state = get_stove_state_info(stove_state) if isinstance(stove_state, int) else None
     controller.connected = True
     climate = MaestroClimate.__new__(MaestroClimate)
     climate._controller = controller
     climate._attr_unique_id = f"maestro_mcz_{controller.serial}_climate"
+    climate._update_attrs()
     return climate
 
 
@@ -42,6 +49,10 @@ class TestHvacAction:
         climate = _make_climate({})
         assert climate.hvac_action is None
 
+    def test_idle_for_unlisted_state(self):
+        climate = _make_climate({"Stove_State": 99})
+        assert climate.hvac_action == HVACAction.IDLE
+
     def test_invalid_value_returns_none(self):
         climate = _make_climate({"Stove_State": "not_a_number"})
         assert climate.hvac_action is None
@@ -209,3 +220,59 @@ class TestClimateAttributes:
     def test_unique_id(self, make_climate):
         climate = make_climate({})
         assert climate._attr_unique_id == "maestro_mcz_12345_climate"
+
+
+class TestSetParameters:
+    @pytest.mark.asyncio
+    async def test_forwards_mapping_to_controller(self, make_climate):
+        climate = make_climate({})
+        climate._controller.set_parameters = AsyncMock()
+        params = {"Temperature_Setpoint": 21.5, "Power_Level": 3}
+        await climate.async_set_parameters(params)
+        climate._controller.set_parameters.assert_awaited_once_with(params)
+
+
+class TestChronoProgram:
+    @pytest.mark.asyncio
+    async def test_get_returns_program(self, make_climate):
+        climate = make_climate({})
+        climate._controller.chrono_program = program_from_dict(
+            {"monday": [{"start": "06:00", "stop": "08:00", "enabled": True}]}
+        )
+        response = await climate.async_get_chrono_program()
+        assert response["program"]["monday"][0] == {"start": "06:00", "stop": "08:00", "enabled": True}
+
+    @pytest.mark.asyncio
+    async def test_get_without_program_raises(self, make_climate):
+        climate = make_climate({})
+        climate._controller.chrono_program = None
+        with pytest.raises(HomeAssistantError, match="not reported"):
+            await climate.async_get_chrono_program()
+
+
+class TestAttributeCaching:
+    def test_recomputes_when_source_field_changed(self, make_climate):
+        climate = make_climate({"Ambient_Temperature": 20.0})
+        climate.async_write_ha_state = MagicMock()
+        climate._controller.state["Ambient_Temperature"] = 21.0
+        climate._controller.changed_fields = frozenset({"Ambient_Temperature"})
+        climate._update_callback()
+        assert climate.current_temperature == 21.0
+        climate.async_write_ha_state.assert_called_once()
+
+    def test_skips_recompute_for_unrelated_fields(self, make_climate):
+        climate = make_climate({"Ambient_Temperature": 20.0})
+        climate.async_write_ha_state = MagicMock()
+        climate._update_attrs = MagicMock()
+        climate._controller.changed_fields = frozenset({"Fume_Temperature"})
+        climate._update_callback()
+        climate._update_attrs.assert_not_called()
+        climate.async_write_ha_state.assert_not_called()
+
+    def test_connection_change_does_not_recompute(self, make_climate):
+        climate = make_climate({})
+        climate.async_write_ha_state = MagicMock()
+        climate._update_attrs = MagicMock()
+        climate._controller.changed_fields = frozenset()
+        climate._update_callback()
+        climate._update_attrs.assert_not_called()
@@ -3,6 +3,7 @@ import re
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from homeassistant.exceptions import HomeAssistantError
 
 SERIAL_PATTERN = r"^\d+$"
 MAC_PATTERN = r"^([0-9A-F]{2}[:\-]){5}[0-9A-F]{2}$"
@@ -47,7 +48,34 @@ async def test_config_flow_disconnects_on_failure():
     mock_controller.disconnect = AsyncMock()
 
     with patch(
-        "custom_components.maestro_mcz.config_flow.MaestroController",
+        "custom_components.maestro_mcz.config_flow._create_controller",
+        return_value=mock_controller,
+    ):
+        from custom_components.maestro_mcz.config_flow import ConfigFlow
+
+        flow = ConfigFlow()
+        flow.hass = MagicMock()
+        flow.async_set_unique_id = AsyncMock()
+        flow._abort_if_unique_id_configured = MagicMock()
+
+        result = await flow.async_step_user(
+            {"serial": "12345", "mac": "AA:BB:CC:DD:EE:FF"}
+        )
+
+    mock_controller.disconnect.assert_awaited_once()
+    assert result["errors"]["base"] == "cannot_connect"
+
+
+@pytest.mark.asyncio
+async def test_config_flow_requires_info_answer():
+    """A connection the stove never answers on is reported as cannot_connect."""
+    mock_controller = MagicMock()
+    mock_controller.connect_once = AsyncMock()
+    mock_controller.request_info = AsyncMock(side_effect=HomeAssistantError("no answer"))
+    mock_controller.disconnect = AsyncMock()
+
+    with patch(
+        "custom_components.maestro_mcz.config_flow._create_controller",
         return_value=mock_controller,
     ):
         from custom_components.maestro_mcz.config_flow import ConfigFlow
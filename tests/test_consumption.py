@@ -0,0 +1,102 @@
+"""Tests for the pellet consumption and runtime estimator."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.maestro_mcz.climate import MaestroClimate
+from custom_components.maestro_mcz.maestro.consumption import (
+    MAX_INTEGRATION_GAP,
+    ConsumptionEstimator,
+)
+from custom_components.maestro_mcz.maestro.controller import CONSUMPTION_FIELD
+from custom_components.maestro_mcz.sensor import MaestroConsumptionSensor, MaestroSensor
+from custom_components.maestro_mcz.switch import MaestroSwitch
+
+
+class TestConsumptionEstimator:
+    def test_first_frame_only_opens_interval(self):
+        est = ConsumptionEstimator(grams_per_revolution=2.0)
+        assert est.update(100.0, 3, 60) is False
+        assert est.pellets_kg == 0.0
+        assert est.runtime_hours() == 0.0
+
+    def test_interval_credited_to_previous_reading(self):
+        est = ConsumptionEstimator(grams_per_revolution=2.0)
+        est.update(0.0, 3, 60)
+        assert est.update(120.0, 5, 0) is True
+        # 60 rpm for 2 minutes at 2 g/rev
+        assert est.pellets_kg == pytest.approx(0.24)
+        assert est.runtime_hours(3) == pytest.approx(120 / 3600)
+        assert est.runtime_hours(5) == 0.0
+
+    def test_outside_power_levels_counts_pellets_only(self):
+        est = ConsumptionEstimator(grams_per_revolution=1.0)
+        est.update(0.0, None, 30)
+        est.update(60.0, None, 30)
+        assert est.pellets_kg == pytest.approx(0.03)
+        assert est.runtime_hours() == 0.0
+
+    def test_long_gap_not_integrated(self):
+        est = ConsumptionEstimator()
+        est.update(0.0, 2, 50)
+        assert est.update(MAX_INTEGRATION_GAP + 1, 2, 50) is False
+        assert est.runtime_hours() == 0.0
+
+    def test_reset_interval(self):
+        est = ConsumptionEstimator()
+        est.update(0.0, 2, 50)
+        est.reset_interval()
+        assert est.update(60.0, 2, 50) is False
+
+    def test_round_trip(self):
+        est = ConsumptionEstimator(grams_per_revolution=2.0)
+        est.update(0.0, 4, 60)
+        est.update(300.0, 4, 60)
+        restored = ConsumptionEstimator()
+        restored.restore(est.as_dict())
+        assert restored.pellets_kg == est.pellets_kg
+        assert restored.runtime_hours(4) == est.runtime_hours(4)
+
+
+class TestControllerIntegration:
+    def test_frames_accumulate_runtime(self, controller):
+        # Stove_State=13 (Power 3), RPM_WormWheel at position 13
+        frame = ["01", "0D"] + ["00"] * 11 + ["1E"]
+        controller._last_data_at = 1000.0
+        controller._process_info_frame(frame)
+        controller._last_data_at = 1060.0
+        controller._process_info_frame(frame)
+        assert controller.consumption.runtime_hours(3) == pytest.approx(60 / 3600)
+        assert controller.consumption.pellets_kg > 0
+
+    def test_growth_notifies_listeners(self, controller):
+        frame = ["01", "0D"] + ["00"] * 11 + ["1E"]
+        seen = []
+        controller.add_listener(lambda: seen.append(controller.changed_fields))
+        controller._last_data_at = 1000.0
+        controller._process_info_frame(frame)
+        controller._last_data_at = 1060.0
+        controller._process_info_frame(frame)
+        # Second frame changes no state field, only the totals
+        assert seen[-1] == frozenset({CONSUMPTION_FIELD})
+
+    def test_growth_writes_only_consumption_entities(self, controller):
+        frame = ["01", "0D"] + ["00"] * 11 + ["1E"]
+        totals = MaestroConsumptionSensor(controller, "Burner_Runtime", "Burner Runtime", lambda c: 0, None, "h")
+        others = [
+            MaestroClimate(controller),
+            MaestroSwitch(controller, "Eco_Mode", "Eco Mode", "Eco_Mode"),
+            MaestroSensor(controller, "Ambient_Temperature", "Ambient Temperature"),
+        ]
+        for entity in [totals, *others]:
+            entity.async_write_ha_state = MagicMock()
+            controller.add_listener(entity._update_callback)
+        controller._last_data_at = 1000.0
+        controller._process_info_frame(frame)
+        for entity in [totals, *others]:
+            entity.async_write_ha_state.reset_mock()
+        controller._last_data_at = 1060.0
+        controller._process_info_frame(frame)
+        totals.async_write_ha_state.assert_called_once()
+        for entity in others:
+            entity.async_write_ha_state.assert_not_called()
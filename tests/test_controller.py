@@ -1,10 +1,21 @@
 """Tests for MaestroController."""
 import asyncio
+import gc
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.exceptions import HomeAssistantError
 
+from custom_components.maestro_mcz.maestro.controller import (
+    INFO_MAX_AGE,
+    RECONNECT_FAST_DELAY,
+    RECONNECT_JITTER,
+    REFRESH_MIN_INTERVAL,
+    MaestroController,
+)
+from custom_components.maestro_mcz.maestro.outbound import CommandPriority
+from custom_components.maestro_mcz.maestro.transport import LoopbackTransport
+
 
 class TestConvertValue:
     def test_temperature(self, controller):
@@ -74,6 +85,16 @@ class TestProcessInfoFrame:
         assert controller.state["Stove_State_Desc"] == "Power 1"
         assert controller.state["Power"] == 1
 
+    def test_stove_state_row_resolved(self, controller):
+        controller._process_info_frame(["01", "0D"])
+        assert controller.stove_state.preset == "Power 3"
+        assert controller.stove_state.hvac_action == "heating"
+
+    def test_unknown_stove_state_sets_row_only(self, controller):
+        controller._process_info_frame(["01", "63"])
+        assert controller.stove_state.id == 99
+        assert "Stove_State_Desc" not in controller.state
+
     def test_listener_called_on_change(self, controller):
         callback = MagicMock()
         controller.add_listener(callback)
@@ -81,6 +102,12 @@ class TestProcessInfoFrame:
         controller._process_info_frame(parts)
         callback.assert_called_once()
 
+    def test_changed_fields_reported_to_listeners(self, controller):
+        seen = []
+        controller.add_listener(lambda: seen.append(controller.changed_fields))
+        controller._process_info_frame(["01", "0B", "03"])
+        assert seen == [frozenset({"Stove_State", "Fan_State", "Stove_State_Desc", "Power"})]
+
     def test_listener_not_called_without_change(self, controller):
         # First call sets state
         controller._process_info_frame(["01", "00"])
@@ -91,39 +118,81 @@ class TestProcessInfoFrame:
         callback.assert_not_called()
 
 
+class TestAlarms:
+    def _record(self, controller):
+        events = []
+        controller.add_alarm_listener(lambda alarm, active: events.append((alarm.error_code, active)))
+        return events
+
+    def test_alarm_reported_once(self, controller):
+        events = self._record(controller)
+        controller._process_info_frame(["01", "0B"])
+        controller._process_info_frame(["01", "32"])  # 50: A01
+        controller._process_info_frame(["01", "32"])
+        controller._process_info_frame(["01", "32", "02"])
+        assert events == [("A01", True)]
+        assert controller.active_alarm.error_code == "A01"
+
+    def test_clear_on_recovery(self, controller):
+        events = self._record(controller)
+        controller._process_info_frame(["01", "33"])  # 51: A02
+        controller._process_info_frame(["01", "00"])
+        controller._process_info_frame(["01", "00"])
+        assert events == [("A02", True), ("A02", False)]
+        assert controller.active_alarm is None
+
+    def test_switching_alarm_clears_previous(self, controller):
+        events = self._record(controller)
+        controller._process_info_frame(["01", "32"])
+        controller._process_info_frame(["01", "34"])  # 52: A03
+        assert events == [("A01", True), ("A01", False), ("A03", True)]
+
+    def test_alarm_reported_before_ordinary_listeners(self, controller):
+        order = []
+        controller.add_listener(lambda: order.append("update"))
+        controller.add_alarm_listener(lambda alarm, active: order.append("alarm"))
+        controller._process_info_frame(["01", "32"])
+        assert order == ["alarm", "update"]
+
+
 class TestSendCommand:
     @pytest.mark.asyncio
     async def test_temperature_encoding(self, controller):
         controller._connected = True
         await controller.send_command("Temperature_Setpoint", 21.5)
-        controller._sio.emit.assert_called_once()
-        payload = controller._sio.emit.call_args[0][1]
+        controller._transport._sio.emit.assert_called_once()
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert "|43" in payload["richiesta"]
 
     @pytest.mark.asyncio
     async def test_onoff40_on(self, controller):
         controller._connected = True
         await controller.send_command("Power", 1)
-        payload = controller._sio.emit.call_args[0][1]
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert payload["richiesta"].endswith("|1")
 
     @pytest.mark.asyncio
     async def test_onoff40_off(self, controller):
         controller._connected = True
         await controller.send_command("Power", 0)
-        payload = controller._sio.emit.call_args[0][1]
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert payload["richiesta"].endswith("|40")
 
     @pytest.mark.asyncio
-    async def test_temperature_rounding_up(self, controller):
-        """Temperature 21.8 should round up to 22.0 (value 44), not truncate to 21.5 (43)."""
+    async def test_temperature_off_step_rejected(self, controller):
+        """Temperature 21.8 is not on the 0.5 step and is rejected rather than rounded."""
         controller._connected = True
-        controller._sio.emit = AsyncMock()
-        await controller.send_command("Temperature_Setpoint", 21.8)
-        call_args = controller._sio.emit.call_args
-        payload = call_args[0][1]
-        # 21.8 * 2 = 43.6, round(43.6) = 44 → "C|WriteParametri|42|44"
-        assert payload["richiesta"] == "C|WriteParametri|42|44"
+        controller._transport._sio.emit = AsyncMock()
+        with pytest.raises(HomeAssistantError, match="not a multiple of 0.5"):
+            await controller.send_command("Temperature_Setpoint", 21.8)
+        controller._transport._sio.emit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_out_of_range_never_reaches_transport(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="outside"):
+            await controller.send_command("Temperature_Setpoint", 50)
+        controller._transport._sio.emit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_raises_when_disconnected(self, controller):
@@ -137,14 +206,19 @@ class TestSendCommand:
         with pytest.raises(HomeAssistantError, match="Unknown command"):
             await controller.send_command("NonExistent", 0)
 
+    def test_encode_command_builds_request(self, controller):
+        assert controller.encode_command("Power_Level", 3) == "C|WriteParametri|36|3"
+        with pytest.raises(HomeAssistantError, match="Unknown command"):
+            controller.encode_command("NonExistent", 0)
+
     @pytest.mark.asyncio
     async def test_sends_when_connected_flag_set_but_sio_not(self, controller):
         """send_command should use _connected flag, not sio.connected (race condition fix)."""
         controller._connected = True
-        controller._sio.connected = False  # Library property not yet True
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.connected = False  # Library property not yet True
+        controller._transport._sio.emit = AsyncMock()
         await controller.send_command("GetInfo", 0)
-        controller._sio.emit.assert_called_once()
+        controller._transport._sio.emit.assert_called_once()
 
 
 class TestController:
@@ -165,29 +239,73 @@ class TestController:
         assert calls == ["a", "b"]
 
 
+class _Owner:
+    def __init__(self):
+        self.calls = 0
+
+    def on_update(self):
+        self.calls += 1
+
+
+class TestListenerRegistry:
+    def test_bound_method_removed_by_fresh_reference(self, controller):
+        baseline = controller.listener_count  # the reconciler's own listener
+        owner = _Owner()
+        controller.add_listener(owner.on_update)
+        controller.add_listener(owner.on_update)
+        assert controller.listener_count == baseline + 1
+        controller.remove_listener(owner.on_update)
+        assert controller.listener_count == baseline
+
+    def test_bound_method_held_weakly(self, controller):
+        baseline = controller.listener_count
+        owner = _Owner()
+        controller.add_listener(owner.on_update)
+        controller._notify_listeners()
+        assert owner.calls == 1
+        del owner
+        gc.collect()
+        assert controller.listener_count == baseline
+        assert controller.collected_listeners == 1
+        controller._notify_listeners()
+
+    def test_plain_function_held_strongly(self, controller):
+        calls = []
+        controller.add_listener(lambda: calls.append(1))
+        gc.collect()
+        controller._notify_listeners()
+        assert calls == [1]
+        assert controller.collected_listeners == 0
+
+    def test_remove_unknown_listener_is_noop(self, controller):
+        baseline = controller.listener_count
+        controller.remove_listener(lambda: None)
+        assert controller.listener_count == baseline
+
+
 class TestConnectGuard:
     @pytest.mark.asyncio
     async def test_duplicate_connect_prevented(self, controller):
         controller._running = True
         await controller.connect()
-        controller._sio.connect.assert_not_called()
+        controller._transport._sio.connect.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_cancelled_error_propagates(self, controller):
         """CancelledError must not be swallowed by the reconnect loop."""
-        controller._sio.connected = False
-        controller._sio.connect = AsyncMock(side_effect=asyncio.CancelledError)
+        controller._transport._sio.connected = False
+        controller._transport._sio.connect = AsyncMock(side_effect=asyncio.CancelledError)
         with pytest.raises(asyncio.CancelledError):
             await controller.connect()
 
 
 class TestReconnectResilience:
-    @pytest.mark.asyncio
-    async def test_retry_delay_increases(self, controller):
-        """Retry delay should double after each failure (exponential backoff)."""
-        controller._sio.connected = False
-        controller._sio.connect = AsyncMock(side_effect=Exception("fail"))
-        controller._sio.disconnect = AsyncMock()
+    @staticmethod
+    async def _failed_attempt_delays(controller, attempts: int) -> list[float]:
+        """Run the connect loop against a failing transport, capturing each retry delay."""
+        controller._transport._sio.connected = False
+        controller._transport._sio.connect = AsyncMock(side_effect=Exception("fail"))
+        controller._transport._sio.disconnect = AsyncMock()
 
         delays = []
 
@@ -196,56 +314,77 @@ class TestReconnectResilience:
             controller._running = False  # Stop after capturing delay
 
         with patch("custom_components.maestro_mcz.maestro.controller.asyncio.sleep", side_effect=capture_sleep):
-            await controller.connect()
-
-        assert delays[0] == 10  # Initial delay
+            for _ in range(attempts):
+                await controller.connect()
+        return delays
 
-        # Reset and run again to see second delay
-        delays.clear()
+    @pytest.mark.asyncio
+    async def test_first_retry_is_fast(self, controller):
+        """The first retry after a working link comes within a second."""
+        await controller._on_connect()
+        delays = await self._failed_attempt_delays(controller, 1)
+        assert 0 <= delays[0] <= RECONNECT_FAST_DELAY
 
-        with patch("custom_components.maestro_mcz.maestro.controller.asyncio.sleep", side_effect=capture_sleep):
-            await controller.connect()
+    @pytest.mark.asyncio
+    async def test_never_reachable_stove_backs_off(self, controller):
+        """Without a working link first there is no fast retry."""
+        delays = await self._failed_attempt_delays(controller, 1)
+        low, high = 1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER
+        assert 10 * low <= delays[0] <= 10 * high
 
-        assert delays[0] == 20  # Doubled
+    @pytest.mark.asyncio
+    async def test_retry_delay_increases(self, controller):
+        """After the fast retry, the delay doubles with jitter (exponential backoff)."""
+        await controller._on_connect()
+        delays = await self._failed_attempt_delays(controller, 3)
+        low, high = 1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER
+        assert 10 * low <= delays[1] <= 10 * high  # Initial delay
+        assert 20 * low <= delays[2] <= 20 * high  # Doubled
 
     @pytest.mark.asyncio
     async def test_retry_delay_caps_at_300(self, controller):
         """Retry delay should never exceed 300 seconds."""
         controller._retry_delay = 256
-        controller._sio.connected = False
-        controller._sio.connect = AsyncMock(side_effect=Exception("fail"))
-        controller._sio.disconnect = AsyncMock()
-
-        delays = []
-
-        async def capture_sleep(seconds):
-            delays.append(seconds)
-            controller._running = False
-
-        with patch("custom_components.maestro_mcz.maestro.controller.asyncio.sleep", side_effect=capture_sleep):
-            await controller.connect()
-
-        assert delays[0] == 256
+        delays = await self._failed_attempt_delays(controller, 1)
+        assert 256 * (1 - RECONNECT_JITTER) <= delays[0] <= 256 * (1 + RECONNECT_JITTER)
         assert controller._retry_delay == 300  # Capped, not 512
 
     @pytest.mark.asyncio
     async def test_retry_delay_resets_on_connect(self, controller):
         """Successful connection should reset retry delay to initial value."""
         controller._retry_delay = 160
+        controller._fast_retry = False
         await controller._on_connect()
         assert controller._retry_delay == 10
+        assert controller._fast_retry is True
+
+    @pytest.mark.asyncio
+    async def test_time_to_first_frame_after_reconnect(self):
+        transport = LoopbackTransport()
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        transport.inject("01|0B")
+        assert controller.diagnostics()["reconnect"]["count"] == 0
+
+        await transport.drop()
+        await transport.open()
+        transport.inject("01|0B")
+        reconnect = controller.diagnostics()["reconnect"]
+        assert reconnect["count"] == 1
+        assert 0 <= reconnect["seconds_to_first_frame"] <= reconnect["last_outage_seconds"]
+        await controller.disconnect()
 
     @pytest.mark.asyncio
     async def test_wait_called_when_already_connected(self, controller):
         """wait() must be called even if sio.connected is already True (busy-loop fix)."""
-        controller._sio.connected = True
-        controller._sio.wait = AsyncMock(side_effect=asyncio.CancelledError)
+        controller._transport._sio.connected = True
+        controller._transport._sio.wait = AsyncMock(side_effect=asyncio.CancelledError)
 
         with pytest.raises(asyncio.CancelledError):
             await controller.connect()
 
-        controller._sio.wait.assert_awaited_once()
-        controller._sio.connect.assert_not_called()
+        controller._transport._sio.wait.assert_awaited_once()
+        controller._transport._sio.connect.assert_not_called()
 
 
 class TestDisconnectCleanup:
@@ -272,51 +411,51 @@ class TestOnRispondo:
     async def test_processes_info_message(self, controller):
         """_on_rispondo should process Info-type messages."""
         data = {"stringaRicevuta": "01|00|03"}
-        await controller._on_rispondo(data)
+        await controller._transport._on_rispondo(data)
         assert controller.state.get("Stove_State") == 0
 
     @pytest.mark.asyncio
     async def test_ignores_non_info_message(self, controller):
         """_on_rispondo should ignore messages that aren't Info type."""
         data = {"stringaRicevuta": "99|00|03"}
-        await controller._on_rispondo(data)
+        await controller._transport._on_rispondo(data)
         assert controller.state == {}
 
     @pytest.mark.asyncio
     async def test_ignores_missing_key(self, controller):
         """_on_rispondo should handle data without stringaRicevuta."""
-        await controller._on_rispondo({"other": "data"})
+        await controller._transport._on_rispondo({"other": "data"})
         assert controller.state == {}
 
     @pytest.mark.asyncio
     async def test_handles_exception_gracefully(self, controller):
         """_on_rispondo should log errors, not crash."""
-        await controller._on_rispondo(None)  # Should not raise
+        await controller._transport._on_rispondo(None)  # Should not raise
 
 
 class TestSendCommandStringHandling:
     @pytest.mark.asyncio
     async def test_on_string(self, controller):
         controller._connected = True
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller.send_command("Power", "ON")
-        payload = controller._sio.emit.call_args[0][1]
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert payload["richiesta"].endswith("|1")
 
     @pytest.mark.asyncio
     async def test_off_string(self, controller):
         controller._connected = True
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller.send_command("Power", "OFF")
-        payload = controller._sio.emit.call_args[0][1]
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert payload["richiesta"].endswith("|40")
 
     @pytest.mark.asyncio
     async def test_getinfo_command(self, controller):
         controller._connected = True
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller.send_command("GetInfo", 0)
-        payload = controller._sio.emit.call_args[0][1]
+        payload = controller._transport._sio.emit.call_args[0][1]
         assert payload["richiesta"] == "C|RecuperoInfo"
 
     @pytest.mark.asyncio
@@ -329,9 +468,9 @@ class TestSendCommandStringHandling:
 class TestOnConnect:
     @pytest.mark.asyncio
     async def test_emits_join(self, controller):
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller._on_connect()
-        first_call = controller._sio.emit.call_args_list[0]
+        first_call = controller._transport._sio.emit.call_args_list[0]
         assert first_call[0][0] == "join"
         join_data = first_call[0][1]
         assert join_data["serialNumber"] == "12345"
@@ -339,25 +478,25 @@ class TestOnConnect:
 
     @pytest.mark.asyncio
     async def test_requests_info_after_join(self, controller):
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller._on_connect()
-        assert controller._sio.emit.call_count >= 2
+        assert controller._transport._sio.emit.call_count >= 2
 
     @pytest.mark.asyncio
     async def test_sets_connected_true(self, controller):
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller._on_connect()
         assert controller.connected is True
 
     @pytest.mark.asyncio
     async def test_getinfo_succeeds_when_sio_connected_false(self, controller):
         """_on_connect should successfully send GetInfo even when sio.connected is False (race condition)."""
-        controller._sio.emit = AsyncMock()
-        controller._sio.connected = False  # Simulates library timing window
+        controller._transport._sio.emit = AsyncMock()
+        controller._transport._sio.connected = False  # Simulates library timing window
         await controller._on_connect()
         # Should still emit both join and GetInfo
-        assert controller._sio.emit.call_count >= 2
-        chiedo_call = controller._sio.emit.call_args_list[1]
+        assert controller._transport._sio.emit.call_count >= 2
+        chiedo_call = controller._transport._sio.emit.call_args_list[1]
         assert chiedo_call[0][0] == "chiedo"
 
 
@@ -379,7 +518,7 @@ class TestPeriodicPoll:
     @pytest.mark.asyncio
     async def test_on_connect_starts_poll_task(self, controller):
         """_on_connect should start a periodic poll task."""
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         assert controller._poll_task is None
         await controller._on_connect()
         assert controller._poll_task is not None
@@ -389,7 +528,7 @@ class TestPeriodicPoll:
     @pytest.mark.asyncio
     async def test_on_disconnect_stops_poll_task(self, controller):
         """_on_disconnect should cancel the periodic poll task."""
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller._on_connect()
         assert controller._poll_task is not None
         await controller._on_disconnect()
@@ -406,20 +545,20 @@ class TestPeriodicPoll:
     async def test_rispondo_updates_last_data_at(self, controller):
         """_on_rispondo should update _last_data_at timestamp."""
         assert controller._last_data_at == 0.0
-        await controller._on_rispondo({"stringaRicevuta": "01|00"})
+        await controller._transport._on_rispondo({"stringaRicevuta": "01|00"})
         assert controller._last_data_at > 0.0
 
     @pytest.mark.asyncio
     async def test_rispondo_updates_last_data_at_even_for_non_info(self, controller):
         """_last_data_at should update for any rispondo, not just Info messages."""
-        await controller._on_rispondo({"stringaRicevuta": "99|data"})
+        await controller._transport._on_rispondo({"stringaRicevuta": "99|data"})
         assert controller._last_data_at > 0.0
 
     @pytest.mark.asyncio
     async def test_periodic_poll_sends_getinfo(self, controller):
         """Periodic poll should send GetInfo commands."""
         controller._connected = True
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
 
         # Patch sleep to let one poll execute, then stop on second iteration
         call_count = 0
@@ -434,16 +573,285 @@ class TestPeriodicPoll:
             await controller._periodic_poll()
 
         # Should have sent at least one GetInfo (chiedo event)
-        assert controller._sio.emit.call_count >= 1
-        chiedo_call = controller._sio.emit.call_args
+        assert controller._transport._sio.emit.call_count >= 1
+        chiedo_call = controller._transport._sio.emit.call_args
         assert chiedo_call[0][0] == "chiedo"
 
     @pytest.mark.asyncio
     async def test_disconnect_preserves_poll_cleanup(self, controller):
         """Full disconnect should clean up polling."""
-        controller._sio.emit = AsyncMock()
+        controller._transport._sio.emit = AsyncMock()
         await controller._on_connect()
         poll_task = controller._poll_task
         assert poll_task is not None
         await controller.disconnect()
         assert controller._poll_task is None
+
+
+class TestSetParameters:
+    @staticmethod
+    def _answer_getinfo(controller, frame="01|0B|03"):
+        """Make the mocked socket answer GetInfo with an Info frame."""
+        async def emit(event, payload):
+            if payload.get("richiesta") == "C|RecuperoInfo":
+                asyncio.get_running_loop().call_soon(controller._on_message, frame)
+        controller._transport._sio.emit = AsyncMock(side_effect=emit)
+
+    @pytest.mark.asyncio
+    async def test_pipelines_writes_then_getinfo(self, controller):
+        controller._connected = True
+        self._answer_getinfo(controller)
+        snapshot = await controller.set_parameters(
+            {"Temperature_Setpoint": 21.5, "Power_Level": 3, "Eco_Mode": 1},
+        )
+        sent = [c[0][1]["richiesta"] for c in controller._transport._sio.emit.call_args_list]
+        assert sent == [
+            "C|WriteParametri|42|43",
+            "C|WriteParametri|36|3",
+            "C|WriteParametri|41|1",
+            "C|RecuperoInfo",
+        ]
+        assert snapshot["Stove_State"] == 11
+        assert controller._info_waiters == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_entry_rejects_whole_batch(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="Unknown command"):
+            await controller.set_parameters({"Temperature_Setpoint": 21.5, "Bogus": 1})
+        controller._transport._sio.emit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalid_value_type_rejected(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="Invalid value"):
+            await controller.set_parameters({"Power_Level": [3]})
+        controller._transport._sio.emit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_mapping_rejected(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="No parameters"):
+            await controller.set_parameters({})
+
+    @pytest.mark.asyncio
+    async def test_raises_when_disconnected(self, controller):
+        controller._connected = False
+        with pytest.raises(HomeAssistantError, match="not connected"):
+            await controller.set_parameters({"Power_Level": 3})
+
+    @pytest.mark.asyncio
+    async def test_timeout_without_info_frame(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="did not confirm"):
+            await controller.set_parameters({"Power_Level": 3}, timeout=0.01)
+        assert controller._info_waiters == []
+
+    @pytest.mark.asyncio
+    async def test_frame_before_getinfo_sent_not_confirmation(self, controller):
+        controller._connected = True
+        self._answer_getinfo(controller, "01|0D|03")
+        # With the bucket drained the writes wait; a pushed frame lands meanwhile
+        controller._queue._tokens = -1
+        task = asyncio.create_task(controller.set_parameters({"Power_Level": 3}))
+        await asyncio.sleep(0)
+        controller._on_message("01|0B|03")
+        snapshot = await asyncio.wait_for(task, 5)
+        assert snapshot["Stove_State"] == 13
+
+    @pytest.mark.asyncio
+    async def test_answer_decoded_during_send_confirms(self, controller):
+        controller._connected = True
+
+        async def emit(event, payload):
+            if payload.get("richiesta") == "C|RecuperoInfo":
+                controller._on_message("01|0D|03")
+        controller._transport._sio.emit = AsyncMock(side_effect=emit)
+        snapshot = await controller.set_parameters({"Power_Level": 3}, timeout=0.1)
+        assert snapshot["Stove_State"] == 13
+
+
+class TestRequestInfo:
+    @staticmethod
+    def _sent_getinfo(controller) -> int:
+        return sum(
+            1 for c in controller._transport._sio.emit.call_args_list
+            if c[0][1].get("richiesta") == "C|RecuperoInfo"
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_request(self, controller):
+        controller._connected = True
+        TestSetParameters._answer_getinfo(controller)
+        snapshots = await asyncio.gather(*(controller.request_info() for _ in range(5)))
+        assert self._sent_getinfo(controller) == 1
+        assert all(snapshot["Stove_State"] == 11 for snapshot in snapshots)
+
+    @pytest.mark.asyncio
+    async def test_fresh_snapshot_served_from_memory(self, controller):
+        controller._connected = True
+        TestSetParameters._answer_getinfo(controller)
+        await controller.request_info()
+        snapshot = await controller.request_info()
+        assert snapshot["Fan_State"] == 3
+        assert self._sent_getinfo(controller) == 1
+
+    @pytest.mark.asyncio
+    async def test_max_age_zero_always_asks(self, controller):
+        controller._connected = True
+        TestSetParameters._answer_getinfo(controller)
+        await controller.request_info()
+        await controller.request_info(max_age=0)
+        assert self._sent_getinfo(controller) == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, controller):
+        controller._connected = True
+        with pytest.raises(HomeAssistantError, match="did not answer"):
+            await controller.request_info(timeout=0.01)
+
+    @pytest.mark.asyncio
+    async def test_raises_when_disconnected(self, controller):
+        with pytest.raises(HomeAssistantError, match="not connected"):
+            await controller.request_info()
+        assert controller._info_waiters == []
+
+    @pytest.mark.asyncio
+    async def test_joins_handshake_getinfo(self):
+        transport = LoopbackTransport()
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        pending = asyncio.create_task(controller.request_info())
+        await asyncio.sleep(0)
+        transport.inject("01|0B")
+        assert (await pending)["Stove_State"] == 11
+        assert transport.sent.count("C|RecuperoInfo") == 1
+        await controller.disconnect()
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_entities_refreshing_together_send_one_request(self, controller):
+        controller._connected = True
+        TestSetParameters._answer_getinfo(controller)
+        await asyncio.gather(*(controller.refresh() for _ in range(20)))
+        assert TestRequestInfo._sent_getinfo(controller) == 1
+
+    @pytest.mark.asyncio
+    async def test_throttled_within_min_interval(self, controller):
+        controller._connected = True
+        TestSetParameters._answer_getinfo(controller)
+        await controller.refresh()
+        # Older than request_info's default max age, within the refresh interval
+        controller._last_info_at -= INFO_MAX_AGE + 1
+        await controller.refresh()
+        assert TestRequestInfo._sent_getinfo(controller) == 1
+        controller._last_info_at -= REFRESH_MIN_INTERVAL
+        await controller.refresh()
+        assert TestRequestInfo._sent_getinfo(controller) == 2
+
+    @pytest.mark.asyncio
+    async def test_disconnected_is_a_no_op(self, controller):
+        await controller.refresh()
+        controller._transport._sio.emit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failure_is_logged_not_raised(self, controller, caplog):
+        controller._connected = True
+        with patch.object(controller, "request_info", AsyncMock(side_effect=HomeAssistantError("no answer"))):
+            await controller.refresh()
+        assert "Refresh failed" in caplog.text
+
+
+class TestOfflineCommands:
+    @staticmethod
+    async def _reconnecting():
+        """Return a controller whose connection loop is running but whose link is down."""
+        transport = LoopbackTransport()
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        controller._running = True
+        return controller, transport
+
+    @pytest.mark.asyncio
+    async def test_held_until_reconnect(self):
+        controller, transport = await self._reconnecting()
+        task = asyncio.create_task(controller.send_command("Fan_State", 2))
+        await asyncio.sleep(0)
+        assert not task.done()
+        assert controller.diagnostics()["offline"]["pending"] == ["C|WriteParametri|37|2"]
+        await transport.open()
+        await task
+        assert transport.sent[0] == "C|RecuperoInfo"
+        assert "C|WriteParametri|37|2" in transport.sent
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_latest_value_wins(self):
+        controller, transport = await self._reconnecting()
+        tasks = [asyncio.create_task(controller.send_command("Fan_State", level)) for level in (1, 2, 3)]
+        await asyncio.sleep(0)
+        await transport.open()
+        await asyncio.gather(*tasks)
+        writes = [request for request in transport.sent if request.startswith("C|WriteParametri|37|")]
+        assert writes == ["C|WriteParametri|37|3"]
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_expires(self):
+        controller, _ = await self._reconnecting()
+        with pytest.raises(HomeAssistantError, match="expired"):
+            await controller.send_command("Fan_State", 2, ttl=0.01)
+
+    @pytest.mark.asyncio
+    async def test_getinfo_not_held(self):
+        controller, _ = await self._reconnecting()
+        with pytest.raises(HomeAssistantError, match="not connected"):
+            await controller.send_command("GetInfo", 0)
+
+    @pytest.mark.asyncio
+    async def test_invalid_value_rejected_before_holding(self):
+        controller, _ = await self._reconnecting()
+        with pytest.raises(HomeAssistantError, match="outside"):
+            await controller.send_command("Fan_State", 9)
+        assert controller.diagnostics()["offline"]["held"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unload_during_flush(self):
+        controller, transport = await self._reconnecting()
+        task = asyncio.create_task(controller.send_command("Fan_State", 2, ttl=0.1))
+        await asyncio.sleep(0)
+        # Drain the token bucket so the flush is still waiting to send when the entry unloads
+        controller._queue._tokens = -10
+        await transport.open()
+        await asyncio.sleep(0)
+        assert controller._flush_task is not None and not controller._flush_task.done()
+        await controller.disconnect()
+        with pytest.raises(HomeAssistantError, match="Disconnected"):
+            await asyncio.wait_for(task, 1)
+
+    @pytest.mark.asyncio
+    async def test_disconnect_fails_held_commands(self):
+        controller, _ = await self._reconnecting()
+        task = asyncio.create_task(controller.send_command("Fan_State", 2))
+        await asyncio.sleep(0)
+        await controller.disconnect()
+        with pytest.raises(HomeAssistantError, match="Disconnected"):
+            await task
+
+
+class TestCommandPriority:
+    def test_power_off_is_safety(self, controller):
+        assert controller._command_priority("Power", "C|WriteParametri|34|40") == CommandPriority.SAFETY
+        assert controller._command_priority("Power", "C|WriteParametri|34|1") == CommandPriority.USER
+
+    def test_reset_alarm_is_safety(self, controller):
+        assert controller._command_priority("Reset_Alarm", "C|WriteParametri|1|1") == CommandPriority.SAFETY
+
+    def test_getinfo_is_poll(self, controller):
+        assert controller._command_priority("GetInfo", "C|RecuperoInfo") == CommandPriority.POLL
+
+    @pytest.mark.asyncio
+    async def test_send_command_goes_through_queue(self, controller):
+        controller._connected = True
+        await controller.send_command("Power", 1)
+        assert controller.queue_stats["sent"] == 1
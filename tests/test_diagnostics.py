@@ -0,0 +1,62 @@
+"""Tests for the config entry diagnostics."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.maestro_mcz.const import DOMAIN
+from custom_components.maestro_mcz.diagnostics import async_get_config_entry_diagnostics
+from custom_components.maestro_mcz.maestro.controller import DIAGNOSTICS_FRAMES, MaestroController
+from custom_components.maestro_mcz.maestro.transport import LoopbackTransport
+
+
+def _stove(request: str) -> list[str]:
+    if request == "C|RecuperoInfo":
+        return ["01|0B|03"]
+    return []
+
+
+@pytest.fixture
+async def hass_and_entry():
+    controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", LoopbackTransport(_stove))
+    await controller.connect_once()
+    entry = MagicMock()
+    entry.entry_id = "entry1"
+    entry.title = "Maestro Cloud (12345)"
+    entry.data = {"serial": "12345", "mac": "AA:BB:CC:DD:EE:FF", "connection_type": "cloud"}
+    entry.options = {}
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"entry1": controller}}
+    yield hass, entry, controller
+    await controller.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_serial_and_mac_redacted(hass_and_entry):
+    hass, entry, controller = hass_and_entry
+    diag = await async_get_config_entry_diagnostics(hass, entry)
+    assert "12345" not in repr(diag)
+    assert "AA:BB:CC:DD:EE:FF" not in repr(diag)
+    assert diag["entry"]["data"]["connection_type"] == "cloud"
+
+
+@pytest.mark.asyncio
+async def test_controller_snapshot(hass_and_entry):
+    hass, entry, controller = hass_and_entry
+    diag = (await async_get_config_entry_diagnostics(hass, entry))["controller"]
+    assert diag["connected"] is True
+    assert diag["poll"]["active"] is True
+    assert diag["listeners"]["count"] == controller.listener_count
+    assert diag["decode"]["frames"] == 1
+    assert [f["frame"] for f in diag["recent_frames"]] == ["01|0B|03"]
+    assert diag["queue"]["pending"] == []
+    assert diag["state"]["Stove_State"] == 11
+
+
+@pytest.mark.asyncio
+async def test_recent_frames_bounded(hass_and_entry):
+    hass, entry, controller = hass_and_entry
+    for i in range(DIAGNOSTICS_FRAMES + 5):
+        controller._on_message(f"01|0B|{i:02X}")
+    diag = controller.diagnostics()
+    assert len(diag["recent_frames"]) == DIAGNOSTICS_FRAMES
+    assert diag["recent_frames"][-1]["frame"] == f"01|0B|{DIAGNOSTICS_FRAMES + 4:02X}"
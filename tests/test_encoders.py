@@ -0,0 +1,59 @@
+"""Tests for the compiled command encoders."""
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.maestro_mcz.maestro.encoders import COMMAND_ENCODERS
+from custom_components.maestro_mcz.maestro.types import MAESTRO_COMMANDS
+
+
+def test_every_command_has_an_encoder():
+    assert set(COMMAND_ENCODERS) == {c.name for c in MAESTRO_COMMANDS}
+
+
+class TestEncoding:
+    @pytest.mark.parametrize(
+        ("name", "value", "expected"),
+        [
+            ("Temperature_Setpoint", 21.5, "C|WriteParametri|42|43"),
+            ("Temperature_Setpoint", "21.5", "C|WriteParametri|42|43"),
+            ("Power", "ON", "C|WriteParametri|34|1"),
+            ("Power", 0, "C|WriteParametri|34|40"),
+            ("Eco_Mode", "off", "C|WriteParametri|41|0"),
+            ("Power_Level", 3.0, "C|WriteParametri|36|3"),
+            ("FrontFan", 75, "C|Diagnostica|5|75"),
+            ("RPM_WormWheel", 1200, "C|Diagnostica|2|1200"),
+            ("GetInfo", 0, "C|RecuperoInfo"),
+        ],
+    )
+    def test_request_strings(self, name, value, expected):
+        assert COMMAND_ENCODERS[name](value) == expected
+
+    @pytest.mark.parametrize(
+        ("name", "value"),
+        [
+            ("Temperature_Setpoint", 9.5),
+            ("Temperature_Setpoint", 35.5),
+            ("Power_Level", 0),
+            ("Power_Level", 6),
+            ("Fan_State", 7),
+            ("Eco_Mode", 2),
+            ("FrontFan", 101),
+            ("Temperature_Setpoint", 21.3),
+            ("Temperature_Setpoint", "21.8"),
+            ("Power_Level", 3.7),
+            ("Fan_State", 2.9),
+            ("Power", 0.5),
+        ],
+    )
+    def test_out_of_range_rejected(self, name, value):
+        with pytest.raises(HomeAssistantError, match="outside|not a multiple of"):
+            COMMAND_ENCODERS[name](value)
+
+    def test_bounds_inclusive(self):
+        assert COMMAND_ENCODERS["Temperature_Setpoint"](10) == "C|WriteParametri|42|20"
+        assert COMMAND_ENCODERS["Temperature_Setpoint"](35) == "C|WriteParametri|42|70"
+
+    @pytest.mark.parametrize("value", ["warm", float("nan"), float("inf"), [3], None])
+    def test_invalid_values_rejected(self, value):
+        with pytest.raises(HomeAssistantError, match="Invalid value"):
+            COMMAND_ENCODERS["Power_Level"](value)
@@ -66,3 +66,69 @@ class TestEntityAvailability:
     def test_unavailable_when_disconnected(self, entity, mock_controller):
         mock_controller.connected = False
         assert entity.available is False
+
+
+class TestEntityUpdate:
+    def test_not_polled(self, entity):
+        assert entity.should_poll is False
+
+    @pytest.mark.asyncio
+    async def test_async_update_refreshes_controller(self, entity, mock_controller):
+        await entity.async_update()
+        mock_controller.refresh.assert_awaited_once()
+
+
+class TestThrottledWrites:
+    def _throttled(self, entity, mock_controller):
+        mock_controller.changed_fields = frozenset({"Fume_Temperature"})
+        scheduler = MagicMock()
+        entity.throttle_writes(scheduler, 30)
+        entity.async_write_ha_state = MagicMock()
+        return scheduler
+
+    def test_unthrottled_writes_directly(self, entity, mock_controller):
+        mock_controller.changed_fields = frozenset({"Fume_Temperature"})
+        entity.async_write_ha_state = MagicMock()
+        entity._update_callback()
+        entity.async_write_ha_state.assert_called_once()
+
+    def test_data_update_goes_through_scheduler(self, entity, mock_controller):
+        scheduler = self._throttled(entity, mock_controller)
+        entity._update_callback()
+        scheduler.write.assert_called_once_with(entity, 30, entity.async_write_ha_state)
+        entity.async_write_ha_state.assert_not_called()
+
+    def test_connection_change_bypasses_scheduler(self, entity, mock_controller):
+        scheduler = self._throttled(entity, mock_controller)
+        mock_controller.changed_fields = frozenset()
+        entity._update_callback()
+        scheduler.write.assert_not_called()
+        entity.async_write_ha_state.assert_called_once()
+
+    async def test_removal_cancels_pending_write(self, entity, mock_controller):
+        scheduler = self._throttled(entity, mock_controller)
+        await entity.async_will_remove_from_hass()
+        scheduler.cancel.assert_called_once_with(entity)
+
+
+class TestSourceFields:
+    def test_unrelated_update_skipped(self, entity, mock_controller):
+        entity._source_fields = frozenset({"Eco_Mode"})
+        mock_controller.changed_fields = frozenset({"Consumption"})
+        entity.async_write_ha_state = MagicMock()
+        entity._update_callback()
+        entity.async_write_ha_state.assert_not_called()
+
+    def test_source_update_written(self, entity, mock_controller):
+        entity._source_fields = frozenset({"Eco_Mode"})
+        mock_controller.changed_fields = frozenset({"Eco_Mode", "Consumption"})
+        entity.async_write_ha_state = MagicMock()
+        entity._update_callback()
+        entity.async_write_ha_state.assert_called_once()
+
+    def test_connection_change_written(self, entity, mock_controller):
+        entity._source_fields = frozenset({"Eco_Mode"})
+        mock_controller.changed_fields = frozenset()
+        entity.async_write_ha_state = MagicMock()
+        entity._update_callback()
+        entity.async_write_ha_state.assert_called_once()
@@ -0,0 +1,222 @@
+"""Tests for the deadband filters applied to sensor state writes."""
+from custom_components.maestro_mcz.const import (
+    CONF_MAX_QUIET_INTERVAL,
+    DEADBAND_PERCENTAGE,
+    deadband_mode_option,
+    deadband_option,
+)
+from custom_components.maestro_mcz.filters import Deadband, DeadbandFilter, WriteScheduler, deadband_filter
+
+
+class FakeLoop:
+    """Just enough of an event loop to drive WriteScheduler's timer by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = []
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        handle = FakeTimer(when, callback)
+        self.timers.append(handle)
+        return handle
+
+    def advance(self, seconds):
+        self.now += seconds
+        for timer in [t for t in self.timers if not t.cancelled and t.when() <= self.now]:
+            self.timers.remove(timer)
+            timer.callback()
+
+    @property
+    def armed(self):
+        return [t for t in self.timers if not t.cancelled]
+
+
+class FakeTimer:
+    def __init__(self, when, callback):
+        self._when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def when(self):
+        return self._when
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestDeadband:
+    def test_absolute(self):
+        band = Deadband(1.0)
+        assert not band.exceeded(100.0, 100.5)
+        assert band.exceeded(100.0, 101.0)
+        assert band.exceeded(100.0, 99.0)
+
+    def test_percentage_of_last_written(self):
+        band = Deadband(5.0, DEADBAND_PERCENTAGE)
+        assert not band.exceeded(1000, 1040)
+        assert band.exceeded(1000, 1050)
+
+    def test_percentage_of_zero(self):
+        band = Deadband(5.0, DEADBAND_PERCENTAGE)
+        assert not band.exceeded(0, 0)
+        assert band.exceeded(0, 1)
+
+    def test_zero_rpm_not_rewritten(self):
+        band = DeadbandFilter(Deadband(5.0, DEADBAND_PERCENTAGE), 300)
+        assert band.accept(0, 0)
+        assert not band.accept(0, 1)
+        assert band.accept(800, 2)
+
+
+class TestDeadbandFilter:
+    def test_first_reading_passes(self):
+        assert DeadbandFilter(Deadband(1.0), 300).accept(100.0, 0)
+
+    def test_flicker_written_once(self):
+        band = DeadbandFilter(Deadband(1.0), 300)
+        readings = [100.0, 100.5, 100.0, 100.5, 100.0, 100.5]
+        assert [band.accept(value, i) for i, value in enumerate(readings)] == [True] + [False] * 5
+        assert band.suppressed == 5
+
+    def test_band_follows_written_value(self):
+        band = DeadbandFilter(Deadband(1.0), 300)
+        band.accept(100.0, 0)
+        # Slow drift is written once it adds up to the deadband
+        assert not band.accept(100.6, 1)
+        assert band.accept(101.0, 2)
+        assert not band.accept(100.5, 3)
+
+    def test_max_quiet_forces_a_write(self):
+        band = DeadbandFilter(Deadband(1.0), 300)
+        band.accept(100.0, 0)
+        assert not band.accept(100.5, 299)
+        assert band.accept(100.5, 300)
+        assert not band.accept(100.0, 301)
+
+    def test_none_and_non_numeric_pass(self):
+        band = DeadbandFilter(Deadband(1.0), 300)
+        band.accept(100.0, 0)
+        assert band.accept(None, 1)
+        assert band.accept(100.0, 2)
+        assert band.accept("n/a", 3)
+
+
+class TestDeadbandFilterFromOptions:
+    def test_unfiltered_field(self):
+        assert deadband_filter({}, "Ambient_Temperature") is None
+
+    def test_defaults(self):
+        band = deadband_filter({}, "Fume_Temperature")
+        band.accept(100.0, 0)
+        assert not band.accept(100.5, 1)
+
+    def test_options_override(self):
+        options = {
+            deadband_option("RPM_Fam_Fume"): 50,
+            deadband_mode_option("RPM_Fam_Fume"): "absolute",
+            CONF_MAX_QUIET_INTERVAL: 60,
+        }
+        band = deadband_filter(options, "RPM_Fam_Fume")
+        band.accept(1000, 0)
+        assert not band.accept(1040, 1)
+        assert band.accept(1050, 2)
+        assert band.accept(1050, 62)
+
+    def test_zero_disables(self):
+        assert deadband_filter({deadband_option("Fume_Temperature"): 0}, "Fume_Temperature") is None
+
+
+class TestWriteScheduler:
+    def test_first_write_immediate(self):
+        scheduler = WriteScheduler(FakeLoop())
+        writes = []
+        assert scheduler.write("a", 30, lambda: writes.append(1))
+        assert writes == [1]
+
+    def test_trailing_flush_writes_latest(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        scheduler.write("a", 30, lambda: writes.append("first"))
+        loop.advance(5)
+        assert not scheduler.write("a", 30, lambda: writes.append("second"))
+        assert not scheduler.write("a", 30, lambda: writes.append("third"))
+        assert writes == ["first"]
+        assert scheduler.pending == 1
+        loop.advance(24)
+        assert writes == ["first"]
+        loop.advance(1)
+        assert writes == ["first", "third"]
+        assert scheduler.pending == 0
+        assert scheduler.deferred == 2
+
+    def test_interval_counts_from_flush(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        scheduler.write("a", 30, lambda: writes.append(1))
+        loop.advance(10)
+        scheduler.write("a", 30, lambda: writes.append(2))
+        loop.advance(20)
+        assert writes == [1, 2]
+        loop.advance(10)
+        assert not scheduler.write("a", 30, lambda: writes.append(3))
+        loop.advance(20)
+        assert writes == [1, 2, 3]
+
+    def test_one_timer_for_many_keys(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        for key in range(100):
+            scheduler.write(key, 30 + key, lambda: None)
+        loop.advance(1)
+        for key in range(100):
+            scheduler.write(key, 30 + key, lambda key=key: writes.append(key))
+        assert len(loop.armed) == 1
+        loop.advance(29)
+        assert writes == [0]
+        assert len(loop.armed) == 1
+        loop.advance(99)
+        assert writes == list(range(100))
+        assert loop.armed == []
+
+    def test_earlier_key_rearms_timer(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        scheduler.write("slow", 60, lambda: None)
+        scheduler.write("fast", 10, lambda: None)
+        scheduler.write("slow", 60, lambda: writes.append("slow"))
+        scheduler.write("fast", 10, lambda: writes.append("fast"))
+        assert [t.when() for t in loop.armed] == [10]
+        loop.advance(10)
+        assert writes == ["fast"]
+        loop.advance(50)
+        assert writes == ["fast", "slow"]
+
+    def test_cancel_drops_pending_write(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        scheduler.write("a", 30, lambda: None)
+        scheduler.write("a", 30, lambda: writes.append(1))
+        scheduler.cancel("a")
+        loop.advance(30)
+        assert writes == []
+        # A cancelled key starts afresh
+        assert scheduler.write("a", 30, lambda: writes.append(2))
+
+    def test_shutdown(self):
+        loop = FakeLoop()
+        scheduler = WriteScheduler(loop)
+        writes = []
+        scheduler.write("a", 30, lambda: None)
+        scheduler.write("a", 30, lambda: writes.append(1))
+        scheduler.shutdown()
+        assert loop.armed == []
+        loop.advance(30)
+        assert writes == []
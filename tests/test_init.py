@@ -0,0 +1,54 @@
+"""Tests for setting up a config entry."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components import maestro_mcz
+from custom_components.maestro_mcz.maestro import controller as controller_module
+from custom_components.maestro_mcz.maestro.controller import MaestroController
+
+
+class FakeStore:
+    """Store answering every load with the same payload and logging the calls."""
+
+    def __init__(self, calls, hass, version, key, chrono=None):
+        self._calls = calls
+        self._key = key
+        self._chrono = chrono
+
+    async def async_load(self):
+        self._calls.append(f"load {self._key}")
+        return self._chrono if self._key.endswith(".chrono") else {"firmware": "1.12"}
+
+
+async def _setup(monkeypatch, calls, chrono=None):
+    controller = MagicMock(spec=MaestroController)
+    controller.serial = "12345"
+    controller.connect_once = AsyncMock(side_effect=lambda: calls.append("connect"))
+    controller.connect = MagicMock()
+    controller.parameters.restore.side_effect = lambda data: calls.append("restore parameters")
+    monkeypatch.setattr(controller_module, "MaestroController", MagicMock(return_value=controller))
+    monkeypatch.setattr(maestro_mcz, "Store", lambda *args: FakeStore(calls, *args, chrono=chrono))
+
+    hass = MagicMock()
+    hass.data = {}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    entry = MagicMock()
+    entry.data = {"serial": "12345", "mac": "AA:BB:CC:DD:EE:FF"}
+
+    assert await maestro_mcz.async_setup_entry(hass, entry)
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_stores_restored_before_first_connect(monkeypatch):
+    calls = []
+    await _setup(monkeypatch, calls)
+    assert calls.index("restore parameters") < calls.index("connect")
+    assert calls[-1] == "connect"
+
+
+@pytest.mark.asyncio
+async def test_malformed_chrono_program_dropped(monkeypatch):
+    controller = await _setup(monkeypatch, [], chrono={"monday": [{"start": "six"}]})
+    controller.restore_chrono_program.assert_not_called()
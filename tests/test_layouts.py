@@ -0,0 +1,82 @@
+"""Tests for firmware- and model-aware Info frame layouts."""
+import pytest
+
+from custom_components.maestro_mcz.maestro import layouts
+from custom_components.maestro_mcz.maestro.layouts import (
+    AIR_DECODER,
+    DEFAULT_DECODER,
+    HYDRO_ONLY_FIELDS,
+    DecoderRule,
+    compile_decoder,
+    decode_database_name,
+    select_decoder,
+)
+from custom_components.maestro_mcz.maestro.types import MAESTRO_INFO, MaestroInformation
+
+
+class TestCompileDecoder:
+    def test_default_covers_maestro_info_in_position_order(self):
+        assert [info.id for info in DEFAULT_DECODER.fields] == sorted(MAESTRO_INFO)
+
+    def test_air_leaves_out_hydro_fields(self):
+        names = {info.name for info in AIR_DECODER.fields}
+        assert not names & HYDRO_ONLY_FIELDS
+        assert len(AIR_DECODER) == len(DEFAULT_DECODER) - len(HYDRO_ONLY_FIELDS)
+
+    def test_sorts_positions(self):
+        decoder = compile_decoder("test", {
+            5: MaestroInformation(5, "B", "int"),
+            2: MaestroInformation(2, "A", "int"),
+        })
+        assert [info.name for info in decoder.fields] == ["A", "B"]
+
+
+class TestSelectDecoder:
+    @pytest.mark.parametrize(
+        ("database_name", "expected"),
+        [
+            (None, DEFAULT_DECODER),
+            ("MCZ_UNKNOWN", DEFAULT_DECODER),
+            ("Hydromatic 24", DEFAULT_DECODER),
+            ("MAESTRO_AIR_M1", AIR_DECODER),
+        ],
+    )
+    def test_by_model(self, database_name, expected):
+        assert select_decoder(database_name, "1.0") is expected
+
+    def test_firmware_rule(self, monkeypatch):
+        special = compile_decoder("special", {1: MAESTRO_INFO[1]})
+        monkeypatch.setattr(
+            layouts, "DECODER_REGISTRY",
+            [DecoderRule(special, model="air", firmware="2."), *layouts.DECODER_REGISTRY],
+        )
+        assert select_decoder("AIR", "2.4") is special
+        assert select_decoder("AIR", "1.9") is AIR_DECODER
+        assert select_decoder("AIR", None) is AIR_DECODER
+
+    def test_decode_database_name(self):
+        assert decode_database_name(["0D", "MAESTRO_AIR_M1"]) == "MAESTRO_AIR_M1"
+        assert decode_database_name(["0D"]) is None
+
+
+class TestControllerIntegration:
+    def test_default_layout_decodes_hydro_fields(self, controller):
+        controller._on_message("01|0B|03|00|00|00|00|50")
+        assert controller.info_decoder is DEFAULT_DECODER
+        assert controller.state["Puffer_Temperature"] == 40.0
+
+    def test_database_name_selects_layout(self, controller):
+        controller._on_message("01|0B|03|00|00|00|00|50")
+        controller._on_message("0D|MAESTRO_AIR_M1")
+        assert controller.database_name == "MAESTRO_AIR_M1"
+        assert controller.info_decoder is AIR_DECODER
+        # Fields the new layout doesn't carry are dropped from the state
+        assert "Puffer_Temperature" not in controller.state
+        controller._on_message("01|0B|03|00|00|00|00|50")
+        assert "Puffer_Temperature" not in controller.state
+        assert controller.state["Stove_State"] == 11
+
+    def test_empty_database_name_ignored(self, controller):
+        controller._on_message("0D|")
+        assert controller.database_name is None
+        assert controller.info_decoder is DEFAULT_DECODER
@@ -0,0 +1,96 @@
+"""Tests for MaestroLocalController against a local WebSocket stand-in."""
+import pytest
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+from custom_components.maestro_mcz.maestro.chrono import CHRONO_REQUEST
+from custom_components.maestro_mcz.maestro.layouts import DATABASE_NAME_REQUEST
+from custom_components.maestro_mcz.maestro.local import MaestroLocalController
+from custom_components.maestro_mcz.maestro.parameters import SOFTWARE_VERSION_REQUEST
+from tests.conftest import wait_for
+
+
+class FakeStove:
+    """Minimal stand-in for the stove's local WebSocket."""
+
+    def __init__(self, info_frame: str = "01|0B|03"):
+        self.info_frame = info_frame
+        self.received: list[str] = []
+        self.sockets: list[web.WebSocketResponse] = []
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            self.received.append(msg.data)
+            if msg.data == "C|RecuperoInfo":
+                await ws.send_str(self.info_frame)
+        return ws
+
+
+@pytest.fixture
+async def stove():
+    fake = FakeStove()
+    app = web.Application()
+    app.router.add_get("/", fake.handler)
+    server = TestServer(app)
+    await server.start_server()
+    fake.port = server.port
+    yield fake
+    await server.close()
+
+
+@pytest.fixture
+async def local_controller(stove):
+    ctrl = MaestroLocalController("12345", "AA:BB:CC:DD:EE:FF", "127.0.0.1", stove.port)
+    yield ctrl
+    await ctrl.disconnect()
+
+
+class TestLocalConnect:
+    @pytest.mark.asyncio
+    async def test_url(self):
+        ctrl = MaestroLocalController("12345", "AA:BB:CC:DD:EE:FF", "10.0.0.5")
+        assert ctrl.endpoint == "ws://10.0.0.5:81"
+
+    @pytest.mark.asyncio
+    async def test_connect_once_requests_info(self, stove, local_controller):
+        await local_controller.connect_once()
+        assert local_controller.connected is True
+        await wait_for(lambda: "Stove_State" in local_controller.state)
+        assert stove.received == ["C|RecuperoInfo", SOFTWARE_VERSION_REQUEST, DATABASE_NAME_REQUEST, CHRONO_REQUEST]
+        assert local_controller.state["Stove_State"] == 11
+        assert local_controller.state["Fan_State"] == 3
+        assert local_controller.state["Stove_State_Desc"] == "Power 1"
+
+    @pytest.mark.asyncio
+    async def test_send_command_writes_raw_request(self, stove, local_controller):
+        await local_controller.connect_once()
+        await local_controller.send_command("Temperature_Setpoint", 21.5)
+        await wait_for(lambda: len(stove.received) == 5)
+        assert stove.received[4] == "C|WriteParametri|42|43"
+
+    @pytest.mark.asyncio
+    async def test_stove_closing_marks_disconnected(self, stove, local_controller):
+        await local_controller.connect_once()
+        await wait_for(lambda: "Stove_State" in local_controller.state)
+        await stove.sockets[0].close()
+        await wait_for(lambda: not local_controller.connected)
+        assert local_controller.state["Stove_State"] == 11  # last known state kept
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_link(self, stove, local_controller):
+        await local_controller.connect_once()
+        await local_controller.disconnect()
+        assert local_controller.connected is False
+        assert local_controller._transport.connected is False
+
+    @pytest.mark.asyncio
+    async def test_connect_once_raises_when_unreachable(self, stove):
+        ctrl = MaestroLocalController("12345", "AA:BB:CC:DD:EE:FF", "127.0.0.1", stove.port + 1)
+        with pytest.raises(Exception):
+            await ctrl.connect_once()
+        await ctrl.disconnect()
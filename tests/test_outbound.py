@@ -0,0 +1,238 @@
+"""Tests for the outbound command queue."""
+import asyncio
+
+import pytest
+
+from custom_components.maestro_mcz.maestro.outbound import CommandPriority, CommandQueue, OfflineBuffer
+
+
+class RecordingSink:
+    """Collects sent requests; optionally blocks until released."""
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.gate: asyncio.Event | None = None
+
+    async def __call__(self, request: str):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(request)
+
+
+class TestPriorities:
+    @pytest.mark.asyncio
+    async def test_safety_before_user_before_poll(self):
+        sink = RecordingSink()
+        sink.gate = asyncio.Event()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        # The first request occupies the worker while the rest queue up
+        tasks = [asyncio.create_task(queue.submit("first"))]
+        await asyncio.sleep(0)
+        tasks += [
+            asyncio.create_task(queue.submit("poll", CommandPriority.POLL)),
+            asyncio.create_task(queue.submit("user", CommandPriority.USER)),
+            asyncio.create_task(queue.submit("safety", CommandPriority.SAFETY)),
+        ]
+        await asyncio.sleep(0)
+        sink.gate.set()
+        await asyncio.gather(*tasks)
+        assert sink.sent == ["first", "safety", "user", "poll"]
+
+    @pytest.mark.asyncio
+    async def test_same_priority_keeps_arrival_order(self):
+        sink = RecordingSink()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        await asyncio.gather(*(queue.submit(f"r{i}") for i in range(5)))
+        assert sink.sent == [f"r{i}" for i in range(5)]
+
+
+class TestDeduplication:
+    @pytest.mark.asyncio
+    async def test_queued_polls_are_shared(self):
+        sink = RecordingSink()
+        sink.gate = asyncio.Event()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        blocker = asyncio.create_task(queue.submit("write"))
+        await asyncio.sleep(0)
+        polls = [
+            asyncio.create_task(queue.submit("C|RecuperoInfo", CommandPriority.POLL))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        sink.gate.set()
+        await asyncio.gather(blocker, *polls)
+        assert sink.sent == ["write", "C|RecuperoInfo"]
+        assert queue.stats["deduplicated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_user_writes_are_not_deduplicated(self):
+        sink = RecordingSink()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        await asyncio.gather(queue.submit("w"), queue.submit("w"))
+        assert sink.sent == ["w", "w"]
+
+
+class TestRateLimit:
+    @pytest.mark.asyncio
+    async def test_burst_then_throttled(self):
+        sink = RecordingSink()
+        queue = CommandQueue(sink, rate=50, burst=2)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(queue.submit(f"r{i}") for i in range(4)))
+        # Two go out immediately, the other two wait ~20ms each for tokens
+        assert loop.time() - started >= 0.035
+        assert len(sink.sent) == 4
+        assert queue.stats["max_wait"] > 0
+
+
+class TestClear:
+    @pytest.mark.asyncio
+    async def test_clear_fails_pending_and_inflight(self):
+        sink = RecordingSink()
+        sink.gate = asyncio.Event()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        inflight = asyncio.create_task(queue.submit("a"))
+        pending = asyncio.create_task(queue.submit("b"))
+        await asyncio.sleep(0)
+        queue.clear(lambda: ConnectionError("gone"))
+        for task in (inflight, pending):
+            with pytest.raises(ConnectionError):
+                await task
+        assert queue.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_send_error_propagates(self):
+        async def failing(request):
+            raise RuntimeError("boom")
+
+        queue = CommandQueue(failing)
+        with pytest.raises(RuntimeError):
+            await queue.submit("a")
+        # The queue keeps working afterwards
+        assert queue.depth == 0
+
+
+class TestStats:
+    @pytest.mark.asyncio
+    async def test_counts_sent_and_depth(self):
+        sink = RecordingSink()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        await asyncio.gather(*(queue.submit(f"r{i}") for i in range(3)))
+        stats = queue.stats
+        assert stats["sent"] == 3
+        assert stats["depth"] == 0
+        assert stats["max_depth"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_pending_lists_inflight_then_queue_order(self):
+        sink = RecordingSink()
+        sink.gate = asyncio.Event()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        tasks = [asyncio.create_task(queue.submit("first"))]
+        await asyncio.sleep(0)
+        tasks += [
+            asyncio.create_task(queue.submit("poll", CommandPriority.POLL)),
+            asyncio.create_task(queue.submit("safety", CommandPriority.SAFETY)),
+        ]
+        await asyncio.sleep(0)
+        assert queue.pending == ["first", "safety", "poll"]
+        sink.gate.set()
+        await asyncio.gather(*tasks)
+        assert queue.pending == []
+
+
+def _dropped() -> RuntimeError:
+    return RuntimeError("dropped")
+
+
+class TestOfflineBuffer:
+    @pytest.mark.asyncio
+    async def test_flush_in_priority_order(self):
+        sink = RecordingSink()
+        queue = CommandQueue(sink, rate=100, burst=100)
+        buffer = OfflineBuffer()
+        tasks = [
+            asyncio.create_task(buffer.hold("Fan_State", "fan", CommandPriority.USER)),
+            asyncio.create_task(buffer.hold("Power", "off", CommandPriority.SAFETY)),
+        ]
+        await asyncio.sleep(0)
+        assert buffer.pending == ["off", "fan"]
+        await buffer.flush(queue.submit, _dropped)
+        await asyncio.gather(*tasks)
+        assert sink.sent == ["off", "fan"]
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_newer_value_replaces_held_one(self):
+        sink = RecordingSink()
+        buffer = OfflineBuffer()
+        first = asyncio.create_task(buffer.hold("Fan_State", "fan 1", CommandPriority.USER))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(buffer.hold("Fan_State", "fan 3", CommandPriority.USER))
+        # The superseded caller is released before anything is flushed
+        await asyncio.wait_for(first, 1)
+        await buffer.flush(CommandQueue(sink, rate=100, burst=100).submit, _dropped)
+        await second
+        assert sink.sent == ["fan 3"]
+        assert buffer.stats["superseded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_request_dropped(self):
+        sink = RecordingSink()
+        buffer = OfflineBuffer()
+        with pytest.raises(TimeoutError):
+            await buffer.hold("Fan_State", "fan", CommandPriority.USER, ttl=0.01)
+        await buffer.flush(CommandQueue(sink, rate=100, burst=100).submit, _dropped)
+        assert sink.sent == []
+        assert buffer.stats == {"held": 0, "expired": 1, "superseded": 0}
+
+    @pytest.mark.asyncio
+    async def test_send_failure_reaches_caller(self):
+        async def failing(request, priority):
+            raise ConnectionError("gone")
+
+        buffer = OfflineBuffer()
+        task = asyncio.create_task(buffer.hold("Fan_State", "fan", CommandPriority.USER))
+        await asyncio.sleep(0)
+        await buffer.flush(failing, _dropped)
+        with pytest.raises(ConnectionError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_clear_fails_held(self):
+        buffer = OfflineBuffer()
+        task = asyncio.create_task(buffer.hold("Fan_State", "fan", CommandPriority.USER))
+        await asyncio.sleep(0)
+        buffer.clear(lambda: RuntimeError("shutting down"))
+        with pytest.raises(RuntimeError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_cancelled_flush_fails_waiting_callers(self):
+        async def stuck(request, priority):
+            await asyncio.Event().wait()
+
+        buffer = OfflineBuffer()
+        task = asyncio.create_task(buffer.hold("Fan_State", "fan", CommandPriority.USER, ttl=0.05))
+        await asyncio.sleep(0)
+        flush = asyncio.create_task(buffer.flush(stuck, _dropped))
+        await asyncio.sleep(0)
+        flush.cancel()
+        with pytest.raises(RuntimeError, match="dropped"):
+            await asyncio.wait_for(task, 1)
+
+    @pytest.mark.asyncio
+    async def test_clear_reaches_flushing_requests(self):
+        async def stuck(request, priority):
+            await asyncio.Event().wait()
+
+        buffer = OfflineBuffer()
+        task = asyncio.create_task(buffer.hold("Fan_State", "fan", CommandPriority.USER))
+        await asyncio.sleep(0)
+        flush = asyncio.create_task(buffer.flush(stuck, _dropped))
+        await asyncio.sleep(0)
+        buffer.clear(lambda: RuntimeError("shutting down"))
+        with pytest.raises(RuntimeError, match="shutting down"):
+            await asyncio.wait_for(task, 1)
+        flush.cancel()
@@ -0,0 +1,179 @@
+"""Tests for the Parameters/Database table cache."""
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.maestro_mcz.maestro.controller import PARAMETERS_FIELD, MaestroController
+from custom_components.maestro_mcz.maestro.parameters import (
+    SOFTWARE_VERSION_REQUEST,
+    TABLE_REQUESTS,
+    ParameterCache,
+    decode_software_version,
+    decode_table_frame,
+)
+from custom_components.maestro_mcz.maestro.transport import LoopbackTransport
+from tests.conftest import wait_for
+
+
+class FakeStove:
+    """Loopback responder answering the version and table requests."""
+
+    def __init__(self, firmware: str = "1.12"):
+        self.firmware = firmware
+        self.tables = {"parameters": "00|0A|1F|03", "database": "02|05|06"}
+
+    def __call__(self, request: str) -> list[str]:
+        if request == SOFTWARE_VERSION_REQUEST:
+            return [f"0E|{self.firmware}"]
+        for table, table_request in TABLE_REQUESTS.items():
+            if request == table_request:
+                return [self.tables[table]]
+        return []
+
+
+def table_requests(transport: LoopbackTransport) -> list[str]:
+    return [request for request in transport.sent if request in TABLE_REQUESTS.values()]
+
+
+def tables_cached(controller: MaestroController) -> bool:
+    firmware = controller.firmware_version
+    return firmware is not None and not controller.parameters.stale_tables(firmware)
+
+
+async def no_fetch_running(controller: MaestroController):
+    # The handshake has already processed the version frame, so any fetch it
+    # started is in _table_task; awaiting it leaves nothing in flight
+    if controller._table_task is not None:
+        await controller._table_task
+
+
+class TestDecoding:
+    def test_table_frame(self):
+        assert decode_table_frame(["00", "0A", "ZZ", "ff"]) == (10, None, 255)
+
+    def test_software_version(self):
+        assert decode_software_version(["0E", "1.12"]) == "1.12"
+        assert decode_software_version(["0E", ""]) is None
+
+
+class TestParameterCache:
+    def test_get_by_frame_position(self):
+        cache = ParameterCache()
+        cache.store("1.0", "parameters", (10, 31))
+        assert cache.get("parameters", 1) == 10
+        assert cache.get("parameters", 2) == 31
+        assert cache.get("parameters", 3) is None
+        assert cache.get("database", 1) is None
+
+    def test_stale_tables(self):
+        cache = ParameterCache()
+        assert cache.stale_tables("1.0") == list(TABLE_REQUESTS)
+        cache.store("1.0", "parameters", (1,))
+        assert cache.stale_tables("1.0") == ["database"]
+        cache.store("1.0", "database", (2,))
+        assert cache.stale_tables("1.0") == []
+        assert cache.stale_tables("1.1") == list(TABLE_REQUESTS)
+
+    def test_new_firmware_drops_tables(self):
+        cache = ParameterCache()
+        cache.store("1.0", "parameters", (1,))
+        cache.store("1.1", "database", (2,))
+        assert cache.tables == {"database": 1}
+
+    def test_store_reports_changes(self):
+        cache = ParameterCache()
+        assert cache.store("1.0", "parameters", (1,)) is True
+        assert cache.store("1.0", "parameters", (1,)) is False
+
+    def test_round_trip(self):
+        cache = ParameterCache()
+        cache.store("1.0", "parameters", (1, None))
+        restored = ParameterCache()
+        restored.restore(cache.as_dict())
+        assert restored.firmware == "1.0"
+        assert restored.get("parameters", 1) == 1
+        assert restored.stale_tables("1.0") == ["database"]
+
+
+class TestControllerIntegration:
+    @pytest.mark.asyncio
+    async def test_tables_fetched_once_per_firmware(self):
+        stove = FakeStove()
+        transport = LoopbackTransport(stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        await wait_for(lambda: tables_cached(controller))
+        assert controller.firmware_version == "1.12"
+        assert controller.parameters.get("parameters", 2) == 0x1F
+        assert controller.parameters.get("database", 1) == 5
+        assert len(table_requests(transport)) == 2
+
+        # Reconnecting to the same firmware serves the tables from the cache
+        await transport.drop()
+        await transport.open()
+        await no_fetch_running(controller)
+        assert len(table_requests(transport)) == 2
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_restored_cache_skips_fetch(self):
+        stove = FakeStove()
+        transport = LoopbackTransport(stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        cached = ParameterCache()
+        cached.store("1.12", "parameters", (1,))
+        cached.store("1.12", "database", (2,))
+        controller.parameters.restore(cached.as_dict())
+        await controller.connect_once()
+        await no_fetch_running(controller)
+        assert table_requests(transport) == []
+        assert controller.parameters.get("parameters", 1) == 1
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_firmware_change_refetches(self):
+        stove = FakeStove()
+        transport = LoopbackTransport(stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        await wait_for(lambda: tables_cached(controller))
+        seen = []
+        controller.add_listener(lambda: seen.append(controller.changed_fields))
+        stove.firmware = "1.13"
+        stove.tables["parameters"] = "00|0B"
+        transport.inject("0E|1.13")
+        await wait_for(lambda: controller.parameters.tables == {"parameters": 1, "database": 2})
+        assert len(table_requests(transport)) == 4
+        assert controller.parameters.firmware == "1.13"
+        assert controller.parameters.get("parameters", 1) == 0x0B
+        assert frozenset({PARAMETERS_FIELD}) in seen
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_explicit_refresh(self):
+        stove = FakeStove()
+        transport = LoopbackTransport(stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        await wait_for(lambda: tables_cached(controller))
+        await controller.refresh_parameters()
+        assert len(table_requests(transport)) == 4
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_refresh_times_out_without_answer(self):
+        stove = FakeStove()
+        transport = LoopbackTransport(stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        await wait_for(lambda: tables_cached(controller))
+        stove.tables = {}
+        transport._responder = lambda request: [] if request in TABLE_REQUESTS.values() else stove(request)
+        with pytest.raises(HomeAssistantError, match="did not send"):
+            await controller.refresh_parameters(timeout=0.01)
+        assert controller._table_waiters == {}
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_refresh_requires_connection(self, controller):
+        with pytest.raises(HomeAssistantError, match="not connected"):
+            await controller.refresh_parameters()
@@ -0,0 +1,134 @@
+"""Tests for the desired-state reconciler."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.maestro_mcz.maestro.controller import MaestroController
+from custom_components.maestro_mcz.maestro.outbound import CommandQueue
+from custom_components.maestro_mcz.maestro.reconciler import RECONCILE_MAX_ATTEMPTS
+from custom_components.maestro_mcz.maestro.transport import LoopbackTransport
+
+# Write register id -> Info frame position, for the registers the fake stove reports
+_REGISTER_POSITIONS = {42: 11, 37: 2}
+
+
+class FakeStove:
+    """Loopback responder that applies writes and answers GetInfo."""
+
+    def __init__(self, setpoint_raw=40, fan=1, apply_writes=True):
+        self.positions = {1: 11, 2: fan, 11: setpoint_raw}
+        self.apply_writes = apply_writes
+
+    def __call__(self, request: str) -> list[str]:
+        parts = request.split("|")
+        if parts[1] == "WriteParametri" and self.apply_writes:
+            position = _REGISTER_POSITIONS.get(int(parts[2]))
+            if position is not None:
+                self.positions[position] = int(parts[3])
+        if request == "C|RecuperoInfo":
+            fields = [f"{self.positions.get(i, 0):02X}" for i in range(1, 12)]
+            return ["01|" + "|".join(fields)]
+        return []
+
+
+async def _settle(reconciler):
+    async with asyncio.timeout(2):
+        while reconciler._task is not None and not reconciler._task.done():
+            await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def stove_and_controller():
+    stove = FakeStove()
+    transport = LoopbackTransport(stove)
+    controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+    # Keep the outbound rate limit out of the backoff timings under test
+    controller._queue = CommandQueue(controller._send_request, rate=1000, burst=1000)
+    await controller.connect_once()
+    yield stove, transport, controller
+    await controller.disconnect()
+
+
+def _writes(transport):
+    return [r for r in transport.sent if r.startswith("C|WriteParametri")]
+
+
+class TestReconcile:
+    @pytest.mark.asyncio
+    async def test_only_differing_commands_written(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        controller.reconciler.set_desired({"Temperature_Setpoint": 21.5, "Fan_State": 1})
+        await _settle(controller.reconciler)
+        assert _writes(transport) == ["C|WriteParametri|42|43"]
+        assert controller.state["Active_Set_Point"] == 21.5
+        assert controller.reconciler.desired == {}
+
+    @pytest.mark.asyncio
+    async def test_nothing_written_when_already_converged(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        controller.reconciler.set_desired({"Temperature_Setpoint": 20.0})
+        await _settle(controller.reconciler)
+        assert _writes(transport) == []
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_then_gives_up(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        stove.apply_writes = False
+        delays = []
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(seconds):
+            # asyncio.sleep is patched globally, so only record backoff delays
+            if seconds:
+                delays.append(seconds)
+            await real_sleep(0)
+
+        with patch(
+            "custom_components.maestro_mcz.maestro.reconciler.asyncio.sleep",
+            side_effect=fake_sleep,
+        ):
+            controller.reconciler.set_desired({"Temperature_Setpoint": 22.0})
+            await _settle(controller.reconciler)
+
+        assert len(_writes(transport)) == RECONCILE_MAX_ATTEMPTS
+        assert delays == [5, 10, 20, 40, 80]
+        assert controller.reconciler.desired == {"Temperature_Setpoint": 22.0}
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_reconnect(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        await transport.drop()
+        controller.reconciler.set_desired({"Fan_State": 4})
+        await asyncio.sleep(0)
+        assert _writes(transport) == []
+
+        await transport.open()
+        await _settle(controller.reconciler)
+        assert _writes(transport) == ["C|WriteParametri|37|4"]
+        assert controller.state["Fan_State"] == 4
+
+    @pytest.mark.asyncio
+    async def test_unreported_command_written_once(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        controller.reconciler.set_desired({"Power_Level": 3})
+        await _settle(controller.reconciler)
+        assert _writes(transport) == ["C|WriteParametri|36|3"]
+        assert controller.reconciler.desired == {}
+
+    @pytest.mark.asyncio
+    async def test_invalid_value_rejected_up_front(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        with pytest.raises(HomeAssistantError):
+            controller.reconciler.set_desired({"Fan_State": 2, "Bogus": 1})
+        assert controller.reconciler.desired == {}
+
+    @pytest.mark.asyncio
+    async def test_clear_stops_retrying(self, stove_and_controller):
+        stove, transport, controller = stove_and_controller
+        controller.reconciler.set_desired({"Fan_State": 4})
+        controller.reconciler.clear()
+        await asyncio.sleep(0)
+        assert controller.reconciler.desired == {}
+        assert _writes(transport) == []
@@ -3,10 +3,12 @@ from unittest.mock import MagicMock
 
 import pytest
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import UnitOfMass, UnitOfTemperature
 
+from custom_components.maestro_mcz.filters import Deadband, DeadbandFilter
+from custom_components.maestro_mcz.maestro.consumption import ConsumptionEstimator
 from custom_components.maestro_mcz.maestro.controller import MaestroController
-from custom_components.maestro_mcz.sensor import MaestroSensor
+from custom_components.maestro_mcz.sensor import MaestroConsumptionSensor, MaestroSensor
 
 
 @pytest.fixture
@@ -83,3 +85,49 @@ class TestSensorNativeValue:
         mock_controller.state = {"Fan_State": 3}
         sensor = MaestroSensor(mock_controller, "Fan_State", "Fan State", None)
         assert sensor.native_value == 3
+
+
+class TestConsumptionSensor:
+    def test_total_increasing(self, mock_controller):
+        mock_controller.consumption = ConsumptionEstimator()
+        sensor = MaestroConsumptionSensor(
+            mock_controller, "Pellet_Consumption", "Pellet Consumption",
+            lambda c: c.pellets_kg, SensorDeviceClass.WEIGHT, UnitOfMass.KILOGRAMS,
+        )
+        assert sensor._attr_state_class == SensorStateClass.TOTAL_INCREASING
+        assert sensor._attr_unique_id == "maestro_mcz_12345_Pellet_Consumption"
+        assert sensor.native_value == 0.0
+
+
+class TestSensorDeadband:
+    def _make_sensor(self, ctrl):
+        ctrl.changed_fields = frozenset({"Fume_Temperature"})
+        sensor = MaestroSensor(
+            ctrl, "Fume_Temperature", "Fume Temperature", SensorDeviceClass.TEMPERATURE,
+            write_filter=DeadbandFilter(Deadband(1.0), 300),
+        )
+        sensor.async_write_ha_state = MagicMock()
+        return sensor
+
+    def test_small_change_not_written(self, mock_controller):
+        mock_controller.state = {"Fume_Temperature": 100.0}
+        sensor = self._make_sensor(mock_controller)
+        mock_controller.state["Fume_Temperature"] = 100.5
+        sensor._update_callback()
+        sensor.async_write_ha_state.assert_not_called()
+        assert sensor.native_value == 100.0
+
+    def test_large_change_written(self, mock_controller):
+        mock_controller.state = {"Fume_Temperature": 100.0}
+        sensor = self._make_sensor(mock_controller)
+        mock_controller.state["Fume_Temperature"] = 102.0
+        sensor._update_callback()
+        sensor.async_write_ha_state.assert_called_once()
+        assert sensor.native_value == 102.0
+
+    def test_connection_change_always_written(self, mock_controller):
+        mock_controller.state = {"Fume_Temperature": 100.0}
+        sensor = self._make_sensor(mock_controller)
+        mock_controller.changed_fields = frozenset()
+        sensor._update_callback()
+        sensor.async_write_ha_state.assert_called_once()
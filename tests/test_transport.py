@@ -0,0 +1,143 @@
+"""Tests for the loopback and replay transports."""
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from custom_components.maestro_mcz.maestro.chrono import CHRONO_REQUEST
+from custom_components.maestro_mcz.maestro.controller import MaestroController
+from custom_components.maestro_mcz.maestro.layouts import DATABASE_NAME_REQUEST
+from custom_components.maestro_mcz.maestro.parameters import SOFTWARE_VERSION_REQUEST
+from custom_components.maestro_mcz.maestro.transport import (
+    LoopbackTransport,
+    MaestroTransport,
+    ReplayTransport,
+    iter_recording,
+)
+
+
+def _stove(request: str) -> list[str]:
+    """Answer GetInfo with a 'Power 1' Info frame."""
+    if request == "C|RecuperoInfo":
+        return ["01|0B|03"]
+    return []
+
+
+class TestLoopbackTransport:
+    @pytest.mark.asyncio
+    async def test_connect_runs_handshake(self):
+        transport = LoopbackTransport(_stove)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        assert controller.connected is True
+        assert transport.sent == ["C|RecuperoInfo", SOFTWARE_VERSION_REQUEST, DATABASE_NAME_REQUEST, CHRONO_REQUEST]
+        # The responder answers synchronously, so state is already decoded
+        assert controller.state["Stove_State_Desc"] == "Power 1"
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_send_command(self):
+        transport = LoopbackTransport()
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        await controller.send_command("Power", 0)
+        assert transport.sent[-1] == "C|WriteParametri|34|40"
+        await controller.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_inject_and_drop(self):
+        transport = LoopbackTransport()
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        transport.inject("01|00")
+        assert controller.state["Stove_State_Desc"] == "Off"
+        await transport.drop()
+        assert controller.connected is False
+        assert controller.state["Stove_State_Desc"] == "Off"
+
+    @pytest.mark.asyncio
+    async def test_send_when_closed_raises(self):
+        transport = LoopbackTransport()
+        MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        with pytest.raises(ConnectionError):
+            await transport.send("C|RecuperoInfo")
+
+
+class TestReplayTransport:
+    @pytest.fixture
+    def recording(self, tmp_path):
+        path = tmp_path / "frames.tsv"
+        path.write_text(
+            "# recorded frames\n"
+            "1697712000.0\t01|00|00\n"
+            "\n"
+            "1697712060.0\t01|0B|03\n",
+            encoding="utf-8",
+        )
+        return path
+
+    def test_iter_recording(self, recording):
+        assert list(iter_recording(recording)) == [
+            (1697712000.0, "01|00|00"),
+            (1697712060.0, "01|0B|03"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_replays_frames_then_closes(self, recording):
+        transport = ReplayTransport(recording)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        async with asyncio.timeout(2):
+            await transport.wait()
+        assert controller.state["Stove_State"] == 11
+        assert controller.state["Fan_State"] == 3
+        assert controller.connected is False
+        assert transport.sent == ["C|RecuperoInfo", SOFTWARE_VERSION_REQUEST, DATABASE_NAME_REQUEST, CHRONO_REQUEST]
+
+    @pytest.mark.asyncio
+    async def test_finished_replay_stays_closed(self, recording):
+        transport = ReplayTransport(recording)
+        controller = MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        await controller.connect_once()
+        async with asyncio.timeout(2):
+            await transport.wait()
+        with pytest.raises(ConnectionError, match="finished"):
+            await transport.open()
+        assert transport.sent.count("C|RecuperoInfo") == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_file_raises(self, tmp_path):
+        transport = ReplayTransport(tmp_path / "missing.tsv")
+        MaestroController("12345", "AA:BB:CC:DD:EE:FF", transport)
+        with pytest.raises(FileNotFoundError):
+            await transport.open()
+
+
+def test_transport_methods_are_abstract():
+    with pytest.raises(TypeError):
+        MaestroTransport()
+
+
+def test_config_flow_does_not_load_controller():
+    """Loading the config flow leaves the controller and transports to entry setup."""
+    code = (
+        "import sys, custom_components.maestro_mcz.config_flow;"
+        "loaded = [m for m in sys.modules if m.startswith('custom_components.maestro_mcz.maestro.')];"
+        "assert 'custom_components.maestro_mcz.maestro.controller' not in sys.modules, loaded"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent, check=True,
+    )
+
+
+def test_socketio_not_loaded_on_import():
+    """python-socketio is only imported once a cloud transport is created."""
+    code = (
+        "import sys, custom_components.maestro_mcz.config_flow, custom_components.maestro_mcz.sensor;"
+        "assert 'socketio' not in sys.modules, 'socketio imported eagerly'"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent, check=True,
+    )
@@ -3,7 +3,10 @@ from custom_components.maestro_mcz.maestro.types import (
     MAESTRO_COMMANDS,
     MAESTRO_COMMANDS_BY_NAME,
     MAESTRO_INFO,
+    MAESTRO_STOVE_STATE_TABLE,
+    MAESTRO_STOVE_STATES,
     MAESTRO_STOVE_STATES_BY_ID,
+    get_stove_state_info,
 )
 
 
@@ -37,3 +40,36 @@ def test_info_active_set_point_is_temperature():
     info = MAESTRO_INFO[11]
     assert info.name == "Active_Set_Point"
     assert info.message_type == "temperature"
+
+
+def test_stove_state_table_covers_all_states():
+    assert set(MAESTRO_STOVE_STATE_TABLE) == {s.id for s in MAESTRO_STOVE_STATES}
+
+
+def test_stove_state_table_power_level_row():
+    row = MAESTRO_STOVE_STATE_TABLE[13]
+    assert row.description == "Power 3"
+    assert row.on_or_off == 1
+    assert row.hvac_action == "heating"
+    assert row.preset == "Power 3"
+    assert row.error_code is None
+
+
+def test_stove_state_table_off_and_cooling():
+    assert MAESTRO_STOVE_STATE_TABLE[0].hvac_action == "off"
+    assert MAESTRO_STOVE_STATE_TABLE[41].hvac_action == "idle"
+    assert MAESTRO_STOVE_STATE_TABLE[31].hvac_action == "heating"
+    assert MAESTRO_STOVE_STATE_TABLE[31].preset is None
+
+
+def test_stove_state_table_error_code():
+    assert MAESTRO_STOVE_STATE_TABLE[50].error_code == "A01"
+    assert MAESTRO_STOVE_STATE_TABLE[65].error_code == "A23"
+    assert MAESTRO_STOVE_STATE_TABLE[69].error_code is None
+
+
+def test_unknown_stove_state_row():
+    row = get_stove_state_info(99)
+    assert row.id == 99
+    assert row.description is None
+    assert row.hvac_action == "idle"